@@ -12,6 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.database import Base
 from app.models.employee import *
+from app.models.archive import *
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
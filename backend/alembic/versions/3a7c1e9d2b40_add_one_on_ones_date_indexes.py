@@ -0,0 +1,26 @@
+"""add one_on_ones date indexes
+
+Revision ID: 3a7c1e9d2b40
+Revises: f562b0466376
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a7c1e9d2b40'
+down_revision = 'f562b0466376'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_one_on_ones_date', 'one_on_ones', ['date'], unique=False)
+    op.create_index('ix_one_on_ones_employee_id_date', 'one_on_ones', ['employee_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_one_on_ones_employee_id_date', table_name='one_on_ones')
+    op.drop_index('ix_one_on_ones_date', table_name='one_on_ones')
@@ -0,0 +1,42 @@
+"""add project_tech_tags
+
+Revision ID: 8d2f4b6a1c93
+Revises: 3a7c1e9d2b40
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f4b6a1c93'
+down_revision = '3a7c1e9d2b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('project_tech_tags',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('tag', sa.String(length=50), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'tag')
+    )
+    op.create_index('ix_project_tech_tags_tag_project_id', 'project_tech_tags', ['tag', 'project_id'], unique=False)
+
+    # 既存のカンマ区切り文字列からバックフィル
+    op.execute("""
+        INSERT INTO project_tech_tags (project_id, tag)
+        SELECT DISTINCT p.id, left(btrim(t.tag), 50)
+        FROM projects p
+        CROSS JOIN LATERAL unnest(string_to_array(p.tech_tags, ',')) AS t(tag)
+        WHERE p.tech_tags IS NOT NULL
+          AND btrim(t.tag) <> ''
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_project_tech_tags_tag_project_id', table_name='project_tech_tags')
+    op.drop_table('project_tech_tags')
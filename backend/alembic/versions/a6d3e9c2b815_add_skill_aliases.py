@@ -0,0 +1,64 @@
+"""add skill_aliases
+
+Revision ID: a6d3e9c2b815
+Revises: f4c1d8b3a6e2
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d3e9c2b815'
+down_revision = 'f4c1d8b3a6e2'
+branch_labels = None
+depends_on = None
+
+# 正規化済みの別名キー, スキル名
+DEFAULT_SKILL_ALIASES = [
+    ('js', 'JavaScript'),
+    ('ecmascript', 'JavaScript'),
+    ('ts', 'TypeScript'),
+    ('reactjs', 'React'),
+    ('vue', 'Vue.js'),
+    ('node', 'Node.js'),
+    ('postgres', 'PostgreSQL'),
+    ('psql', 'PostgreSQL'),
+    ('mongo', 'MongoDB'),
+    ('amazonwebservices', 'AWS'),
+    ('k8s', 'Kubernetes'),
+    ('golang', 'Go'),
+    ('py', 'Python'),
+    ('csharp', 'C#'),
+]
+
+
+def upgrade() -> None:
+    op.create_table('skill_aliases',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('alias', sa.String(length=100), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_skill_aliases_id'), 'skill_aliases', ['id'], unique=False)
+    op.create_index(op.f('ix_skill_aliases_alias'), 'skill_aliases', ['alias'], unique=True)
+    op.create_index(op.f('ix_skill_aliases_skill_id'), 'skill_aliases', ['skill_id'], unique=False)
+
+    # 既存スキルに対応する別名のみ登録する
+    for alias, skill_name in DEFAULT_SKILL_ALIASES:
+        op.execute(
+            sa.text(
+                "INSERT INTO skill_aliases (alias, skill_id) "
+                "SELECT :alias, id FROM skills WHERE name = :skill_name"
+            ).bindparams(alias=alias, skill_name=skill_name)
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_skill_aliases_skill_id'), table_name='skill_aliases')
+    op.drop_index(op.f('ix_skill_aliases_alias'), table_name='skill_aliases')
+    op.drop_index(op.f('ix_skill_aliases_id'), table_name='skill_aliases')
+    op.drop_table('skill_aliases')
@@ -0,0 +1,36 @@
+"""add employee_profiles
+
+Revision ID: b51e0c7f9a28
+Revises: 8d2f4b6a1c93
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b51e0c7f9a28'
+down_revision = '8d2f4b6a1c93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 既存社員の値は POST /api/employees/profiles/refresh で再計算する
+    op.create_table('employee_profiles',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('tag_months', sa.JSON(), nullable=False),
+    sa.Column('phase_requirements_count', sa.Integer(), nullable=False),
+    sa.Column('phase_design_count', sa.Integer(), nullable=False),
+    sa.Column('phase_implementation_count', sa.Integer(), nullable=False),
+    sa.Column('phase_testing_count', sa.Integer(), nullable=False),
+    sa.Column('earliest_free_date', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('employee_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('employee_profiles')
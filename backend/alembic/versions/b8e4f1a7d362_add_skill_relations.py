@@ -0,0 +1,71 @@
+"""add skill_relations
+
+Revision ID: b8e4f1a7d362
+Revises: a6d3e9c2b815
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4f1a7d362'
+down_revision = 'a6d3e9c2b815'
+branch_labels = None
+depends_on = None
+
+# スキル名, 関連スキル名, 種別, 重み
+DEFAULT_SKILL_RELATIONS = [
+    ('TypeScript', 'JavaScript', 'IMPLIES', 1.0),
+    ('React', 'JavaScript', 'IMPLIES', 0.8),
+    ('Vue.js', 'JavaScript', 'IMPLIES', 0.8),
+    ('Vue.js', 'React', 'RELATED', 0.5),
+    ('Angular', 'React', 'RELATED', 0.4),
+    ('Angular', 'TypeScript', 'IMPLIES', 0.8),
+    ('Node.js', 'JavaScript', 'IMPLIES', 0.9),
+    ('MySQL', 'PostgreSQL', 'RELATED', 0.6),
+    ('Terraform', 'AWS', 'IMPLIES', 0.3),
+    ('Kubernetes', 'Docker', 'IMPLIES', 0.8),
+]
+
+
+def upgrade() -> None:
+    op.create_table('skill_relations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('related_skill_id', sa.Integer(), nullable=False),
+    sa.Column('relation_type', sa.Enum('RELATED', 'IMPLIES', name='skillrelationtype'), nullable=False),
+    sa.Column('weight', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['related_skill_id'], ['skills.id'], ),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('skill_id', 'related_skill_id', name='uq_skill_relations_skill_id_related_skill_id')
+    )
+    op.create_index(op.f('ix_skill_relations_id'), 'skill_relations', ['id'], unique=False)
+    op.create_index(op.f('ix_skill_relations_related_skill_id'), 'skill_relations', ['related_skill_id'], unique=False)
+    op.create_index(op.f('ix_skill_relations_skill_id'), 'skill_relations', ['skill_id'], unique=False)
+
+    # 既存スキル同士の関係のみ登録する
+    for skill_name, related_skill_name, relation_type, weight in DEFAULT_SKILL_RELATIONS:
+        op.execute(
+            sa.text(
+                "INSERT INTO skill_relations (skill_id, related_skill_id, relation_type, weight) "
+                "SELECT s.id, r.id, CAST(:relation_type AS skillrelationtype), :weight "
+                "FROM skills s, skills r WHERE s.name = :skill_name AND r.name = :related_skill_name"
+            ).bindparams(
+                skill_name=skill_name,
+                related_skill_name=related_skill_name,
+                relation_type=relation_type,
+                weight=weight
+            )
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_skill_relations_skill_id'), table_name='skill_relations')
+    op.drop_index(op.f('ix_skill_relations_related_skill_id'), table_name='skill_relations')
+    op.drop_index(op.f('ix_skill_relations_id'), table_name='skill_relations')
+    op.drop_table('skill_relations')
+    sa.Enum(name='skillrelationtype').drop(op.get_bind(), checkfirst=True)
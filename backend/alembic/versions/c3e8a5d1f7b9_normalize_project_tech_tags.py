@@ -0,0 +1,57 @@
+"""normalize project_tech_tags
+
+Revision ID: c3e8a5d1f7b9
+Revises: b8e4f1a7d362
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+import re
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e8a5d1f7b9'
+down_revision = 'b8e4f1a7d362'
+branch_labels = None
+depends_on = None
+
+# app.services.skill_catalog.normalize_skill_term と同じ規則
+_SEPARATORS = re.compile(r"[\s.\-_・]+")
+
+
+def _normalize(term: str) -> str:
+    return _SEPARATORS.sub("", unicodedata.normalize("NFKC", term).casefold())
+
+
+def upgrade() -> None:
+    # 既存のタグをスキルの正式名に寄せる（例: k8s → Kubernetes）。該当スキルのないタグはそのまま
+    connection = op.get_bind()
+    names_by_key = {}
+    for skill_name, in connection.execute(sa.text("SELECT name FROM skills")):
+        names_by_key[_normalize(skill_name)] = skill_name
+    for alias, skill_name in connection.execute(sa.text(
+        "SELECT a.alias, s.name FROM skill_aliases a JOIN skills s ON s.id = a.skill_id"
+    )):
+        names_by_key.setdefault(alias, skill_name)
+
+    tags = [tag for tag, in connection.execute(sa.text("SELECT DISTINCT tag FROM project_tech_tags"))]
+    for tag in tags:
+        canonical = names_by_key.get(_normalize(tag))
+        if canonical is None or canonical == tag:
+            continue
+        connection.execute(
+            sa.text(
+                "INSERT INTO project_tech_tags (project_id, tag) "
+                "SELECT project_id, :canonical FROM project_tech_tags WHERE tag = :tag "
+                "ON CONFLICT DO NOTHING"
+            ),
+            {"canonical": canonical, "tag": tag}
+        )
+        connection.execute(sa.text("DELETE FROM project_tech_tags WHERE tag = :tag"), {"tag": tag})
+
+
+def downgrade() -> None:
+    # 元の表記は projects.tech_tags に残っているため、タグ表は戻さない
+    pass
@@ -0,0 +1,24 @@
+"""add employee_profiles earliest_free_date index
+
+Revision ID: c7a93d1e5f04
+Revises: b51e0c7f9a28
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7a93d1e5f04'
+down_revision = 'b51e0c7f9a28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_employee_profiles_earliest_free_date'), 'employee_profiles', ['earliest_free_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_employee_profiles_earliest_free_date'), table_name='employee_profiles')
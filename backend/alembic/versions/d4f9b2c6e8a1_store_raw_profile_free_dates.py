@@ -0,0 +1,33 @@
+"""store raw free dates and open project tags in employee_profiles
+
+Revision ID: d4f9b2c6e8a1
+Revises: c3e8a5d1f7b9
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f9b2c6e8a1'
+down_revision = 'c3e8a5d1f7b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 既存の行は再計算するまで従来どおり集計時点の値で動く。
+    # POST /api/employees/profiles/refresh で継続中の案件・即稼働可能の社員を参照時計算に切り替える
+    op.add_column('employee_profiles', sa.Column('open_tag_starts', sa.JSON(), server_default='{}', nullable=False))
+    op.add_column('employee_profiles', sa.Column(
+        'free_status',
+        postgresql.ENUM('WORKING', 'AVAILABLE_NEXT_MONTH', 'IMMEDIATELY_AVAILABLE', name='availabilitystatus', create_type=False),
+        nullable=True
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('employee_profiles', 'free_status')
+    op.drop_column('employee_profiles', 'open_tag_starts')
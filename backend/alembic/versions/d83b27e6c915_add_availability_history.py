@@ -0,0 +1,53 @@
+"""add availability_history
+
+Revision ID: d83b27e6c915
+Revises: c7a93d1e5f04
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'd83b27e6c915'
+down_revision = 'c7a93d1e5f04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('availability_history',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('status', postgresql.ENUM('WORKING', 'AVAILABLE_NEXT_MONTH', 'IMMEDIATELY_AVAILABLE', name='availabilitystatus', create_type=False), nullable=False),
+    sa.Column('available_from', sa.DateTime(), nullable=True),
+    sa.Column('memo', sa.Text(), nullable=True),
+    sa.Column('valid_from', sa.DateTime(), nullable=False),
+    sa.Column('valid_to', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_availability_history_id'), 'availability_history', ['id'], unique=False)
+    op.create_index('ix_availability_history_employee_id_valid_from', 'availability_history', ['employee_id', 'valid_from'], unique=False)
+    # 時点検索用（tsrange(valid_from, valid_to) @> 時点）
+    op.execute(
+        "CREATE INDEX ix_availability_history_validity ON availability_history "
+        "USING gist (tsrange(valid_from, valid_to, '[)'))"
+    )
+
+    # 現在の稼働状況を初期履歴として登録
+    op.execute("""
+        INSERT INTO availability_history (employee_id, status, available_from, memo, valid_from)
+        SELECT employee_id, status, available_from, memo, coalesce(updated_at, created_at, now())
+        FROM availability
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_availability_history_validity")
+    op.drop_index('ix_availability_history_employee_id_valid_from', table_name='availability_history')
+    op.drop_index(op.f('ix_availability_history_id'), table_name='availability_history')
+    op.drop_table('availability_history')
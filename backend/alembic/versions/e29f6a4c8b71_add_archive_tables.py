@@ -0,0 +1,115 @@
+"""add archive tables
+
+Revision ID: e29f6a4c8b71
+Revises: d83b27e6c915
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e29f6a4c8b71'
+down_revision = 'd83b27e6c915'
+branch_labels = None
+depends_on = None
+
+
+def _availability_status():
+    return postgresql.ENUM('WORKING', 'AVAILABLE_NEXT_MONTH', 'IMMEDIATELY_AVAILABLE', name='availabilitystatus', create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table('archived_employees',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('years_experience', sa.Integer(), nullable=False),
+    sa.Column('main_role', sa.String(length=100), nullable=False),
+    sa.Column('unit_price_min', sa.Integer(), nullable=True),
+    sa.Column('unit_price_max', sa.Integer(), nullable=True),
+    sa.Column('desired_career', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('archived_employee_skills',
+    sa.Column('employee_id', sa.Integer(), nullable=True),
+    sa.Column('skill_id', sa.Integer(), nullable=True),
+    sa.Column('level', sa.Integer(), nullable=True),
+    sa.Column('years_experience', sa.Integer(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False)
+    )
+    op.create_index('ix_archived_employee_skills_employee_id', 'archived_employee_skills', ['employee_id'], unique=False)
+    op.create_table('archived_projects',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=200), nullable=False),
+    sa.Column('role', sa.String(length=100), nullable=False),
+    sa.Column('start_date', sa.DateTime(), nullable=False),
+    sa.Column('end_date', sa.DateTime(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('tech_tags', sa.Text(), nullable=True),
+    sa.Column('phase_requirements', sa.String(length=50), nullable=True),
+    sa.Column('phase_design', sa.String(length=50), nullable=True),
+    sa.Column('phase_implementation', sa.String(length=50), nullable=True),
+    sa.Column('phase_testing', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_projects_employee_id', 'archived_projects', ['employee_id'], unique=False)
+    op.create_table('archived_availability',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('status', _availability_status(), nullable=False),
+    sa.Column('available_from', sa.DateTime(), nullable=True),
+    sa.Column('memo', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_availability_employee_id', 'archived_availability', ['employee_id'], unique=False)
+    op.create_table('archived_availability_history',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('status', _availability_status(), nullable=False),
+    sa.Column('available_from', sa.DateTime(), nullable=True),
+    sa.Column('memo', sa.Text(), nullable=True),
+    sa.Column('valid_from', sa.DateTime(), nullable=False),
+    sa.Column('valid_to', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_availability_history_employee_id', 'archived_availability_history', ['employee_id'], unique=False)
+    op.create_table('archived_one_on_ones',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('memo', sa.Text(), nullable=True),
+    sa.Column('status', postgresql.ENUM('GOOD', 'NORMAL', 'ATTENTION', name='oneononestatus', create_type=False), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_one_on_ones_employee_id', 'archived_one_on_ones', ['employee_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_one_on_ones_employee_id', table_name='archived_one_on_ones')
+    op.drop_table('archived_one_on_ones')
+    op.drop_index('ix_archived_availability_history_employee_id', table_name='archived_availability_history')
+    op.drop_table('archived_availability_history')
+    op.drop_index('ix_archived_availability_employee_id', table_name='archived_availability')
+    op.drop_table('archived_availability')
+    op.drop_index('ix_archived_projects_employee_id', table_name='archived_projects')
+    op.drop_table('archived_projects')
+    op.drop_index('ix_archived_employee_skills_employee_id', table_name='archived_employee_skills')
+    op.drop_table('archived_employee_skills')
+    op.drop_table('archived_employees')
@@ -0,0 +1,24 @@
+"""add employee_profiles free_status index
+
+Revision ID: e5a7c3d9f1b2
+Revises: d4f9b2c6e8a1
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c3d9f1b2'
+down_revision = 'd4f9b2c6e8a1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_employee_profiles_free_status'), 'employee_profiles', ['free_status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_employee_profiles_free_status'), table_name='employee_profiles')
@@ -0,0 +1,26 @@
+"""add employee_skills indexes
+
+Revision ID: f4c1d8b3a6e2
+Revises: e29f6a4c8b71
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4c1d8b3a6e2'
+down_revision = 'e29f6a4c8b71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_employee_skills_employee_id_skill_id', 'employee_skills', ['employee_id', 'skill_id'], unique=False)
+    op.create_index('ix_employee_skills_skill_id_employee_id', 'employee_skills', ['skill_id', 'employee_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_employee_skills_skill_id_employee_id', table_name='employee_skills')
+    op.drop_index('ix_employee_skills_employee_id_skill_id', table_name='employee_skills')
@@ -1,9 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from ..db.database import get_db
+from ..db.database import get_db, SessionLocal
 from ..models.user import User
+from ..services.principal_cache import (
+    Principal,
+    get_cached_claims,
+    cache_claims,
+    get_cached_principal,
+    cache_principal,
+    invalidate_principal
+)
 from pydantic import BaseModel
+from typing import Optional
 import jwt
 from datetime import datetime, timedelta
 import os
@@ -36,31 +45,82 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+def _credentials_exception(detail: str = "Invalid authentication credentials"):
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _verify_token(token: str) -> str:
+    """
+    トークンを検証して subject（メールアドレス）を返す。検証結果はキャッシュする
+    """
+    email = get_cached_claims(token)
+    if email is not None:
+        return email
+
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except jwt.PyJWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception()
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return user
+    email = payload.get("sub")
+    if email is None:
+        raise _credentials_exception()
+
+    cache_claims(token, email, payload.get("exp"))
+    return email
+
+def _load_principal(email: str) -> Optional[Principal]:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        return Principal.from_user(user) if user else None
+    finally:
+        db.close()
+
+def _resolve_principal(email: str) -> Optional[Principal]:
+    principal = get_cached_principal(email)
+    if principal is None:
+        principal = _load_principal(email)
+        if principal is not None:
+            cache_principal(principal)
+    return principal
+
+def get_current_principal(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Principal:
+    """
+    認証済みユーザーを返す。キャッシュに載っていればDBには接続しない
+    """
+    email = _verify_token(credentials.credentials)
+
+    principal = _resolve_principal(email)
+    if principal is None:
+        raise _credentials_exception("User not found")
+    if not principal.is_active:
+        raise _credentials_exception("Inactive user")
+    return principal
+
+def principal_from_token(token: str) -> Optional[Principal]:
+    """
+    依存性を使わずにトークンから認証主体を得る（ミドルウェア用）。無効なら None
+    """
+    try:
+        email = _verify_token(token)
+    except HTTPException:
+        return None
+
+    principal = _resolve_principal(email)
+    return principal if principal is not None and principal.is_active else None
+
+def get_current_user(principal: Principal = Depends(get_current_principal)) -> Principal:
+    # 互換のため残す。User と同じ属性を持つ Principal を返す
+    return principal
+
+def get_current_admin(principal: Principal = Depends(get_current_principal)) -> Principal:
+    if not principal.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return principal
 
 @router.post("/google", response_model=TokenResponse)
 def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
@@ -80,12 +140,16 @@ def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
         db.commit()
         db.refresh(user)
     else:
+        # 無効化されたユーザーはログインし直しても有効に戻さない
+        if not user.is_active:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+
         # Update existing user
         user.google_id = auth_data.google_id
         user.avatar_url = auth_data.avatar_url
         user.name = auth_data.name
-        user.is_active = True
         db.commit()
+        invalidate_principal(user.email)
 
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -95,8 +159,23 @@ def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db)):
 
     return {"access_token": access_token, "token_type": "bearer"}
 
+@router.post("/users/{user_id}/deactivate")
+def deactivate_user(
+    user_id: int,
+    admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    user.is_active = False
+    db.commit()
+    invalidate_principal(user.email)
+    return {"message": "User deactivated successfully"}
+
 @router.get("/me")
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: Principal = Depends(get_current_principal)):
     return {
         "id": current_user.id,
         "email": current_user.email,
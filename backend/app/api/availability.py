@@ -1,12 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
-from ..db.database import get_db
-from ..models.employee import Availability
-from ..schemas.employee import Availability as AvailabilitySchema, AvailabilityCreate, AvailabilityUpdate
+from sqlalchemy import func, case, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import List, Optional
+from datetime import datetime, date
+from ..db.database import get_db, get_read_db, ReadSession
+from ..models.employee import Availability, AvailabilityHistory, AvailabilityStatus, Employee
+from ..schemas.employee import (
+    Availability as AvailabilitySchema,
+    AvailabilityCreate,
+    AvailabilityUpdate,
+    AvailabilityHistory as AvailabilityHistorySchema
+)
+from ..services.profiles import refresh_employee_profile, refresh_employee_profiles
+from ..services.availability_history import (
+    record_availability_change,
+    record_availability_changes,
+    close_availability_history,
+    valid_at
+)
+from ..utils.dates import days_between, to_datetime
 
 router = APIRouter()
 
+# 待機（ベンチ）とみなす稼働状況
+BENCH_STATUSES = [AvailabilityStatus.IMMEDIATELY_AVAILABLE]
+
+BULK_MAX_ITEMS = 5000
+# 一括登録で省略できる項目（既存行では指定されたときだけ更新する）
+BULK_OPTIONAL_COLUMNS = ("available_from", "memo")
+
 @router.get("/", response_model=List[AvailabilitySchema])
 def get_availability(
     skip: int = 0,
@@ -16,6 +39,132 @@ def get_availability(
     availability = db.query(Availability).offset(skip).limit(limit).all()
     return availability
 
+def _get_availability_at(
+    db: Session,
+    at: datetime,
+    status: Optional[AvailabilityStatus],
+    skip: int,
+    limit: int
+):
+    query = db.query(
+        AvailabilityHistory.employee_id,
+        Employee.name,
+        AvailabilityHistory.status,
+        AvailabilityHistory.available_from,
+        AvailabilityHistory.valid_from,
+        AvailabilityHistory.valid_to
+    ).join(
+        Employee, Employee.id == AvailabilityHistory.employee_id
+    ).filter(valid_at(db, at.replace(tzinfo=None)))
+
+    if status:
+        query = query.filter(AvailabilityHistory.status == status)
+
+    rows = query.order_by(AvailabilityHistory.employee_id).offset(skip).limit(limit).all()
+
+    return [
+        {
+            "employee_id": row.employee_id,
+            "employee_name": row.name,
+            "status": row.status.value,
+            "available_from": row.available_from,
+            "valid_from": row.valid_from,
+            "valid_to": row.valid_to
+        }
+        for row in rows
+    ]
+
+@router.get("/at")
+async def get_availability_at(
+    at: datetime = Query(..., description="この時点の稼働状況を返す"),
+    status: Optional[AvailabilityStatus] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    指定時点の各社員の稼働状況を履歴から返す
+    """
+    return await db.run(_get_availability_at, at, status, skip, limit)
+
+def _get_bench_duration(
+    db: Session,
+    employee_id: int,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    skip: int,
+    limit: int
+):
+    start = to_datetime(date_from)
+    end = to_datetime(date_to) or datetime.now()
+
+    period_start = AvailabilityHistory.valid_from
+    if start is not None:
+        period_start = case((AvailabilityHistory.valid_from > start, AvailabilityHistory.valid_from), else_=start)
+
+    valid_to = func.coalesce(AvailabilityHistory.valid_to, end)
+    period_end = case((valid_to < end, valid_to), else_=end)
+    bench_days = days_between(period_start, period_end, db.get_bind().dialect.name)
+
+    query = db.query(
+        AvailabilityHistory.employee_id,
+        Employee.name,
+        func.sum(bench_days).label("bench_days"),
+        func.count(AvailabilityHistory.id).label("periods"),
+        func.max(AvailabilityHistory.valid_from).label("last_bench_start")
+    ).join(
+        Employee, Employee.id == AvailabilityHistory.employee_id
+    ).filter(
+        AvailabilityHistory.status.in_(BENCH_STATUSES),
+        AvailabilityHistory.valid_from < end
+    )
+
+    if start is not None:
+        query = query.filter(or_(AvailabilityHistory.valid_to.is_(None), AvailabilityHistory.valid_to > start))
+
+    if employee_id:
+        query = query.filter(AvailabilityHistory.employee_id == employee_id)
+
+    rows = query.group_by(AvailabilityHistory.employee_id, Employee.name).order_by(
+        func.sum(bench_days).desc(), AvailabilityHistory.employee_id
+    ).offset(skip).limit(limit).all()
+
+    return [
+        {
+            "employee_id": row.employee_id,
+            "employee_name": row.name,
+            "bench_days": round(float(row.bench_days or 0), 1),
+            "periods": row.periods,
+            "last_bench_start": row.last_bench_start
+        }
+        for row in rows
+    ]
+
+@router.get("/bench-duration")
+async def get_bench_duration(
+    employee_id: int = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    skip: int = 0,
+    limit: int = 100,
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    社員ごとの待機（即稼働可能）期間の合計日数を返す
+
+    from/to を指定すると、その期間と重なる部分だけを集計する。
+    """
+    return await db.run(_get_bench_duration, employee_id, date_from, date_to, skip, limit)
+
+def _get_availability_history(db: Session, employee_id: int):
+    return db.query(AvailabilityHistory).filter(
+        AvailabilityHistory.employee_id == employee_id
+    ).order_by(AvailabilityHistory.valid_from.desc(), AvailabilityHistory.id.desc()).all()
+
+@router.get("/history/{employee_id}", response_model=List[AvailabilityHistorySchema])
+async def get_availability_history(employee_id: int, db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_availability_history, employee_id)
+
 @router.get("/{employee_id}", response_model=AvailabilitySchema)
 def get_employee_availability(employee_id: int, db: Session = Depends(get_db)):
     availability = db.query(Availability).filter(Availability.employee_id == employee_id).first()
@@ -31,10 +180,87 @@ def create_availability(availability: AvailabilityCreate, db: Session = Depends(
 
     db_availability = Availability(**availability.model_dump())
     db.add(db_availability)
+    db.flush()
+    record_availability_change(db, db_availability)
+    refresh_employee_profile(db, db_availability.employee_id)
     db.commit()
     db.refresh(db_availability)
     return db_availability
 
+def _upsert_statement(db: Session, items: List[AvailabilityCreate]):
+    # 既存行は指定された項目だけを更新する（省略された項目は現在値のまま）。
+    # 省略できる列ごとに指定した社員IDを渡し、CASE で列ごとに切り替えて1文で反映する
+    insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = insert(Availability).values([item.model_dump() for item in items])
+    set_ = {"status": statement.excluded.status, "updated_at": func.now()}
+    for name in BULK_OPTIONAL_COLUMNS:
+        set_ids = [item.employee_id for item in items if name in item.model_fields_set]
+        if len(set_ids) == len(items):
+            set_[name] = statement.excluded[name]
+        elif set_ids:
+            set_[name] = case(
+                (statement.excluded.employee_id.in_(set_ids), statement.excluded[name]),
+                else_=Availability.__table__.c[name]
+            )
+    return statement.on_conflict_do_update(index_elements=[Availability.employee_id], set_=set_)
+
+@router.post("/bulk")
+def bulk_upsert_availability(items: List[AvailabilityCreate], db: Session = Depends(get_db)):
+    """
+    複数社員の稼働状況を1トランザクションで登録・更新する
+
+    INSERT ... ON CONFLICT (employee_id) DO UPDATE で反映し、項目ごとの結果を返す。
+    既存行は指定された項目だけを更新する（全項目を1文で反映）。
+    """
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {BULK_MAX_ITEMS})")
+
+    requested_ids = {item.employee_id for item in items}
+    known_ids = {
+        employee_id for (employee_id,) in
+        db.query(Employee.id).filter(Employee.id.in_(requested_ids))
+    } if requested_ids else set()
+    existing_ids = {
+        employee_id for (employee_id,) in
+        db.query(Availability.employee_id).filter(Availability.employee_id.in_(known_ids))
+    } if known_ids else set()
+
+    # 同じ社員が複数回含まれる場合は最後の指定を採用する
+    last_index = {item.employee_id: index for index, item in enumerate(items)}
+
+    results = []
+    applied = []
+    for index, item in enumerate(items):
+        result = {"index": index, "employee_id": item.employee_id}
+        if item.employee_id not in known_ids:
+            result.update({"result": "error", "error": "Employee not found"})
+        elif last_index[item.employee_id] != index:
+            result.update({"result": "skipped", "error": "Superseded by a later item for the same employee"})
+        else:
+            result["result"] = "updated" if item.employee_id in existing_ids else "created"
+            applied.append(item)
+        results.append(result)
+
+    if applied:
+        db.execute(_upsert_statement(db, applied))
+
+        applied_ids = [item.employee_id for item in applied]
+        # 省略項目は既存値が残るので、履歴には反映後の行を記録する
+        current = db.query(Availability).filter(
+            Availability.employee_id.in_(applied_ids)
+        ).populate_existing().all()
+        record_availability_changes(db, current)
+        refresh_employee_profiles(db, applied_ids)
+        db.commit()
+
+    return {
+        "created": sum(1 for r in results if r["result"] == "created"),
+        "updated": sum(1 for r in results if r["result"] == "updated"),
+        "skipped": sum(1 for r in results if r["result"] == "skipped"),
+        "failed": sum(1 for r in results if r["result"] == "error"),
+        "results": results
+    }
+
 @router.put("/{employee_id}", response_model=AvailabilitySchema)
 def update_availability(
     employee_id: int,
@@ -48,6 +274,9 @@ def update_availability(
     for field, value in availability_update.model_dump(exclude_unset=True).items():
         setattr(db_availability, field, value)
 
+    db.flush()
+    record_availability_change(db, db_availability)
+    refresh_employee_profile(db, employee_id)
     db.commit()
     db.refresh(db_availability)
     return db_availability
@@ -59,5 +288,8 @@ def delete_availability(employee_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Availability not found")
 
     db.delete(db_availability)
+    db.flush()
+    close_availability_history(db, [employee_id], datetime.now())
+    refresh_employee_profile(db, employee_id)
     db.commit()
     return {"message": "Availability deleted successfully"}
\ No newline at end of file
@@ -1,47 +1,30 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from collections import Counter
+import heapq
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, extract, and_, or_
-from typing import List, Dict
+from sqlalchemy import func, and_, or_, case, select
+from typing import List, Dict, Optional
 from datetime import datetime, date
-from ..db.database import get_db
-from ..models.employee import Employee, Skill, Availability, OneOnOne, AvailabilityStatus, OneOnOneStatus
+from ..db.database import get_read_db, ReadSession
+from ..models.employee import (
+    Employee,
+    EmployeeProfile,
+    Skill,
+    OneOnOne,
+    OneOnOneStatus,
+    employee_skills
+)
+from ..services.profiles import DYNAMIC_FREE_STATUSES, status_free_date
+from ..services import dashboard_queries
+from ..utils.dates import current_month_range, month_range
 
 router = APIRouter()
 
 @router.get("/stats")
-def get_dashboard_stats(db: Session = Depends(get_db)):
-    total_employees = db.query(Employee).count()
+async def get_dashboard_stats(db: ReadSession = Depends(get_read_db)):
+    return await db.run(dashboard_queries.dashboard_stats)
 
-    next_month_available = db.query(Availability).filter(
-        or_(
-            Availability.status == AvailabilityStatus.AVAILABLE_NEXT_MONTH,
-            Availability.status == AvailabilityStatus.IMMEDIATELY_AVAILABLE
-        )
-    ).count()
-
-    current_date = date.today()
-    one_on_one_completion = db.query(OneOnOne.employee_id.distinct()).filter(
-        extract('year', OneOnOne.date) == current_date.year,
-        extract('month', OneOnOne.date) == current_date.month
-    ).count()
-
-    completion_rate = (one_on_one_completion / total_employees * 100) if total_employees > 0 else 0
-
-    attention_count = db.query(OneOnOne).filter(
-        OneOnOne.status == OneOnOneStatus.ATTENTION,
-        extract('year', OneOnOne.date) == current_date.year,
-        extract('month', OneOnOne.date) == current_date.month
-    ).count()
-
-    return {
-        "total_employees": total_employees,
-        "next_month_available": next_month_available,
-        "one_on_one_completion_rate": round(completion_rate, 2),
-        "attention_employees": attention_count
-    }
-
-@router.get("/skill-distribution")
-def get_skill_distribution(db: Session = Depends(get_db)):
+def _get_skill_distribution(db: Session):
     skill_counts = db.query(
         Skill.category,
         func.count(Employee.id).label('count')
@@ -51,8 +34,11 @@ def get_skill_distribution(db: Session = Depends(get_db)):
 
     return [{"category": category, "count": count} for category, count in skill_counts]
 
-@router.get("/skill-distribution/{category}")
-def get_detailed_skill_distribution(category: str, db: Session = Depends(get_db)):
+@router.get("/skill-distribution")
+async def get_skill_distribution(db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_skill_distribution)
+
+def _get_detailed_skill_distribution(db: Session, category: str):
     skill_details = db.query(
         Skill.name,
         func.count(Employee.id).label('count')
@@ -64,25 +50,15 @@ def get_detailed_skill_distribution(category: str, db: Session = Depends(get_db)
 
     return [{"name": name, "count": count} for name, count in skill_details]
 
-@router.get("/availability-status")
-def get_availability_status(db: Session = Depends(get_db)):
-    availability_counts = db.query(
-        Availability.status,
-        func.count(Availability.id).label('count')
-    ).group_by(Availability.status).all()
-
-    total_with_availability = sum([count for _, count in availability_counts])
-    total_employees = db.query(Employee).count()
-    no_status_count = total_employees - total_with_availability
-
-    result = [{"status": status.value, "count": count} for status, count in availability_counts]
-    if no_status_count > 0:
-        result.append({"status": "no_status", "count": no_status_count})
+@router.get("/skill-distribution/{category}")
+async def get_detailed_skill_distribution(category: str, db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_detailed_skill_distribution, category)
 
-    return result
+@router.get("/availability-status")
+async def get_availability_status(db: ReadSession = Depends(get_read_db)):
+    return await db.run(dashboard_queries.availability_status_counts)
 
-@router.get("/recent-one-on-ones")
-def get_recent_one_on_ones(limit: int = 10, db: Session = Depends(get_db)):
+def _get_recent_one_on_ones(db: Session, limit: int):
     recent_one_on_ones = db.query(OneOnOne).options(
         joinedload(OneOnOne.employee)
     ).order_by(OneOnOne.date.desc()).limit(limit).all()
@@ -96,4 +72,218 @@ def get_recent_one_on_ones(limit: int = 10, db: Session = Depends(get_db)):
             "memo": ono.memo
         }
         for ono in recent_one_on_ones
-    ]
\ No newline at end of file
+    ]
+
+@router.get("/recent-one-on-ones")
+async def get_recent_one_on_ones(limit: int = 10, db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_recent_one_on_ones, limit)
+
+def _get_attention_streaks(db: Session, min_streak: int, skip: int, limit: int):
+    # GOOD < NORMAL < ATTENTION の順に悪化とみなす
+    status_rank = case(
+        (OneOnOne.status == OneOnOneStatus.GOOD, 0),
+        (OneOnOne.status == OneOnOneStatus.NORMAL, 1),
+        else_=2
+    )
+
+    ranked = select(
+        OneOnOne.employee_id,
+        OneOnOne.date,
+        OneOnOne.status,
+        status_rank.label("rank"),
+        func.lag(status_rank).over(
+            partition_by=OneOnOne.employee_id,
+            order_by=(OneOnOne.date, OneOnOne.id)
+        ).label("prev_rank"),
+        func.row_number().over(
+            partition_by=OneOnOne.employee_id,
+            order_by=(OneOnOne.date.desc(), OneOnOne.id.desc())
+        ).label("rn")
+    ).subquery()
+
+    is_concerning = or_(
+        ranked.c.rank == 2,
+        and_(ranked.c.prev_rank.isnot(None), ranked.c.rank > ranked.c.prev_rank)
+    )
+
+    # 最新から数えて最初に問題のない記録が現れるまでの件数を連続回数とする
+    streaks = select(
+        ranked.c.employee_id,
+        func.coalesce(
+            func.min(case((~is_concerning, ranked.c.rn))) - 1,
+            func.count()
+        ).label("streak")
+    ).group_by(ranked.c.employee_id).subquery()
+
+    latest = select(ranked).where(ranked.c.rn == 1).subquery()
+
+    rows = db.execute(
+        select(
+            Employee.id,
+            Employee.name,
+            streaks.c.streak,
+            latest.c.status,
+            latest.c.date
+        ).join(
+            streaks, streaks.c.employee_id == Employee.id
+        ).join(
+            latest, latest.c.employee_id == Employee.id
+        ).where(
+            streaks.c.streak >= min_streak
+        ).order_by(
+            streaks.c.streak.desc(), latest.c.date.desc(), Employee.id
+        ).offset(skip).limit(limit)
+    ).all()
+
+    return [
+        {
+            "employee_id": row.id,
+            "employee_name": row.name,
+            "streak": row.streak,
+            "latest_status": row.status.value,
+            "latest_date": row.date
+        }
+        for row in rows
+    ]
+
+@router.get("/attention-streaks")
+async def get_attention_streaks(
+    min_streak: int = Query(2, ge=1, description="連続回数の下限"),
+    skip: int = 0,
+    limit: int = 100,
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    直近の1on1で「要注意」または前回より悪化が連続している社員を返す
+
+    ウィンドウ関数で社員ごとの履歴を集計し、Python側に履歴を読み込まない。
+    """
+    return await db.run(_get_attention_streaks, min_streak, skip, limit)
+
+
+def _sweep_by_month(events, boundaries):
+    """
+    空き開始日順に並んだ (日時, キー) を月境界で1回だけ走査し、月ごとの件数を数える
+    """
+    before = Counter()
+    monthly = [Counter() for _ in boundaries[1:]]
+    position = 0
+
+    while position < len(events) and events[position][0] < boundaries[0]:
+        before[events[position][1]] += 1
+        position += 1
+
+    for index, month_end in enumerate(boundaries[1:]):
+        while position < len(events) and events[position][0] < month_end:
+            monthly[index][events[position][1]] += 1
+            position += 1
+
+    return before, monthly
+
+def _merge_events(ordered_events, extra_events, horizon_end):
+    """
+    日付順の events に、順不同の extra_events のうち horizon_end より前のものを合流させる
+    """
+    extra_events = sorted(event for event in extra_events if event[0] < horizon_end)
+    return list(heapq.merge(ordered_events, extra_events))
+
+def _get_bench_forecast(db: Session, months: int, group_by: str, category: Optional[str]):
+    month_start, _ = current_month_range()
+    boundaries = [month_start]
+    for _ in range(months):
+        boundaries.append(month_range(boundaries[-1].year, boundaries[-1].month)[1])
+    horizon_end = boundaries[-1]
+    now = datetime.now()
+
+    key_column = Skill.name if group_by == "skill" else Skill.category
+
+    def skill_query(column):
+        query = db.query(column, key_column, EmployeeProfile.employee_id).join(
+            employee_skills, employee_skills.c.employee_id == EmployeeProfile.employee_id
+        ).join(
+            Skill, Skill.id == employee_skills.c.skill_id
+        )
+        if category:
+            query = query.filter(Skill.category == category)
+        return query.distinct()
+
+    def total_query(column):
+        query = db.query(column)
+        if category:
+            # 合計も指定カテゴリのスキルを持つ社員に絞る（1人は1回だけ数える）
+            query = query.filter(EmployeeProfile.employee_id.in_(
+                select(employee_skills.c.employee_id).join(
+                    Skill, Skill.id == employee_skills.c.skill_id
+                ).where(Skill.category == category)
+            ))
+        return query
+
+    # 空き開始日が確定している社員は earliest_free_date のインデックスで範囲指定し、日付順に読む
+    fixed_free_date = EmployeeProfile.earliest_free_date
+    skill_events = [
+        (free_date, key)
+        for free_date, key, _ in skill_query(fixed_free_date).filter(
+            fixed_free_date < horizon_end
+        ).order_by(fixed_free_date).all()
+    ]
+    total_events = [
+        (free_date, "total")
+        for (free_date,) in total_query(fixed_free_date).filter(
+            fixed_free_date < horizon_end
+        ).order_by(fixed_free_date).all()
+    ]
+
+    # 即稼働可能・来月から可の社員は free_status のインデックスで取得し、現在時刻から日付を決めて合流させる
+    dynamic = EmployeeProfile.free_status.in_(DYNAMIC_FREE_STATUSES)
+    skill_events = _merge_events(skill_events, [
+        (status_free_date(status, now), key)
+        for status, key, _ in skill_query(EmployeeProfile.free_status).filter(dynamic).all()
+    ], horizon_end)
+    total_events = _merge_events(total_events, [
+        (status_free_date(status, now), "total")
+        for (status,) in total_query(EmployeeProfile.free_status).filter(dynamic).all()
+    ], horizon_end)
+
+    skill_before, skill_monthly = _sweep_by_month(skill_events, boundaries)
+    total_before, total_monthly = _sweep_by_month(total_events, boundaries)
+
+    # 空き終了（次の案件へのアサイン）はデータがないため数えない。各月の値は月末までに
+    # 空きになった人数の累計で、その後アサインされた社員も含む上限値である
+    forecast = []
+    cumulative = Counter(skill_before)
+    cumulative_total = total_before["total"]
+    for index, month_begin in enumerate(boundaries[:-1]):
+        cumulative.update(skill_monthly[index])
+        cumulative_total += total_monthly[index]["total"]
+        forecast.append({
+            "month": month_begin.strftime("%Y-%m"),
+            "newly_available": total_monthly[index]["total"],
+            "cumulative_available": cumulative_total,
+            "newly_available_by_group": dict(skill_monthly[index]),
+            "cumulative_available_by_group": dict(cumulative)
+        })
+
+    return {
+        "group_by": group_by,
+        "already_available": total_before["total"],
+        "already_available_by_group": dict(skill_before),
+        "months": forecast
+    }
+
+@router.get("/bench-forecast")
+async def get_bench_forecast(
+    months: int = Query(12, ge=1, le=36),
+    group_by: str = Query("skill", pattern="^(skill|category)$"),
+    category: Optional[str] = None,
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    今後の月ごとに稼働可能になる人数を、スキル別またはカテゴリ別に予測する
+
+    案件終了日と稼働状況から算出済みの employee_profiles.earliest_free_date をインデックス順に
+    範囲取得し、即稼働可能・来月から可の社員（現在時刻から日付を決める）を合流させて、
+    1回の走査で月別に集計する。空きの終了は扱わないため、
+    cumulative_available はその月末までに空きになった人数の累計（現時点の待機人数ではない）。
+    category を指定すると、合計もそのカテゴリのスキルを持つ社員に絞る。
+    """
+    return await db.run(_get_bench_forecast, months, group_by, category)
@@ -1,153 +1,118 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
-from typing import List, Optional
-from ..db.database import get_db
-from ..models.employee import Employee, Skill, employee_skills, Availability
+from typing import Dict, List, Optional
+from datetime import datetime
+import csv
+from ..db.database import get_db, get_read_db, ReadSession
+from ..models.employee import Employee, employee_skills
 from ..schemas.employee import (
     Employee as EmployeeSchema,
     EmployeeCreate,
     EmployeeUpdate,
     EmployeeList,
     EmployeeSearchFilters,
+    EmployeeImport,
+    EmployeeImportResult,
+    EmployeeIdsRequest,
     ProjectMatchingRequest,
     ProjectMatchingResult
 )
+from ..services.profiles import normalize_phase, phase_count, refresh_employee_profiles, tag_months_at, free_date_at
+from ..services.employee_import import import_employees, csv_record_to_import
+from ..services.skill_catalog import SkillCatalog, get_skill_catalog
+from ..services import employee_queries
+from ..services.employee_archive import archive_employees, delete_employees, existing_employee_ids
+from ..utils.uploads import UPLOAD_FORMAT_PATTERN, detect_upload_format, iter_upload_records
 
 router = APIRouter()
 
+REQUIRED_SKILL_SCORE = 3.0
+PROJECT_SKILL_SCORE = 1.5
+PREFERRED_SKILL_SCORE = 1.0
+EXPERIENCE_SCORE_PER_YEAR = 0.5
+EXPERIENCE_SCORE_MAX = 1.0
+PHASE_SCORE = 1.0
+START_DATE_SCORE = 1.0
+
 @router.get("/", response_model=List[EmployeeList])
-def get_employees(
+async def get_employees(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
-    employees = db.query(Employee).options(
-        joinedload(Employee.availability),
-        joinedload(Employee.skills)
-    ).offset(skip).limit(limit).all()
-
-    result = []
-    for emp in employees:
-        main_skills = [skill.name for skill in emp.skills[:3]]
-        result.append(EmployeeList(
-            id=emp.id,
-            name=emp.name,
-            years_experience=emp.years_experience,
-            main_role=emp.main_role,
-            unit_price_min=emp.unit_price_min,
-            unit_price_max=emp.unit_price_max,
-            availability_status=emp.availability.status.value.lower() if emp.availability else None,
-            main_skills=main_skills
-        ))
-    return result
+    # ORM オブジェクトへの変換をイベントループで行わないよう、スレッドプールで実行する
+    return await db.run_in_thread(employee_queries.list_employees, skip, limit)
 
 @router.get("/search", response_model=List[EmployeeList])
-def search_employees(
+async def search_employees(
     skill_tags: Optional[str] = Query(None, description="Comma-separated skill names"),
     years_experience_min: Optional[int] = None,
     years_experience_max: Optional[int] = None,
     availability_status: Optional[str] = Query(None, description="Comma-separated availability status"),
     unit_price_min: Optional[int] = None,
     unit_price_max: Optional[int] = None,
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
-    query = db.query(Employee).options(
-        joinedload(Employee.availability),
-        joinedload(Employee.skills)
-    )
-
-    if skill_tags:
-        skill_list = [s.strip() for s in skill_tags.split(',')]
-        query = query.join(Employee.skills).filter(Skill.name.in_(skill_list))
-
-    if years_experience_min:
-        query = query.filter(Employee.years_experience >= years_experience_min)
-
-    if years_experience_max:
-        query = query.filter(Employee.years_experience <= years_experience_max)
-
-    if unit_price_min:
-        query = query.filter(Employee.unit_price_min >= unit_price_min)
-
-    if unit_price_max:
-        query = query.filter(Employee.unit_price_max <= unit_price_max)
-
-    if availability_status:
-        status_list = [s.strip() for s in availability_status.split(',')]
-        query = query.join(Employee.availability).filter(Availability.status.in_(status_list))
-
-    employees = query.distinct().all()
-
-    result = []
-    for emp in employees:
-        main_skills = [skill.name for skill in emp.skills[:3]]
-        result.append(EmployeeList(
-            id=emp.id,
-            name=emp.name,
-            years_experience=emp.years_experience,
-            main_role=emp.main_role,
-            unit_price_min=emp.unit_price_min,
-            unit_price_max=emp.unit_price_max,
-            availability_status=emp.availability.status.value.lower() if emp.availability else None,
-            main_skills=main_skills
-        ))
-    return result
-
-@router.get("/{employee_id}", response_model=EmployeeSchema)
-def get_employee(employee_id: int, db: Session = Depends(get_db)):
-    employee = db.query(Employee).options(
-        joinedload(Employee.projects),
-        joinedload(Employee.availability),
-        joinedload(Employee.one_on_ones)
-    ).filter(Employee.id == employee_id).first()
+    return await db.run_in_thread(employee_queries.search_employees, skill_tags, years_experience_min, years_experience_max, availability_status, unit_price_min, unit_price_max)
+
+@router.post("/import", response_model=List[EmployeeImportResult])
+def import_employees_json(employees: List[EmployeeImport], db: Session = Depends(get_db)):
+    """
+    社員をスキル・稼働状況・案件ごと一括登録し、入力順に登録IDを返す
+    """
+    results = import_employees(db, ((index, record, None) for index, record in enumerate(employees)))
+    db.commit()
+    return results
 
+@router.post("/import/file", response_model=List[EmployeeImportResult])
+def import_employees_file(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern=UPLOAD_FORMAT_PATTERN, description="省略時はファイル拡張子から判定"),
+    db: Session = Depends(get_db)
+):
+    """
+    CSV / NDJSON から社員を一括登録する（index は行番号）
+
+    CSV の skills 列は「名前:レベル:経験年数」のセミコロン区切り。案件は NDJSON のみ対応。
+    """
+    fmt = detect_upload_format(file, format)
+
+    def records():
+        for line_number, record, error in iter_upload_records(file, fmt):
+            if error is not None:
+                yield line_number, None, error
+                continue
+            try:
+                data = csv_record_to_import(record) if fmt == "csv" else record
+                yield line_number, EmployeeImport.model_validate(data), None
+            except ValidationError as e:
+                first = e.errors()[0]
+                location = ".".join(str(part) for part in first["loc"])
+                yield line_number, None, f"{location}: {first['msg']}"
+
+    try:
+        results = import_employees(db, records())
+        db.commit()
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    except csv.Error as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
+    return results
+
+def _get_employee(db: Session, employee_id: int):
+    employee = employee_queries.get_employee_detail(db, employee_id)
     if employee is None:
         raise HTTPException(status_code=404, detail="Employee not found")
+    return employee
 
-    # スキル情報を取得（level と years_experience を含む）
-    from ..models.employee import employee_skills, Skill
-    skills_data = db.query(
-        employee_skills.c.skill_id,
-        Skill.name.label('skill_name'),
-        Skill.category.label('skill_category'),
-        employee_skills.c.level,
-        employee_skills.c.years_experience
-    ).join(
-        Skill, employee_skills.c.skill_id == Skill.id
-    ).filter(
-        employee_skills.c.employee_id == employee_id
-    ).all()
-
-    # EmployeeSkillの形式でスキルデータを作成
-    skills = []
-    for skill_data in skills_data:
-        skills.append({
-            'skill_id': skill_data.skill_id,
-            'skill_name': skill_data.skill_name,
-            'skill_category': skill_data.skill_category,
-            'level': skill_data.level,
-            'years_experience': skill_data.years_experience
-        })
-
-    # レスポンス用の辞書を作成
-    response_data = {
-        'id': employee.id,
-        'name': employee.name,
-        'years_experience': employee.years_experience,
-        'main_role': employee.main_role,
-        'unit_price_min': employee.unit_price_min,
-        'unit_price_max': employee.unit_price_max,
-        'desired_career': employee.desired_career,
-        'created_at': employee.created_at,
-        'updated_at': employee.updated_at,
-        'skills': skills,
-        'projects': employee.projects,
-        'availability': employee.availability,
-        'one_on_ones': employee.one_on_ones
-    }
-
-    return response_data
+@router.get("/{employee_id}", response_model=EmployeeSchema)
+async def get_employee(employee_id: int, db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_employee, employee_id)
 
 @router.post("/", response_model=EmployeeSchema)
 def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
@@ -160,9 +125,33 @@ def create_employee(employee: EmployeeCreate, db: Session = Depends(get_db)):
         desired_career=employee.desired_career
     )
     db.add(db_employee)
+    db.flush()
+
+    if employee.skills:
+        catalog = get_skill_catalog(
+            db,
+            skill_ids=[skill["skill_id"] for skill in employee.skills if skill.get("skill_id") is not None],
+            names=[
+                skill.get("skill_name") or skill.get("name") for skill in employee.skills
+                if skill.get("skill_id") is None and (skill.get("skill_name") or skill.get("name"))
+            ]
+        )
+        skill_rows = {}
+        for skill in employee.skills:
+            skill_id = catalog.resolve(skill.get("skill_name") or skill.get("name"), skill.get("skill_id"))
+            if skill_id is None:
+                db.rollback()
+                raise HTTPException(status_code=400, detail=f"Skill not found: {skill}")
+            skill_rows[skill_id] = {
+                "employee_id": db_employee.id,
+                "skill_id": skill_id,
+                "level": skill.get("level", 1),
+                "years_experience": skill.get("years_experience", 0)
+            }
+        db.execute(employee_skills.insert(), list(skill_rows.values()))
+
     db.commit()
-    db.refresh(db_employee)
-    return db_employee
+    return _get_employee(db, db_employee.id)
 
 @router.put("/{employee_id}", response_model=EmployeeSchema)
 def update_employee(
@@ -183,42 +172,126 @@ def update_employee(
 
 @router.delete("/{employee_id}")
 def delete_employee(employee_id: int, db: Session = Depends(get_db)):
-    db_employee = db.query(Employee).filter(Employee.id == employee_id).first()
-    if db_employee is None:
+    if not existing_employee_ids(db, [employee_id]):
         raise HTTPException(status_code=404, detail="Employee not found")
 
-    db.delete(db_employee)
+    # 関連データは読み込まず、テーブルごとに一括削除する
+    delete_employees(db, [employee_id])
     db.commit()
     return {"message": "Employee deleted successfully"}
 
-@router.post("/matching", response_model=List[ProjectMatchingResult])
-def project_matching(
+@router.post("/{employee_id}/archive")
+def archive_employee(employee_id: int, db: Session = Depends(get_db)):
+    if not existing_employee_ids(db, [employee_id]):
+        raise HTTPException(status_code=404, detail="Employee not found")
+
+    archived = archive_employees(db, [employee_id])
+    db.commit()
+    return {"message": "Employee archived successfully", "archived": archived}
+
+@router.post("/bulk-delete")
+def bulk_delete_employees(request: EmployeeIdsRequest, db: Session = Depends(get_db)):
+    employee_ids = existing_employee_ids(db, request.employee_ids)
+    deleted = delete_employees(db, employee_ids)
+    db.commit()
+    return {
+        "employee_ids": employee_ids,
+        "not_found": sorted(set(request.employee_ids) - set(employee_ids)),
+        "deleted": deleted
+    }
+
+@router.post("/bulk-archive")
+def bulk_archive_employees(request: EmployeeIdsRequest, db: Session = Depends(get_db)):
+    """
+    複数社員をアーカイブ用テーブルへ移す（元テーブルからは削除される）
+    """
+    employee_ids = existing_employee_ids(db, request.employee_ids)
+    archived = archive_employees(db, employee_ids)
+    db.commit()
+    return {
+        "employee_ids": employee_ids,
+        "not_found": sorted(set(request.employee_ids) - set(employee_ids)),
+        "archived": archived
+    }
+
+@router.post("/profiles/refresh")
+def refresh_profiles(db: Session = Depends(get_db)):
+    """
+    全社員の経験プロファイルを再計算する（初回移行時・データ一括投入後用）
+    """
+    count = refresh_employee_profiles(db)
+    db.commit()
+    return {"refreshed": count}
+
+def _score_candidates(
     request: ProjectMatchingRequest,
-    db: Session = Depends(get_db)
-):
-    employees = db.query(Employee).options(
-        joinedload(Employee.skills),
-        joinedload(Employee.projects),
-        joinedload(Employee.availability)
-    ).all()
+    employees: List[Employee],
+    skill_ids: Dict[int, List[int]],
+    catalog: SkillCatalog
+) -> List[ProjectMatchingResult]:
+    required_phases = [
+        phase for phase in (normalize_phase(p) for p in request.required_phases or []) if phase
+    ]
+    now = datetime.now()
+
+    # 表記ゆれ（JS, ＡＷＳ など）をスキルの正式名にそろえる
+    required_skills = [catalog.canonical_name(s) or s.strip() for s in request.required_skills]
+    preferred_skills = [catalog.canonical_name(s) or s.strip() for s in request.preferred_skills or []]
+
+    # 関連スキルによる部分点の参照先（関係グラフの閉包は事前計算済み）
+    required_skill_ids = [catalog.id_for(s) for s in required_skills]
+    preferred_skill_ids = [catalog.id_for(s) for s in preferred_skills]
+    closure = catalog.closure
 
     results = []
     for emp in employees:
         score = 0.0
         matching_skills = []
+        related_skills = []
 
-        employee_skills = [skill.name for skill in emp.skills]
+        owned_skill_ids = set(skill_ids[emp.id])
+        skill_names = employee_queries.skill_names_for(skill_ids[emp.id], catalog)
+        profile = emp.profile
+        tag_months = tag_months_at(profile, now) if profile else {}
 
-        for required_skill in request.required_skills:
-            if required_skill in employee_skills:
-                score += 3.0
+        for required_skill, required_skill_id in zip(required_skills, required_skill_ids):
+            if required_skill in skill_names:
+                score += REQUIRED_SKILL_SCORE
                 matching_skills.append(required_skill)
-
-        if request.preferred_skills:
-            for preferred_skill in request.preferred_skills:
-                if preferred_skill in employee_skills:
-                    score += 1.0
+            elif required_skill in tag_months:
+                # スキル登録はないが案件で使用経験がある
+                score += PROJECT_SKILL_SCORE
+                matching_skills.append(required_skill)
+            elif required_skill_id is not None:
+                weight, source_id = closure.best(required_skill_id, owned_skill_ids)
+                if weight:
+                    score += REQUIRED_SKILL_SCORE * weight
+                    related_skills.append(f"{catalog.name_for(source_id)} → {required_skill}")
+
+            months = tag_months.get(required_skill)
+            if months:
+                score += min(months / 12 * EXPERIENCE_SCORE_PER_YEAR, EXPERIENCE_SCORE_MAX)
+
+        if preferred_skills:
+            for preferred_skill, preferred_skill_id in zip(preferred_skills, preferred_skill_ids):
+                if preferred_skill in skill_names or preferred_skill in tag_months:
+                    score += PREFERRED_SKILL_SCORE
                     matching_skills.append(preferred_skill)
+                elif preferred_skill_id is not None:
+                    weight, source_id = closure.best(preferred_skill_id, owned_skill_ids)
+                    if weight:
+                        score += PREFERRED_SKILL_SCORE * weight
+                        related_skills.append(f"{catalog.name_for(source_id)} → {preferred_skill}")
+
+        if profile:
+            for phase in required_phases:
+                if phase_count(profile, phase) > 0:
+                    score += PHASE_SCORE
+
+            free_date = free_date_at(profile, now)
+            if request.start_date and free_date:
+                if free_date <= request.start_date.replace(tzinfo=None):
+                    score += START_DATE_SCORE
 
         if request.unit_price_min and emp.unit_price_min:
             if emp.unit_price_min >= request.unit_price_min:
@@ -229,24 +302,32 @@ def project_matching(
                 score += 0.5
 
         if score > 0:
-            recent_projects = [proj.title for proj in emp.projects[-2:]]
-
-            employee_list = EmployeeList(
-                id=emp.id,
-                name=emp.name,
-                years_experience=emp.years_experience,
-                main_role=emp.main_role,
-                unit_price_min=emp.unit_price_min,
-                unit_price_max=emp.unit_price_max,
-                availability_status=emp.availability.status.value.lower() if emp.availability else None,
-                main_skills=[skill.name for skill in emp.skills[:3]]
-            )
-
             results.append(ProjectMatchingResult(
-                employee=employee_list,
-                score=score,
+                employee=employee_queries.to_employee_list(emp, skill_names),
+                score=round(score, 2),
                 matching_skills=matching_skills,
-                recent_projects=recent_projects
+                related_skills=related_skills
             ))
 
-    return sorted(results, key=lambda x: x.score, reverse=True)[:10]
\ No newline at end of file
+    return sorted(results, key=lambda x: x.score, reverse=True)[:10]
+
+@router.post("/matching", response_model=List[ProjectMatchingResult])
+async def project_matching(
+    request: ProjectMatchingRequest,
+    db: ReadSession = Depends(get_read_db)
+):
+    # 全社員分の読み込みはイベントループを長く止めるため、非同期モードでもスレッドプールで行う
+    employees, skill_ids, catalog = await db.run_in_thread(
+        employee_queries.load_matching_candidates, request.required_skills + (request.preferred_skills or [])
+    )
+
+    # スコア計算はCPU処理のため、イベントループを止めないようスレッドプールで行う
+    results = await run_in_threadpool(_score_candidates, request, employees, skill_ids, catalog)
+
+    # 直近の案件名は上位の社員分だけまとめて取得する
+    if results:
+        recent_projects = await db.run(employee_queries.recent_project_titles, [result.employee.id for result in results])
+        for result in results:
+            result.recent_projects = recent_projects.get(result.employee.id, [])
+
+    return results
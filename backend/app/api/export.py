@@ -0,0 +1,193 @@
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, func
+from typing import Optional
+from datetime import datetime, date
+import csv
+import enum
+import io
+import json
+import zlib
+from ..db.database import read_session_factory, apply_statement_timeout
+from ..models.employee import Employee, Skill, Project, Availability, OneOnOne, employee_skills
+from ..utils.dates import resolve_date_range
+
+router = APIRouter()
+
+FETCH_SIZE = 1000
+
+FORMAT_PATTERN = "^(csv|ndjson)$"
+
+def _export_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _skill_names(dialect_name: str):
+    # 社員ごとのスキル名を1列にまとめる
+    if dialect_name == "postgresql":
+        aggregated = func.string_agg(Skill.name, ";")
+    else:
+        aggregated = func.group_concat(Skill.name, ";")
+    return select(aggregated).select_from(employee_skills).join(
+        Skill, employee_skills.c.skill_id == Skill.id
+    ).where(
+        employee_skills.c.employee_id == Employee.id
+    ).correlate(Employee).scalar_subquery()
+
+def _stream_rows(session_factory, build_statement, columns, fmt: str, compress: bool):
+    """
+    サーバーサイドカーソルで行を少しずつ取得し、CSV / NDJSON に変換して返す
+
+    レスポンス送信中もセッションを保持する必要があるため、依存性ではなくここで開閉する。
+    """
+    db = session_factory()
+    apply_statement_timeout(db, "export")
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    try:
+        statement = build_statement(db.get_bind().dialect.name)
+        result = db.execute(statement.execution_options(yield_per=FETCH_SIZE))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(columns)
+
+        for partition in result.partitions():
+            for row in partition:
+                values = [_export_value(value) for value in row]
+                if fmt == "csv":
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, values)), ensure_ascii=False))
+                    buffer.write("\n")
+            chunk = encode(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            if chunk:
+                yield chunk
+
+        tail = encode(buffer.getvalue())
+        if compressor:
+            tail += compressor.flush()
+        if tail:
+            yield tail
+    finally:
+        db.close()
+
+def _export_response(request: Request, build_statement, columns, name: str, fmt: str, compress: bool):
+    filename = f"{name}.{fmt}"
+    media_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        _stream_rows(read_session_factory(request), build_statement, columns, fmt, compress),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/employees")
+def export_employees(
+    request: Request,
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    gzip: bool = False
+):
+    columns = [
+        "id", "name", "years_experience", "main_role", "unit_price_min", "unit_price_max",
+        "desired_career", "availability_status", "available_from", "skills"
+    ]
+
+    def build_statement(dialect_name):
+        return select(
+            Employee.id,
+            Employee.name,
+            Employee.years_experience,
+            Employee.main_role,
+            Employee.unit_price_min,
+            Employee.unit_price_max,
+            Employee.desired_career,
+            Availability.status,
+            Availability.available_from,
+            _skill_names(dialect_name)
+        ).outerjoin(
+            Availability, Availability.employee_id == Employee.id
+        ).order_by(Employee.id)
+
+    return _export_response(request, build_statement, columns, "employees", format, gzip)
+
+@router.get("/projects")
+def export_projects(
+    request: Request,
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    gzip: bool = False,
+    employee_id: int = None
+):
+    columns = [
+        "id", "employee_id", "employee_name", "title", "role", "start_date", "end_date",
+        "description", "tech_tags", "phase_requirements", "phase_design",
+        "phase_implementation", "phase_testing"
+    ]
+
+    def build_statement(dialect_name):
+        statement = select(
+            Project.id,
+            Project.employee_id,
+            Employee.name,
+            Project.title,
+            Project.role,
+            Project.start_date,
+            Project.end_date,
+            Project.description,
+            Project.tech_tags,
+            Project.phase_requirements,
+            Project.phase_design,
+            Project.phase_implementation,
+            Project.phase_testing
+        ).join(Employee, Employee.id == Project.employee_id)
+        if employee_id:
+            statement = statement.where(Project.employee_id == employee_id)
+        return statement.order_by(Project.employee_id, Project.start_date, Project.id)
+
+    return _export_response(request, build_statement, columns, "projects", format, gzip)
+
+@router.get("/one-on-ones")
+def export_one_on_ones(
+    request: Request,
+    format: str = Query("csv", pattern=FORMAT_PATTERN),
+    gzip: bool = False,
+    employee_id: int = None,
+    year: Optional[int] = Query(None, ge=1, le=9998),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to")
+):
+    columns = ["id", "employee_id", "employee_name", "date", "status", "memo"]
+    start, end = resolve_date_range(year, month, date_from, date_to)
+
+    def build_statement(dialect_name):
+        statement = select(
+            OneOnOne.id,
+            OneOnOne.employee_id,
+            Employee.name,
+            OneOnOne.date,
+            OneOnOne.status,
+            OneOnOne.memo
+        ).join(Employee, Employee.id == OneOnOne.employee_id)
+        if employee_id:
+            statement = statement.where(OneOnOne.employee_id == employee_id)
+        if start is not None:
+            statement = statement.where(OneOnOne.date >= start)
+        if end is not None:
+            statement = statement.where(OneOnOne.date < end)
+        return statement.order_by(OneOnOne.employee_id, OneOnOne.date)
+
+    return _export_response(request, build_statement, columns, "one_on_ones", format, gzip)
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from ..db.database import engine, async_engine, replica_engine, async_replica_engine
+from ..db.pool import pool_stats
+
+router = APIRouter()
+
+@router.get("/pool")
+def get_pool_metrics():
+    """
+    DB接続プールの使用状況（使用中・待ち回数・取得所要時間など）
+    """
+    result = {"sync": pool_stats(engine)}
+    if async_engine is not None:
+        result["async"] = pool_stats(async_engine.sync_engine)
+    if replica_engine is not engine:
+        result["replica"] = pool_stats(replica_engine)
+    if async_replica_engine is not async_engine:
+        result["async_replica"] = pool_stats(async_replica_engine.sync_engine)
+    return result
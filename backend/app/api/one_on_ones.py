@@ -1,33 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, extract
-from typing import List
+from typing import List, Optional
 from datetime import datetime, date
-from ..db.database import get_db
-from ..models.employee import OneOnOne, Employee
+import csv
+from ..db.database import get_db, get_read_db, ReadSession
+from ..db.bulk import copy_rows
+from ..models.employee import OneOnOne, Employee, OneOnOneStatus
 from ..schemas.employee import OneOnOne as OneOnOneSchema, OneOnOneCreate, OneOnOneUpdate
+from ..services import one_on_one_queries
+from ..utils.dates import resolve_date_range, apply_date_range, month_range
+from ..utils.uploads import UPLOAD_FORMAT_PATTERN, detect_upload_format, iter_upload_records
 
 router = APIRouter()
 
-@router.get("/")
-def get_one_on_ones(
-    skip: int = 0,
-    limit: int = 100,
-    employee_id: int = None,
-    year: int = None,
-    month: int = None,
-    db: Session = Depends(get_db)
+IMPORT_BATCH_SIZE = 5000
+IMPORT_MAX_ERRORS = 1000
+IMPORT_COLUMNS = ("employee_id", "date", "status", "memo")
+
+def _get_one_on_ones(
+    db: Session,
+    skip: int,
+    limit: int,
+    employee_id: int,
+    year: int,
+    month: int,
+    date_from: Optional[date],
+    date_to: Optional[date]
 ):
     query = db.query(OneOnOne).options(joinedload(OneOnOne.employee))
 
     if employee_id:
         query = query.filter(OneOnOne.employee_id == employee_id)
 
-    if year:
-        query = query.filter(extract('year', OneOnOne.date) == year)
-
-    if month:
-        query = query.filter(extract('month', OneOnOne.date) == month)
+    # 半開区間 [start, end) で絞り込み、date のインデックスを利用する
+    start, end = resolve_date_range(year, month, date_from, date_to)
+    query = apply_date_range(query, OneOnOne.date, start, end)
 
     one_on_ones = query.order_by(OneOnOne.date.desc()).offset(skip).limit(limit).all()
 
@@ -47,13 +54,45 @@ def get_one_on_ones(
 
     return result
 
-@router.get("/{one_on_one_id}", response_model=OneOnOneSchema)
-def get_one_on_one(one_on_one_id: int, db: Session = Depends(get_db)):
+@router.get("/")
+async def get_one_on_ones(
+    skip: int = 0,
+    limit: int = 100,
+    employee_id: int = None,
+    year: Optional[int] = Query(None, ge=1, le=9998),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: ReadSession = Depends(get_read_db)
+):
+    return await db.run(_get_one_on_ones, skip, limit, employee_id, year, month, date_from, date_to)
+
+@router.get("/missing")
+async def get_missing_one_on_ones(
+    skip: int = 0,
+    limit: int = 100,
+    year: Optional[int] = Query(None, ge=1, le=9998),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="最終1on1日の並び順"),
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    対象期間に1on1が実施されていない社員を、最終1on1日順で返す
+    """
+    return await db.run(one_on_one_queries.missing_one_on_ones, skip, limit, year, month, date_from, date_to, order)
+
+def _get_one_on_one(db: Session, one_on_one_id: int):
     one_on_one = db.query(OneOnOne).filter(OneOnOne.id == one_on_one_id).first()
     if one_on_one is None:
         raise HTTPException(status_code=404, detail="One-on-one record not found")
     return one_on_one
 
+@router.get("/{one_on_one_id}", response_model=OneOnOneSchema)
+async def get_one_on_one(one_on_one_id: int, db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_one_on_one, one_on_one_id)
+
 @router.post("/", response_model=OneOnOneSchema)
 def create_one_on_one(one_on_one: OneOnOneCreate, db: Session = Depends(get_db)):
     employee = db.query(Employee).filter(Employee.id == one_on_one.employee_id).first()
@@ -66,6 +105,88 @@ def create_one_on_one(one_on_one: OneOnOneCreate, db: Session = Depends(get_db))
     db.refresh(db_one_on_one)
     return db_one_on_one
 
+def _parse_import_record(record: dict, employee_ids: set) -> tuple:
+    try:
+        employee_id = int(record.get("employee_id"))
+    except (TypeError, ValueError):
+        raise ValueError("employee_id must be an integer")
+    if employee_id not in employee_ids:
+        raise ValueError(f"employee {employee_id} not found")
+
+    raw_date = record.get("date")
+    if not raw_date:
+        raise ValueError("date is required")
+    try:
+        one_on_one_date = datetime.fromisoformat(str(raw_date).strip())
+    except ValueError:
+        raise ValueError(f"invalid date: {raw_date}")
+
+    raw_status = (record.get("status") or "").strip()
+    if raw_status:
+        try:
+            status = OneOnOneStatus(raw_status.lower())
+        except ValueError:
+            raise ValueError(f"invalid status: {raw_status}")
+    else:
+        status = OneOnOneStatus.NORMAL
+
+    memo = record.get("memo") or None
+    return employee_id, one_on_one_date, status, memo
+
+@router.post("/import")
+def import_one_on_ones(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern=UPLOAD_FORMAT_PATTERN, description="省略時はファイル拡張子から判定"),
+    db: Session = Depends(get_db)
+):
+    """
+    1on1記録を CSV / NDJSON から一括登録する
+
+    列: employee_id, date, status, memo。不正な行はスキップし、行番号付きでエラーを返す。
+    """
+    fmt = detect_upload_format(file, format)
+
+    # 社員IDは行ごとに問い合わせず、事前に集合として読み込む
+    employee_ids = {employee_id for (employee_id,) in db.query(Employee.id)}
+
+    imported = 0
+    failed = 0
+    errors = []
+    batch = []
+
+    try:
+        for line_number, record, error in iter_upload_records(file, fmt):
+            if error is None:
+                try:
+                    batch.append(_parse_import_record(record, employee_ids))
+                except ValueError as e:
+                    error = str(e)
+
+            if error is not None:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append({"row": line_number, "error": error})
+                continue
+
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                imported += copy_rows(db, OneOnOne.__table__, IMPORT_COLUMNS, batch)
+                batch = []
+
+        imported += copy_rows(db, OneOnOne.__table__, IMPORT_COLUMNS, batch)
+        db.commit()
+    except UnicodeDecodeError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+    except csv.Error as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
+
+    return {
+        "imported": imported,
+        "failed": failed,
+        "errors": errors
+    }
+
 @router.put("/{one_on_one_id}", response_model=OneOnOneSchema)
 def update_one_on_one(
     one_on_one_id: int,
@@ -93,29 +214,47 @@ def delete_one_on_one(one_on_one_id: int, db: Session = Depends(get_db)):
     db.commit()
     return {"message": "One-on-one record deleted successfully"}
 
-@router.get("/stats/completion-rate")
-def get_completion_rate(
-    year: int = None,
-    month: int = None,
-    db: Session = Depends(get_db)
+def _get_completion_rate(
+    db: Session,
+    year: int,
+    month: int,
+    date_from: Optional[date],
+    date_to: Optional[date]
 ):
     current_date = date.today()
     target_year = year or current_date.year
     target_month = month or current_date.month
 
+    period = {}
+    if date_from or date_to:
+        start, end = resolve_date_range(date_from=date_from, date_to=date_to)
+    else:
+        start, end = month_range(target_year, target_month)
+        # year/month は年月指定のときだけ返す（from/to 指定時は期間と一致しないため）
+        period = {"year": target_year, "month": target_month}
+
     total_employees = db.query(Employee).count()
 
-    completed_one_on_ones = db.query(OneOnOne.employee_id.distinct()).filter(
-        extract('year', OneOnOne.date) == target_year,
-        extract('month', OneOnOne.date) == target_month
-    ).count()
+    completed_query = db.query(OneOnOne.employee_id.distinct())
+    completed_one_on_ones = apply_date_range(completed_query, OneOnOne.date, start, end).count()
 
     completion_rate = (completed_one_on_ones / total_employees * 100) if total_employees > 0 else 0
 
     return {
-        "year": target_year,
-        "month": target_month,
+        **period,
+        "from": start,
+        "to": end,
         "total_employees": total_employees,
         "completed_one_on_ones": completed_one_on_ones,
         "completion_rate": round(completion_rate, 2)
-    }
\ No newline at end of file
+    }
+
+@router.get("/stats/completion-rate")
+async def get_completion_rate(
+    year: Optional[int] = Query(None, ge=1, le=9998),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: ReadSession = Depends(get_read_db)
+):
+    return await db.run(_get_completion_rate, year, month, date_from, date_to)
\ No newline at end of file
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+from .auth import get_current_admin
+from ..services.principal_cache import Principal
+from ..utils.profiler import list_profiles, load_profile, load_folded
+
+router = APIRouter()
+
+@router.get("/")
+def get_profiles(admin: Principal = Depends(get_current_admin)):
+    """
+    保存済みのプロファイル一覧（新しい順）。X-Profile: 1 を付けたリクエストで作成される
+    """
+    return list_profiles()
+
+@router.get("/{profile_id}")
+def get_profile(profile_id: str, admin: Principal = Depends(get_current_admin)):
+    """
+    プロファイルの概要とSQLのタイムライン
+    """
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+@router.get("/{profile_id}/folded", response_class=PlainTextResponse)
+def get_profile_folded(profile_id: str, admin: Principal = Depends(get_current_admin)):
+    """
+    flamegraph.pl / speedscope で読み込める folded 形式のスタック
+    """
+    folded = load_folded(profile_id)
+    if folded is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(folded)
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session, joinedload
-from typing import List
-from ..db.database import get_db
-from ..models.employee import Project
+from sqlalchemy import func, or_
+from typing import List, Optional
+from datetime import date
+from ..db.database import get_db, get_read_db, ReadSession
+from ..models.employee import Project, Employee, project_tech_tags
 from ..schemas.employee import Project as ProjectSchema, ProjectCreate, ProjectUpdate
+from ..services.tech_tags import sync_project_tech_tags, delete_project_tech_tags, canonical_tech_tag
+from ..services.skill_catalog import get_skill_catalog
+from ..services.profiles import refresh_employee_profile
+from ..utils.dates import days_between, to_datetime
 
 router = APIRouter()
 
+DAYS_PER_MONTH = 30.44
+
 @router.get("/", response_model=List[ProjectSchema])
 def get_projects(
     skip: int = 0,
@@ -21,6 +29,143 @@ def get_projects(
     projects = query.offset(skip).limit(limit).all()
     return projects
 
+def _tag_usage_columns(db: Session):
+    # 終了日が未設定の案件は現在も継続中として扱う
+    end_date = func.coalesce(Project.end_date, func.now())
+    duration_days = days_between(Project.start_date, end_date, db.get_bind().dialect.name)
+    return [
+        func.count(Project.id).label("project_count"),
+        func.min(Project.start_date).label("first_used"),
+        func.max(end_date).label("last_used"),
+        func.sum(duration_days).label("total_days")
+    ]
+
+def _active_since_filter(query, since: Optional[date]):
+    if since is None:
+        return query
+    return query.filter(or_(Project.end_date.is_(None), Project.end_date >= to_datetime(since)))
+
+def _months(total_days) -> float:
+    return round(float(total_days or 0) / DAYS_PER_MONTH, 1)
+
+def _get_tech_tag_stats(
+    db: Session,
+    since: Optional[date],
+    skip: int,
+    limit: int
+):
+    query = db.query(
+        project_tech_tags.c.tag,
+        func.count(Project.employee_id.distinct()).label("employee_count"),
+        *_tag_usage_columns(db)
+    ).join(
+        Project, Project.id == project_tech_tags.c.project_id
+    )
+    query = _active_since_filter(query, since)
+
+    rows = query.group_by(project_tech_tags.c.tag).order_by(
+        func.count(Project.id).desc(), project_tech_tags.c.tag
+    ).offset(skip).limit(limit).all()
+
+    return [
+        {
+            "tag": row.tag,
+            "project_count": row.project_count,
+            "employee_count": row.employee_count,
+            "first_used": row.first_used,
+            "last_used": row.last_used,
+            "total_months": _months(row.total_days)
+        }
+        for row in rows
+    ]
+
+@router.get("/tags")
+async def get_tech_tag_stats(
+    since: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    技術タグごとの案件数・人数・最終利用日・合計期間を返す
+    """
+    return await db.run(_get_tech_tag_stats, since, skip, limit)
+
+def _get_projects_by_tech_tag(
+    db: Session,
+    tag: str,
+    since: Optional[date],
+    skip: int,
+    limit: int
+):
+    query = db.query(Project).join(
+        project_tech_tags, project_tech_tags.c.project_id == Project.id
+    ).filter(project_tech_tags.c.tag == canonical_tech_tag(get_skill_catalog(db), tag))
+    query = _active_since_filter(query, since)
+
+    return query.order_by(Project.start_date.desc(), Project.id).offset(skip).limit(limit).all()
+
+@router.get("/tags/projects", response_model=List[ProjectSchema])
+async def get_projects_by_tech_tag(
+    tag: str = Query(..., description="技術タグ（例: Kubernetes）。別名・表記ゆれも可"),
+    since: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: ReadSession = Depends(get_read_db)
+):
+    return await db.run(_get_projects_by_tech_tag, tag, since, skip, limit)
+
+def _get_employees_by_tech_tag(
+    db: Session,
+    tag: str,
+    since: Optional[date],
+    skip: int,
+    limit: int
+):
+    query = db.query(
+        Employee.id,
+        Employee.name,
+        Employee.main_role,
+        *_tag_usage_columns(db)
+    ).join(
+        Project, Project.employee_id == Employee.id
+    ).join(
+        project_tech_tags, project_tech_tags.c.project_id == Project.id
+    ).filter(project_tech_tags.c.tag == canonical_tech_tag(get_skill_catalog(db), tag))
+    query = _active_since_filter(query, since)
+
+    rows = query.group_by(Employee.id, Employee.name, Employee.main_role).order_by(
+        func.max(func.coalesce(Project.end_date, func.now())).desc(), Employee.id
+    ).offset(skip).limit(limit).all()
+
+    return [
+        {
+            "employee_id": row.id,
+            "employee_name": row.name,
+            "main_role": row.main_role,
+            "project_count": row.project_count,
+            "first_used": row.first_used,
+            "last_used": row.last_used,
+            "total_months": _months(row.total_days)
+        }
+        for row in rows
+    ]
+
+@router.get("/tags/employees")
+async def get_employees_by_tech_tag(
+    tag: str = Query(..., description="技術タグ（例: Kubernetes）。別名・表記ゆれも可"),
+    since: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    指定タグの案件経験がある社員を、最終利用日の新しい順に返す
+
+    since を指定すると、その日以降も継続していた案件のみを対象とする。
+    """
+    return await db.run(_get_employees_by_tech_tag, tag, since, skip, limit)
+
 @router.get("/{project_id}", response_model=ProjectSchema)
 def get_project(project_id: int, db: Session = Depends(get_db)):
     project = db.query(Project).filter(Project.id == project_id).first()
@@ -32,6 +177,9 @@ def get_project(project_id: int, db: Session = Depends(get_db)):
 def create_project(project: ProjectCreate, db: Session = Depends(get_db)):
     db_project = Project(**project.model_dump())
     db.add(db_project)
+    db.flush()
+    sync_project_tech_tags(db, db_project)
+    refresh_employee_profile(db, db_project.employee_id)
     db.commit()
     db.refresh(db_project)
     return db_project
@@ -46,9 +194,15 @@ def update_project(
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    for field, value in project_update.model_dump(exclude_unset=True).items():
+    update_data = project_update.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
         setattr(db_project, field, value)
 
+    if "tech_tags" in update_data:
+        sync_project_tech_tags(db, db_project)
+
+    db.flush()
+    refresh_employee_profile(db, db_project.employee_id)
     db.commit()
     db.refresh(db_project)
     return db_project
@@ -59,6 +213,10 @@ def delete_project(project_id: int, db: Session = Depends(get_db)):
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
 
+    employee_id = db_project.employee_id
+    delete_project_tech_tags(db, [db_project.id])
     db.delete(db_project)
+    db.flush()
+    refresh_employee_profile(db, employee_id)
     db.commit()
     return {"message": "Project deleted successfully"}
\ No newline at end of file
@@ -4,7 +4,12 @@ from sqlalchemy import text
 from datetime import date
 from ..db.database import get_db, engine
 from ..db.database import Base
-from ..models.employee import Employee, Skill, Availability, OneOnOne, AvailabilityStatus, OneOnOneStatus
+from ..models.employee import Employee, EmployeeProfile, Project, Skill, SkillAlias, SkillRelation, Availability, AvailabilityHistory, OneOnOne, AvailabilityStatus, OneOnOneStatus, project_tech_tags
+from ..services.profiles import refresh_employee_profiles
+from ..services.availability_history import record_availability_changes
+from ..services.skill_catalog import invalidate_skill_catalog, normalize_skill_term, DEFAULT_SKILL_ALIASES
+from ..services.skill_graph import DEFAULT_SKILL_RELATIONS
+from ..services.tech_tags import rebuild_project_tech_tags
 
 router = APIRouter()
 
@@ -36,13 +41,20 @@ def create_demo_data(db: Session = Depends(get_db)):
         # 既存データをクリア（外部キー制約を考慮した順序）
         db.query(OneOnOne).delete()
         db.query(Availability).delete()
+        db.query(AvailabilityHistory).delete()
 
         # 多対多の関連テーブルをクリア
         db.execute(text("DELETE FROM employee_skills"))
+        db.execute(project_tech_tags.delete())
 
+        db.query(Project).delete()
+        db.query(EmployeeProfile).delete()
         db.query(Employee).delete()
+        db.query(SkillAlias).delete()
+        db.query(SkillRelation).delete()
         db.query(Skill).delete()
         db.commit()
+        invalidate_skill_catalog()
 
         # スキルデータ
         skills_data = [
@@ -87,6 +99,22 @@ def create_demo_data(db: Session = Depends(get_db)):
 
         db.commit()
 
+        skills_by_name = {skill.name: skill for skill in skills}
+        for alias, skill_name in DEFAULT_SKILL_ALIASES:
+            if skill_name in skills_by_name:
+                db.add(SkillAlias(alias=normalize_skill_term(alias), skill_id=skills_by_name[skill_name].id))
+        for skill_name, related_skill_name, relation_type, weight in DEFAULT_SKILL_RELATIONS:
+            if skill_name in skills_by_name and related_skill_name in skills_by_name:
+                db.add(SkillRelation(
+                    skill_id=skills_by_name[skill_name].id,
+                    related_skill_id=skills_by_name[related_skill_name].id,
+                    relation_type=relation_type,
+                    weight=weight
+                ))
+
+        db.commit()
+        invalidate_skill_catalog()
+
         # 社員データ
         employees_data = [
             {
@@ -178,7 +206,7 @@ def create_demo_data(db: Session = Depends(get_db)):
 
             # スキルを関連付け
             for skill_name in skills_names:
-                skill = next((s for s in skills if s.name == skill_name), None)
+                skill = skills_by_name.get(skill_name)
                 if skill:
                     employee.skills.append(skill)
 
@@ -187,6 +215,30 @@ def create_demo_data(db: Session = Depends(get_db)):
 
         db.commit()
 
+        # 案件データ（技術タグは表記ゆれを含めて登録し、正式名に寄せて project_tech_tags を作る）
+        projects_data = [
+            {"employee": 0, "title": "ECサイトのフロントエンド刷新", "role": "フロントエンドリーダー", "start_date": date(2023, 4, 1), "end_date": None, "tech_tags": "React.js, TypeScript, AWS"},
+            {"employee": 0, "title": "社内ポータル開発", "role": "フロントエンドエンジニア", "start_date": date(2021, 10, 1), "end_date": date(2023, 3, 31), "tech_tags": "React, JS"},
+            {"employee": 1, "title": "決済APIの開発", "role": "バックエンドエンジニア", "start_date": date(2022, 7, 1), "end_date": None, "tech_tags": "Python, Postgres, Docker"},
+            {"employee": 2, "title": "予約管理システム開発", "role": "フルスタックエンジニア", "start_date": date(2023, 1, 1), "end_date": date(2025, 6, 30), "tech_tags": "Vue, Node, MySQL"},
+            {"employee": 3, "title": "コンテナ基盤の構築", "role": "インフラエンジニア", "start_date": date(2022, 4, 1), "end_date": None, "tech_tags": "AWS, k8s, Terraform, Docker"},
+            {"employee": 4, "title": "在庫管理システムの保守", "role": "バックエンドエンジニア", "start_date": date(2021, 4, 1), "end_date": date(2025, 3, 31), "tech_tags": "Java, PostgreSQL, Redis"},
+            {"employee": 5, "title": "管理画面の開発", "role": "フロントエンドエンジニア", "start_date": date(2024, 4, 1), "end_date": date(2025, 8, 31), "tech_tags": "Angular, TS"},
+            {"employee": 6, "title": "SaaS新規開発", "role": "テックリード", "start_date": date(2023, 10, 1), "end_date": None, "tech_tags": "React, Python, PostgreSQL, AWS, Kubernetes"},
+            {"employee": 7, "title": "業務システムのクラウド移行", "role": "バックエンドエンジニア", "start_date": date(2022, 10, 1), "end_date": None, "tech_tags": "C#, Mongo, Redis"},
+            {"employee": 9, "title": "監視基盤の整備", "role": "インフラエンジニア", "start_date": date(2024, 1, 1), "end_date": None, "tech_tags": "Amazon Web Services, Docker, Kubernetes"},
+        ]
+
+        projects = []
+        for project_data in projects_data:
+            project = Project(employee_id=employees[project_data.pop("employee")].id, **project_data)
+            projects.append(project)
+            db.add(project)
+
+        db.flush()
+        rebuild_project_tech_tags(db, [project.id for project in projects])
+        db.commit()
+
         # アベイラビリティデータ（実際のemployee.idを使用）
         availability_statuses = [
             AvailabilityStatus.WORKING,
@@ -199,14 +251,17 @@ def create_demo_data(db: Session = Depends(get_db)):
             AvailabilityStatus.AVAILABLE_NEXT_MONTH,
         ]
 
+        availabilities = []
         for i, employee in enumerate(employees[:8]):  # 最初の8人分のアベイラビリティ
             if i < len(availability_statuses):
                 availability = Availability(
                     employee_id=employee.id,
                     status=availability_statuses[i]
                 )
+                availabilities.append(availability)
                 db.add(availability)
 
+        record_availability_changes(db, availabilities)
         db.commit()
 
         # 1on1データ（実際のemployee.idを使用）
@@ -227,6 +282,9 @@ def create_demo_data(db: Session = Depends(get_db)):
 
         db.commit()
 
+        refresh_employee_profiles(db)
+        db.commit()
+
         # 投入件数をカウント
         availability_count = len([emp for emp in employees[:8]])  # 最初の8人分
         oneonone_count = 7 if len(employees) >= 5 else 0  # 1on1データの件数
@@ -236,6 +294,7 @@ def create_demo_data(db: Session = Depends(get_db)):
             "data": {
                 "employees": len(employees),
                 "skills": len(skills),
+                "projects": len(projects),
                 "availability": availability_count,
                 "one_on_ones": oneonone_count
             }
@@ -255,13 +314,20 @@ def reset_data(db: Session = Depends(get_db)):
         # 外部キー制約を考慮した順序でデータクリア
         db.query(OneOnOne).delete()
         db.query(Availability).delete()
+        db.query(AvailabilityHistory).delete()
 
         # 多対多の関連テーブルをクリア
         db.execute(text("DELETE FROM employee_skills"))
+        db.execute(project_tech_tags.delete())
 
+        db.query(Project).delete()
+        db.query(EmployeeProfile).delete()
         db.query(Employee).delete()
+        db.query(SkillAlias).delete()
+        db.query(SkillRelation).delete()
         db.query(Skill).delete()
         db.commit()
+        invalidate_skill_catalog()
 
         return {
             "message": "🗑️ 全データがクリアされました！",
@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from typing import List
-from ..db.database import get_db
-from ..models.employee import Skill
-from ..schemas.employee import Skill as SkillSchema, SkillCreate
+from ..db.database import get_db, get_read_db, ReadSession
+from ..models.employee import Skill, SkillAlias, SkillRelation
+from ..schemas.employee import (
+    Skill as SkillSchema,
+    SkillCreate,
+    SkillAlias as SkillAliasSchema,
+    SkillAliasCreate,
+    SkillRelation as SkillRelationSchema,
+    SkillRelationCreate
+)
+from ..services.skill_catalog import invalidate_skill_catalog, get_skill_catalog, normalize_skill_term
+from ..services.tech_tags import resync_project_tech_tags
 
 router = APIRouter()
 
-@router.get("/", response_model=List[SkillSchema])
-def get_skills(
-    skip: int = 0,
-    limit: int = 100,
-    category: str = None,
-    db: Session = Depends(get_db)
+def _get_skills(
+    db: Session,
+    skip: int,
+    limit: int,
+    category: str
 ):
     query = db.query(Skill)
     if category:
@@ -21,11 +30,147 @@ def get_skills(
     skills = query.offset(skip).limit(limit).all()
     return skills
 
-@router.get("/categories")
-def get_skill_categories(db: Session = Depends(get_db)):
+@router.get("/", response_model=List[SkillSchema])
+async def get_skills(
+    skip: int = 0,
+    limit: int = 100,
+    category: str = None,
+    db: ReadSession = Depends(get_read_db)
+):
+    return await db.run(_get_skills, skip, limit, category)
+
+def _get_skill_categories(db: Session):
     categories = db.query(Skill.category).distinct().all()
     return [cat[0] for cat in categories]
 
+@router.get("/categories")
+async def get_skill_categories(db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_skill_categories)
+
+def _get_skill_aliases(db: Session, skill_id: int):
+    query = db.query(SkillAlias)
+    if skill_id:
+        query = query.filter(SkillAlias.skill_id == skill_id)
+    return query.order_by(SkillAlias.alias).all()
+
+@router.get("/aliases", response_model=List[SkillAliasSchema])
+async def get_skill_aliases(skill_id: int = None, db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_skill_aliases, skill_id)
+
+@router.post("/aliases", response_model=SkillAliasSchema)
+def create_skill_alias(alias: SkillAliasCreate, db: Session = Depends(get_db)):
+    if db.query(Skill).filter(Skill.id == alias.skill_id).first() is None:
+        raise HTTPException(status_code=404, detail="Skill not found")
+
+    key = normalize_skill_term(alias.alias)
+    if not key:
+        raise HTTPException(status_code=400, detail="Alias is empty")
+    if db.query(SkillAlias).filter(SkillAlias.alias == key).first():
+        raise HTTPException(status_code=400, detail="Alias already exists")
+
+    db_alias = SkillAlias(alias=key, skill_id=alias.skill_id)
+    db.add(db_alias)
+    db.commit()
+    invalidate_skill_catalog()
+    # 既存の案件タグも新しい正式名に寄せる
+    if resync_project_tech_tags(db):
+        db.commit()
+    db.refresh(db_alias)
+    return db_alias
+
+@router.delete("/aliases/{alias_id}")
+def delete_skill_alias(alias_id: int, db: Session = Depends(get_db)):
+    db_alias = db.query(SkillAlias).filter(SkillAlias.id == alias_id).first()
+    if db_alias is None:
+        raise HTTPException(status_code=404, detail="Skill alias not found")
+
+    db.delete(db_alias)
+    db.commit()
+    invalidate_skill_catalog()
+    return {"message": "Skill alias deleted successfully"}
+
+def _resolve_skill_terms(db: Session, terms: str):
+    term_list = [term for term in (t.strip() for t in terms.split(',')) if term]
+    catalog = get_skill_catalog(db, names=term_list)
+    return [
+        {"term": term, "skill_id": catalog.id_for(term), "skill_name": catalog.canonical_name(term)}
+        for term in term_list
+    ]
+
+@router.get("/resolve")
+async def resolve_skill_terms(
+    terms: str = Query(..., description="Comma-separated skill terms"),
+    db: ReadSession = Depends(get_read_db)
+):
+    """
+    入力されたスキル表記を正式なスキル名に変換する（該当なしは null）
+    """
+    return await db.run(_resolve_skill_terms, terms)
+
+def _get_skill_relations(db: Session, skill_id: int):
+    query = db.query(SkillRelation)
+    if skill_id:
+        query = query.filter(or_(SkillRelation.skill_id == skill_id, SkillRelation.related_skill_id == skill_id))
+    return query.order_by(SkillRelation.skill_id, SkillRelation.related_skill_id).all()
+
+@router.get("/relations", response_model=List[SkillRelationSchema])
+async def get_skill_relations(skill_id: int = None, db: ReadSession = Depends(get_read_db)):
+    return await db.run(_get_skill_relations, skill_id)
+
+@router.post("/relations", response_model=SkillRelationSchema)
+def create_skill_relation(relation: SkillRelationCreate, db: Session = Depends(get_db)):
+    if relation.skill_id == relation.related_skill_id:
+        raise HTTPException(status_code=400, detail="Cannot relate a skill to itself")
+    found = db.query(Skill.id).filter(Skill.id.in_([relation.skill_id, relation.related_skill_id])).count()
+    if found != 2:
+        raise HTTPException(status_code=404, detail="Skill not found")
+
+    # 同じ組み合わせは重み・種別を更新する
+    db_relation = db.query(SkillRelation).filter(
+        SkillRelation.skill_id == relation.skill_id,
+        SkillRelation.related_skill_id == relation.related_skill_id
+    ).first()
+    if db_relation is None:
+        db_relation = SkillRelation(**relation.model_dump())
+        db.add(db_relation)
+    else:
+        db_relation.relation_type = relation.relation_type
+        db_relation.weight = relation.weight
+
+    db.commit()
+    invalidate_skill_catalog()
+    db.refresh(db_relation)
+    return db_relation
+
+@router.delete("/relations/{relation_id}")
+def delete_skill_relation(relation_id: int, db: Session = Depends(get_db)):
+    db_relation = db.query(SkillRelation).filter(SkillRelation.id == relation_id).first()
+    if db_relation is None:
+        raise HTTPException(status_code=404, detail="Skill relation not found")
+
+    db.delete(db_relation)
+    db.commit()
+    invalidate_skill_catalog()
+    return {"message": "Skill relation deleted successfully"}
+
+def _get_related_skills(db: Session, skill_id: int):
+    catalog = get_skill_catalog(db, skill_ids=[skill_id])
+    if skill_id not in catalog:
+        raise HTTPException(status_code=404, detail="Skill not found")
+
+    related = sorted(catalog.closure.column(skill_id).items(), key=lambda item: -item[1])
+    return [
+        {"skill_id": related_id, "skill_name": catalog.name_for(related_id), "weight": weight}
+        for related_id, weight in related if related_id in catalog
+    ]
+
+@router.get("/{skill_id}/related")
+async def get_related_skills(skill_id: int, db: ReadSession = Depends(get_read_db)):
+    """
+    指定スキルの要件に対して部分点を得られるスキル（推移的な関係を含む）
+    """
+    return await db.run(_get_related_skills, skill_id)
+
 @router.post("/", response_model=SkillSchema)
 def create_skill(skill: SkillCreate, db: Session = Depends(get_db)):
     existing_skill = db.query(Skill).filter(Skill.name == skill.name).first()
@@ -35,6 +180,10 @@ def create_skill(skill: SkillCreate, db: Session = Depends(get_db)):
     db_skill = Skill(name=skill.name, category=skill.category)
     db.add(db_skill)
     db.commit()
+    invalidate_skill_catalog()
+    # 既存の案件タグも新しい正式名に寄せる
+    if resync_project_tech_tags(db):
+        db.commit()
     db.refresh(db_skill)
     return db_skill
 
@@ -44,6 +193,11 @@ def delete_skill(skill_id: int, db: Session = Depends(get_db)):
     if db_skill is None:
         raise HTTPException(status_code=404, detail="Skill not found")
 
+    db.query(SkillAlias).filter(SkillAlias.skill_id == skill_id).delete()
+    db.query(SkillRelation).filter(
+        or_(SkillRelation.skill_id == skill_id, SkillRelation.related_skill_id == skill_id)
+    ).delete(synchronize_session=False)
     db.delete(db_skill)
     db.commit()
+    invalidate_skill_catalog()
     return {"message": "Skill deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,45 @@
+import csv
+import enum
+import io
+from datetime import datetime, date
+from typing import Iterable, Sequence
+from sqlalchemy import Table
+from sqlalchemy.orm import Session
+
+
+def _copy_value(value):
+    # SQLAlchemy の Enum 型は名前 (例: "GOOD") で保存される
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def copy_rows(db: Session, table: Table, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """
+    行をまとめて投入する。PostgreSQL では COPY、それ以外は executemany を使う
+
+    コミットは呼び出し側で行う。
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    if db.get_bind().dialect.name == "postgresql":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([_copy_value(value) for value in row])
+        buffer.seek(0)
+
+        raw_connection = db.connection().connection
+        with raw_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+    else:
+        db.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+
+    return len(rows)
@@ -0,0 +1,121 @@
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# 同一リクエスト内で同じSQLがこの回数以上実行されたら N+1 の疑いとして扱う
+N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5"))
+# この時間（ミリ秒）を超えたリクエストは発行したSQLの一覧をログに出す。0 で無効
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "1000"))
+# 1リクエストで記録するSQLの上限
+MAX_RECORDED_QUERIES = 200
+
+
+class RequestQueryStats:
+    """
+    1リクエスト中に発行されたSQLの件数と所要時間
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.db_seconds = 0.0
+        self.statements: Counter = Counter()
+        # (SQL, 所要秒数, リクエスト開始からの開始時刻)
+        self.queries: List[Tuple[str, float, float]] = []
+
+    def record(self, statement: str, started: float, seconds: float) -> None:
+        self.count += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+        if len(self.queries) < MAX_RECORDED_QUERIES:
+            self.queries.append((statement, seconds, started - self.started))
+
+    def n_plus_one_suspects(self) -> List[Tuple[str, int]]:
+        return [
+            (statement, count) for statement, count in self.statements.most_common()
+            if count >= N_PLUS_ONE_THRESHOLD
+        ]
+
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, started, time.perf_counter() - started)
+
+
+def install_query_hooks() -> None:
+    """
+    すべてのエンジン（同期・非同期・レプリカ）のSQL実行を計測対象にする
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def begin_request() -> RequestQueryStats:
+    # 外側のミドルウェア（プロファイリング）で開始済みならそれを使う
+    stats = _current_stats.get()
+    if stats is None:
+        stats = RequestQueryStats()
+        _current_stats.set(stats)
+    return stats
+
+
+def current_request_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+def server_timing_headers(stats: RequestQueryStats) -> List[Tuple[bytes, bytes]]:
+    """
+    Server-Timing / X-DB-Query-Count ヘッダー（ASGI のヘッダー形式）
+    """
+    elapsed = stats.elapsed_seconds()
+    server_timing = (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.count} queries", '
+        f'app;dur={elapsed * 1000:.1f}'
+    )
+    return [
+        (b"server-timing", server_timing.encode("latin-1")),
+        (b"x-db-query-count", str(stats.count).encode("latin-1")),
+    ]
+
+
+def report_request(method: str, path: str, stats: RequestQueryStats) -> None:
+    """
+    N+1 の疑いや遅いリクエストをログに出す
+    """
+    elapsed = stats.elapsed_seconds()
+    endpoint = f"{method} {path}"
+    for statement, count in stats.n_plus_one_suspects():
+        logger.warning("N+1 suspect on %s: %d executions of %s", endpoint, count, " ".join(statement.split())[:300])
+
+    if SLOW_REQUEST_MS and elapsed * 1000 >= SLOW_REQUEST_MS:
+        logger.warning(
+            "Slow request %s: %.1f ms, %d queries, %.1f ms in DB\n%s",
+            endpoint,
+            elapsed * 1000,
+            stats.count,
+            stats.db_seconds * 1000,
+            "\n".join(
+                f"  {seconds * 1000:8.1f} ms  {' '.join(statement.split())[:300]}"
+                for statement, seconds, _ in stats.queries
+            )
+        )
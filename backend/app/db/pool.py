@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from typing import Dict
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# 接続プール設定（環境変数で上書きできる）
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# DB再起動やLB側の切断で死んだ接続を使わないよう、一定時間で張り直す
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# 接続取得待ち時間のヒストグラム境界（秒）
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """
+    接続取得の回数・待ち・所要時間を集計する
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.connects = 0
+        self.checkout_seconds_sum = 0.0
+        self.checkout_seconds_max = 0.0
+        self.checkout_buckets = [0] * len(CHECKOUT_BUCKETS)
+
+    def observe_checkout(self, seconds: float, waited: bool) -> None:
+        with self.lock:
+            self.checkouts += 1
+            if waited:
+                self.waits += 1
+            self.checkout_seconds_sum += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+            for i, bound in enumerate(CHECKOUT_BUCKETS):
+                if seconds <= bound:
+                    self.checkout_buckets[i] += 1
+
+    def increment(self, name: str) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "invalidations": self.invalidations,
+                "connects": self.connects,
+                "checkout_seconds_sum": round(self.checkout_seconds_sum, 6),
+                "checkout_seconds_max": round(self.checkout_seconds_max, 6),
+                "checkout_seconds_avg": round(self.checkout_seconds_sum / self.checkouts, 6) if self.checkouts else 0.0,
+                "checkout_buckets": dict(zip(CHECKOUT_BUCKETS, self.checkout_buckets)),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """
+    接続取得（プールからの払い出し）にかかった時間を計測する
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        # recreate() ではリスナーが引き継がれるため、新規作成時のみ登録する
+        if kwargs.get("_dispatch") is None:
+            event.listen(self, "connect", lambda *_: self.metrics.increment("connects"))
+            event.listen(self, "invalidate", lambda *_: self.metrics.increment("invalidations"))
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        # 空き接続がなく、オーバーフロー枠も使い切っていれば待ちが発生する
+        waited = self.checkedin() == 0 and self._max_overflow > -1 and self._overflow >= self._max_overflow
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.increment("timeouts")
+            raise
+        self.metrics.observe_checkout(time.perf_counter() - started, waited)
+        return entry
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: str, is_async: bool = False) -> Dict:
+    """
+    create_engine / create_async_engine に渡すプール設定
+    """
+    options = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+    # インメモリの SQLite は接続ごとにDBが分かれるため既定のプールのまま使う
+    if url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[1] in ("", "/")):
+        return options
+
+    options.update({
+        "poolclass": InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    })
+    return options
+
+
+def pool_stats(engine) -> Dict:
+    """
+    エンジンの接続プールの現在値と累計値
+    """
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout": pool.timeout(),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.snapshot())
+    return stats
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from starlette.requests import Request
+
+# 書き込み後、この秒数はレプリカではなくプライマリから読む（レプリケーション遅延対策）
+READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5"))
+# 追跡するクライアント数の上限
+READ_YOUR_WRITES_MAX_CLIENTS = 10000
+
+# 書き込み成功時に固定期限（UNIX 時刻）を返すヘッダー。クライアントが次のリクエストで送り返す
+STICKY_HEADER = "X-DB-Primary-Until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadYourWritesTracker:
+    """
+    直近に書き込んだ認証済みクライアントを記録する（プロセス内）
+    """
+
+    def __init__(self, max_clients: int):
+        self.max_clients = max_clients
+        self.until_by_client: "OrderedDict[str, float]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def mark(self, client_key: str, until: float) -> None:
+        with self.lock:
+            self.until_by_client[client_key] = until
+            self.until_by_client.move_to_end(client_key)
+            while len(self.until_by_client) > self.max_clients:
+                self.until_by_client.popitem(last=False)
+
+    def is_sticky(self, client_key: str, now: float) -> bool:
+        with self.lock:
+            until = self.until_by_client.get(client_key)
+            if until is None:
+                return False
+            if until <= now:
+                del self.until_by_client[client_key]
+                return False
+            return True
+
+
+_tracker = ReadYourWritesTracker(READ_YOUR_WRITES_MAX_CLIENTS)
+
+
+def client_key(request: Request) -> Optional[str]:
+    """
+    認証トークンでクライアントを識別する
+
+    接続元アドレスは NAT やプロキシで共有されるため使わない。未認証のクライアントは
+    プロセス内では追跡せず、X-DB-Primary-Until を送り返した場合だけプライマリに固定する。
+    """
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return "token:" + hashlib.sha256(authorization.encode()).hexdigest()
+    return None
+
+
+def record_write(request: Request, status_code: int) -> Optional[str]:
+    """
+    書き込みリクエストの応答時に呼び出し、成功していれば以降の読み取りをプライマリに固定する
+
+    別ワーカーに振り分けられた場合や未認証のクライアントに備え、X-DB-Primary-Until ヘッダーで
+    返す期限を戻り値にする（クロスオリジンでは Cookie が送られないため、ヘッダーで受け渡す）。
+    """
+    if request.method in SAFE_METHODS or status_code >= 400 or READ_YOUR_WRITES_SECONDS <= 0:
+        return None
+
+    until = time.time() + READ_YOUR_WRITES_SECONDS
+    key = client_key(request)
+    if key:
+        _tracker.mark(key, until)
+    return f"{until:.3f}"
+
+
+def _echoed_until(request: Request, now: float) -> Optional[float]:
+    value = request.headers.get(STICKY_HEADER)
+    if not value:
+        return None
+    try:
+        until = float(value)
+    except ValueError:
+        return None
+    # 送り返された値で固定できるのは本来の期間まで
+    return min(until, now + READ_YOUR_WRITES_SECONDS)
+
+
+def should_use_primary(request: Optional[Request]) -> bool:
+    """
+    直近に書き込みをしたクライアントの読み取りはプライマリに送る
+
+    認証済みクライアントはトークンで、それ以外は送り返された X-DB-Primary-Until で判定する。
+    どちらもない未認証クライアントには read-your-writes を保証しない。
+    """
+    if request is None:
+        return False
+
+    now = time.time()
+    until = _echoed_until(request, now)
+    if until is not None and until > now:
+        return True
+
+    key = client_key(request)
+    return key is not None and _tracker.is_sticky(key, now)
@@ -1,11 +1,44 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api import employees, skills, projects, availability, one_on_ones, dashboard, seed, auth
+from fastapi.responses import JSONResponse, PlainTextResponse
+from .api import employees, skills, projects, availability, one_on_ones, dashboard, seed, auth, export, metrics, profiling
+from .db.database import engine, async_engine, replica_engine, async_replica_engine, dispose_engines
+from .db.pool import pool_stats
+from .db.routing import STICKY_HEADER
+from .db.instrumentation import install_query_hooks
+from .services.warmup import readiness, warm_up
+from .utils import metrics as app_metrics
+from .utils.profiler import ProfilingMiddleware
+from .utils.request_middleware import RequestInstrumentationMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ウォームアップ中もリクエストは受け付け、/ready だけが 503 を返す
+    warmup_task = asyncio.create_task(warm_up())
+    metrics_flush = None
+    if app_metrics.METRICS_MULTIPROC_DIR:
+        app_metrics.remove_stale_snapshots()
+        metrics_flush = asyncio.create_task(app_metrics.flush_periodically())
+
+    yield
+
+    readiness.drain()
+    for task in (warmup_task, metrics_flush):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    if app_metrics.METRICS_MULTIPROC_DIR:
+        app_metrics.write_snapshot()
+    await dispose_engines()
 
 app = FastAPI(
     title="SES Support API",
     description="SES企業向けキャリア支援ツール API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -14,8 +47,42 @@ app.add_middleware(
     allow_credentials=False,  # 全て許可する場合はFalseにする必要がある
     allow_methods=["*"],
     allow_headers=["*"],
+    # read-your-writes の期限をクライアントが読み取って送り返せるようにする
+    expose_headers=[STICKY_HEADER],
 )
 
+install_query_hooks()
+
+register_pools = [("primary", engine), ("primary_async", async_engine)]
+if replica_engine is not engine:
+    register_pools.append(("replica", replica_engine))
+if async_replica_engine is not async_engine:
+    register_pools.append(("replica_async", async_replica_engine))
+for pool_name, pool_engine in register_pools:
+    if pool_engine is not None:
+        sync_engine = getattr(pool_engine, "sync_engine", pool_engine)
+        app_metrics.register_pool(pool_name, lambda sync_engine=sync_engine: pool_stats(sync_engine))
+
+# エンドポイント関数 → ルートのパス（メトリクスのラベル用）
+route_paths = {}
+
+def route_path(endpoint) -> str:
+    if endpoint is None:
+        return "unmatched"
+    if not route_paths:
+        route_paths.update({route.endpoint: route.path for route in app.routes if hasattr(route, "endpoint")})
+    return route_paths.get(endpoint, "unmatched")
+
+# ルート別メトリクス・SQLの集計・read-your-writes をまとめて行う
+app.add_middleware(RequestInstrumentationMiddleware, route_label=route_path)
+
+def is_admin_token(token: str) -> bool:
+    principal = auth.principal_from_token(token)
+    return principal is not None and principal.is_admin
+
+# 最も外側で、管理者が X-Profile: 1 を付けたリクエストだけをプロファイリングする
+app.add_middleware(ProfilingMiddleware, authorize=is_admin_token)
+
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(employees.router, prefix="/api/employees", tags=["employees"])
 app.include_router(skills.router, prefix="/api/skills", tags=["skills"])
@@ -23,7 +90,10 @@ app.include_router(projects.router, prefix="/api/projects", tags=["projects"])
 app.include_router(availability.router, prefix="/api/availability", tags=["availability"])
 app.include_router(one_on_ones.router, prefix="/api/one-on-ones", tags=["one-on-ones"])
 app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
 app.include_router(seed.router, prefix="/api/seed", tags=["seed"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
+app.include_router(profiling.router, prefix="/api/admin/profiles", tags=["admin"])
 
 @app.get("/")
 def read_root():
@@ -31,4 +101,15 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/ready")
+def readiness_check():
+    """
+    ウォームアップが終わるまで（と停止処理中）は 503 を返す。ロードバランサーの振り分け判定用
+    """
+    return JSONResponse(readiness.snapshot(), status_code=200 if readiness.ready else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(app_metrics.render_metrics(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
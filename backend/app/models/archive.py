@@ -0,0 +1,43 @@
+from sqlalchemy import Column, DateTime, Index, Table
+from sqlalchemy.sql import func
+from ..db.database import Base
+from .employee import Employee, Project, Availability, AvailabilityHistory, OneOnOne, employee_skills
+
+
+def _archive_table(source: Table) -> Table:
+    """
+    退職者などのデータを移すコールドテーブル。元テーブルと同じ列に archived_at を加え、外部キーは持たない
+    """
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable, autoincrement=False)
+        for column in source.columns
+    ]
+    indexes = []
+    if "employee_id" in source.columns and source.name != "employees":
+        indexes.append(Index(f"ix_archived_{source.name}_employee_id", "employee_id"))
+
+    return Table(
+        f"archived_{source.name}",
+        Base.metadata,
+        *columns,
+        Column("archived_at", DateTime, server_default=func.now(), nullable=False),
+        *indexes
+    )
+
+
+archived_employees = _archive_table(Employee.__table__)
+archived_employee_skills = _archive_table(employee_skills)
+archived_projects = _archive_table(Project.__table__)
+archived_availability = _archive_table(Availability.__table__)
+archived_availability_history = _archive_table(AvailabilityHistory.__table__)
+archived_one_on_ones = _archive_table(OneOnOne.__table__)
+
+# 元テーブルとアーカイブ先の対応（子テーブルから順に移す）
+ARCHIVE_TABLES = [
+    (employee_skills, archived_employee_skills),
+    (Project.__table__, archived_projects),
+    (Availability.__table__, archived_availability),
+    (AvailabilityHistory.__table__, archived_availability_history),
+    (OneOnOne.__table__, archived_one_on_ones),
+    (Employee.__table__, archived_employees),
+]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Table, Index, JSON, Float, UniqueConstraint, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -14,13 +14,27 @@ class OneOnOneStatus(enum.Enum):
     NORMAL = "normal"
     ATTENTION = "attention"
 
+class SkillRelationType(enum.Enum):
+    RELATED = "related"  # 双方向（例: Vue.js ⇔ React）
+    IMPLIES = "implies"  # 一方向（例: TypeScript → JavaScript）
+
 employee_skills = Table(
     'employee_skills',
     Base.metadata,
     Column('employee_id', Integer, ForeignKey('employees.id')),
     Column('skill_id', Integer, ForeignKey('skills.id')),
     Column('level', Integer),
-    Column('years_experience', Integer)
+    Column('years_experience', Integer),
+    Index('ix_employee_skills_employee_id_skill_id', 'employee_id', 'skill_id'),
+    Index('ix_employee_skills_skill_id_employee_id', 'skill_id', 'employee_id')
+)
+
+project_tech_tags = Table(
+    'project_tech_tags',
+    Base.metadata,
+    Column('project_id', Integer, ForeignKey('projects.id'), primary_key=True),
+    Column('tag', String(50), primary_key=True),
+    Index('ix_project_tech_tags_tag_project_id', 'tag', 'project_id')
 )
 
 class Employee(Base):
@@ -40,6 +54,7 @@ class Employee(Base):
     projects = relationship("Project", back_populates="employee")
     availability = relationship("Availability", back_populates="employee", uselist=False)
     one_on_ones = relationship("OneOnOne", back_populates="employee")
+    profile = relationship("EmployeeProfile", back_populates="employee", uselist=False, cascade="all, delete-orphan")
 
 class Skill(Base):
     __tablename__ = "skills"
@@ -51,6 +66,33 @@ class Skill(Base):
 
     employees = relationship("Employee", secondary=employee_skills, back_populates="skills")
 
+class SkillAlias(Base):
+    """
+    スキルの別名（例: JS → JavaScript）。alias は正規化済みのキーで保存する
+    """
+    __tablename__ = "skill_aliases"
+
+    id = Column(Integer, primary_key=True, index=True)
+    alias = Column(String(100), unique=True, nullable=False, index=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False, index=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+class SkillRelation(Base):
+    """
+    スキル間の関係。skill_id の保有者は related_skill_id に対して weight 分の評価を得る
+    """
+    __tablename__ = "skill_relations"
+    __table_args__ = (
+        UniqueConstraint('skill_id', 'related_skill_id', name='uq_skill_relations_skill_id_related_skill_id'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False, index=True)
+    related_skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False, index=True)
+    relation_type = Column(Enum(SkillRelationType), nullable=False)
+    weight = Column(Float, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
 class Project(Base):
     __tablename__ = "projects"
 
@@ -84,8 +126,39 @@ class Availability(Base):
 
     employee = relationship("Employee", back_populates="availability")
 
+class AvailabilityHistory(Base):
+    """
+    稼働状況の変更履歴（追記のみ）。有効期間は [valid_from, valid_to) で、valid_to が NULL の行が現在値
+
+    PostgreSQL では時点検索用に tsrange(valid_from, valid_to) の GiST インデックスを持つ。
+    """
+    __tablename__ = "availability_history"
+
+    id = Column(Integer, primary_key=True, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    status = Column(Enum(AvailabilityStatus), nullable=False)
+    available_from = Column(DateTime, nullable=True)
+    memo = Column(Text, nullable=True)
+    valid_from = Column(DateTime, nullable=False)
+    valid_to = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+    # 式インデックスが列を参照するため列定義の後に置く。create_all（/api/seed/init-db）でも作成される
+    __table_args__ = (
+        Index("ix_availability_history_employee_id_valid_from", "employee_id", "valid_from"),
+        Index(
+            "ix_availability_history_validity",
+            func.tsrange(valid_from, valid_to, literal_column("'[)'")),
+            postgresql_using="gist"
+        ).ddl_if(dialect="postgresql"),
+    )
+
 class OneOnOne(Base):
     __tablename__ = "one_on_ones"
+    __table_args__ = (
+        Index("ix_one_on_ones_date", "date"),
+        Index("ix_one_on_ones_employee_id_date", "employee_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
@@ -95,4 +168,26 @@ class OneOnOne(Base):
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
-    employee = relationship("Employee", back_populates="one_on_ones")
\ No newline at end of file
+    employee = relationship("Employee", back_populates="one_on_ones")
+
+class EmployeeProfile(Base):
+    """
+    案件履歴と稼働状況から算出した社員ごとの経験プロファイル（マッチング用の集計値）
+    """
+    __tablename__ = "employee_profiles"
+
+    employee_id = Column(Integer, ForeignKey("employees.id"), primary_key=True)
+    # 終了済みの案件のタグ別月数。継続中の案件はタグ別の開始日（ISO 形式）で持ち、参照時に加える
+    tag_months = Column(JSON, nullable=False, default=dict)
+    open_tag_starts = Column(JSON, nullable=False, default=dict)
+    phase_requirements_count = Column(Integer, nullable=False, default=0)
+    phase_design_count = Column(Integer, nullable=False, default=0)
+    phase_implementation_count = Column(Integer, nullable=False, default=0)
+    phase_testing_count = Column(Integer, nullable=False, default=0)
+    # 日付が確定している空き開始日（稼働可能日・最終案件の終了日）。即稼働可能・来月から可の社員は
+    # free_status に稼働状況を持ち、日付は参照時に決める
+    earliest_free_date = Column(DateTime, nullable=True, index=True)
+    free_status = Column(Enum(AvailabilityStatus), nullable=True, index=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    employee = relationship("Employee", back_populates="profile")
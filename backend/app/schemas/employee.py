@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel
-from ..models.employee import AvailabilityStatus, OneOnOneStatus
+from pydantic import BaseModel, Field
+from ..models.employee import AvailabilityStatus, OneOnOneStatus, SkillRelationType
 
 class SkillBase(BaseModel):
     name: str
@@ -17,6 +17,30 @@ class Skill(SkillBase):
     class Config:
         from_attributes = True
 
+class SkillAliasCreate(BaseModel):
+    alias: str
+    skill_id: int
+
+class SkillAlias(SkillAliasCreate):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SkillRelationCreate(BaseModel):
+    skill_id: int
+    related_skill_id: int
+    relation_type: SkillRelationType = SkillRelationType.RELATED
+    weight: float = Field(0.5, gt=0, le=1)
+
+class SkillRelation(SkillRelationCreate):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
 class EmployeeSkill(BaseModel):
     skill_id: int
     skill_name: str
@@ -76,6 +100,18 @@ class Availability(AvailabilityBase):
     class Config:
         from_attributes = True
 
+class AvailabilityHistory(BaseModel):
+    id: int
+    employee_id: int
+    status: AvailabilityStatus
+    available_from: Optional[datetime] = None
+    memo: Optional[str] = None
+    valid_from: datetime
+    valid_to: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class OneOnOneBase(BaseModel):
     date: datetime
     memo: Optional[str] = None
@@ -138,6 +174,25 @@ class EmployeeList(BaseModel):
     class Config:
         from_attributes = True
 
+class EmployeeImportSkill(BaseModel):
+    name: Optional[str] = None
+    skill_id: Optional[int] = None
+    level: int = 1
+    years_experience: int = 0
+
+class EmployeeImport(EmployeeBase):
+    skills: List[EmployeeImportSkill] = []
+    availability: Optional[AvailabilityBase] = None
+    projects: List[ProjectBase] = []
+
+class EmployeeImportResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class EmployeeIdsRequest(BaseModel):
+    employee_ids: List[int]
+
 class EmployeeSearchFilters(BaseModel):
     skill_tags: Optional[List[str]] = None
     years_experience_min: Optional[int] = None
@@ -159,6 +214,7 @@ class ProjectMatchingResult(BaseModel):
     employee: EmployeeList
     score: float
     matching_skills: List[str] = []
+    related_skills: List[str] = []
     recent_projects: List[str] = []
 
     class Config:
@@ -0,0 +1,69 @@
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import and_, or_, func, literal_column
+from sqlalchemy.orm import Session
+from ..models.employee import Availability, AvailabilityHistory
+
+
+def close_availability_history(db: Session, employee_ids: Iterable[int], changed_at: datetime) -> None:
+    """
+    現在有効な履歴行の有効期間を changed_at で閉じる
+    """
+    employee_ids = list(employee_ids)
+    if not employee_ids:
+        return
+    db.query(AvailabilityHistory).filter(
+        AvailabilityHistory.employee_id.in_(employee_ids),
+        AvailabilityHistory.valid_to.is_(None)
+    ).update({AvailabilityHistory.valid_to: changed_at}, synchronize_session=False)
+
+
+def record_availability_changes(
+    db: Session,
+    availabilities: Iterable,
+    changed_at: Optional[datetime] = None
+) -> None:
+    """
+    稼働状況の現在値を履歴に追記する（コミットは呼び出し側）
+
+    employee_id / status / available_from / memo を持つオブジェクトであればスキーマでもよい。
+    """
+    availabilities = list(availabilities)
+    if not availabilities:
+        return
+
+    changed_at = changed_at or datetime.now()
+    close_availability_history(db, [a.employee_id for a in availabilities], changed_at)
+    db.execute(
+        AvailabilityHistory.__table__.insert(),
+        [
+            {
+                "employee_id": a.employee_id,
+                "status": a.status,
+                "available_from": a.available_from,
+                "memo": a.memo,
+                "valid_from": changed_at,
+                "valid_to": None
+            }
+            for a in availabilities
+        ]
+    )
+
+
+def record_availability_change(db: Session, availability: Availability) -> None:
+    record_availability_changes(db, [availability])
+
+
+def valid_at(db: Session, moment: datetime):
+    """
+    指定時点で有効な履歴行の条件式
+
+    PostgreSQL では GiST インデックスと同じ式 tsrange(valid_from, valid_to) @> 時点 を使う。
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        validity = func.tsrange(AvailabilityHistory.valid_from, AvailabilityHistory.valid_to, literal_column("'[)'"))
+        return validity.op('@>')(moment)
+    return and_(
+        AvailabilityHistory.valid_from <= moment,
+        or_(AvailabilityHistory.valid_to.is_(None), AvailabilityHistory.valid_to > moment)
+    )
@@ -0,0 +1,56 @@
+"""
+ダッシュボードの参照系クエリ（ルーターと起動時のウォームアップで共用）
+"""
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+from ..models.employee import Employee, Availability, OneOnOne, AvailabilityStatus, OneOnOneStatus
+from ..utils.dates import current_month_range
+
+
+def dashboard_stats(db: Session):
+    total_employees = db.query(Employee).count()
+
+    next_month_available = db.query(Availability).filter(
+        or_(
+            Availability.status == AvailabilityStatus.AVAILABLE_NEXT_MONTH,
+            Availability.status == AvailabilityStatus.IMMEDIATELY_AVAILABLE
+        )
+    ).count()
+
+    month_start, month_end = current_month_range()
+    one_on_one_completion = db.query(OneOnOne.employee_id.distinct()).filter(
+        OneOnOne.date >= month_start,
+        OneOnOne.date < month_end
+    ).count()
+
+    completion_rate = (one_on_one_completion / total_employees * 100) if total_employees > 0 else 0
+
+    attention_count = db.query(OneOnOne).filter(
+        OneOnOne.status == OneOnOneStatus.ATTENTION,
+        OneOnOne.date >= month_start,
+        OneOnOne.date < month_end
+    ).count()
+
+    return {
+        "total_employees": total_employees,
+        "next_month_available": next_month_available,
+        "one_on_one_completion_rate": round(completion_rate, 2),
+        "attention_employees": attention_count
+    }
+
+
+def availability_status_counts(db: Session):
+    availability_counts = db.query(
+        Availability.status,
+        func.count(Availability.id).label('count')
+    ).group_by(Availability.status).all()
+
+    total_with_availability = sum([count for _, count in availability_counts])
+    total_employees = db.query(Employee).count()
+    no_status_count = total_employees - total_with_availability
+
+    result = [{"status": status.value, "count": count} for status, count in availability_counts]
+    if no_status_count > 0:
+        result.append({"status": "no_status", "count": no_status_count})
+
+    return result
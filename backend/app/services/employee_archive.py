@@ -0,0 +1,86 @@
+from typing import Dict, List, Sequence
+from sqlalchemy import Table, delete, insert, select
+from sqlalchemy.orm import Session
+from ..models.archive import ARCHIVE_TABLES
+from ..models.employee import (
+    Employee,
+    EmployeeProfile,
+    Project,
+    Availability,
+    AvailabilityHistory,
+    OneOnOne,
+    employee_skills,
+    project_tech_tags
+)
+
+# 外部キーの依存順（子テーブルが先）
+EMPLOYEE_CHILD_TABLES = [
+    employee_skills,
+    Project.__table__,
+    Availability.__table__,
+    AvailabilityHistory.__table__,
+    OneOnOne.__table__,
+]
+
+
+def _owner_filter(table: Table, employee_ids: Sequence[int]):
+    column = table.c.id if table.name == "employees" else table.c.employee_id
+    return column.in_(employee_ids)
+
+
+def _delete_derived_rows(db: Session, employee_ids: Sequence[int]) -> None:
+    # project_tech_tags は projects.tech_tags から再生成できるため移さずに削除する
+    project_ids = select(Project.id).where(Project.employee_id.in_(employee_ids))
+    db.execute(delete(project_tech_tags).where(project_tech_tags.c.project_id.in_(project_ids)))
+    db.execute(delete(EmployeeProfile).where(EmployeeProfile.employee_id.in_(employee_ids)))
+
+
+def existing_employee_ids(db: Session, employee_ids: Sequence[int]) -> List[int]:
+    if not employee_ids:
+        return []
+    return [
+        employee_id for (employee_id,) in
+        db.query(Employee.id).filter(Employee.id.in_(list(employee_ids)))
+    ]
+
+
+def delete_employees(db: Session, employee_ids: Sequence[int]) -> Dict[str, int]:
+    """
+    社員と関連データをテーブル単位の DELETE でまとめて削除する（コミットは呼び出し側）
+    """
+    employee_ids = list(employee_ids)
+    if not employee_ids:
+        return {}
+
+    _delete_derived_rows(db, employee_ids)
+
+    deleted = {}
+    for table in EMPLOYEE_CHILD_TABLES + [Employee.__table__]:
+        result = db.execute(delete(table).where(_owner_filter(table, employee_ids)))
+        deleted[table.name] = result.rowcount
+    return deleted
+
+
+def archive_employees(db: Session, employee_ids: Sequence[int]) -> Dict[str, int]:
+    """
+    社員と関連データをアーカイブ用テーブルへ移し、元テーブルから削除する（コミットは呼び出し側）
+    """
+    employee_ids = list(employee_ids)
+    if not employee_ids:
+        return {}
+
+    archived = {}
+    for source, target in ARCHIVE_TABLES:
+        columns = [column.name for column in source.columns]
+        db.execute(
+            insert(target).from_select(
+                columns,
+                select(*source.columns).where(_owner_filter(source, employee_ids))
+            )
+        )
+
+    _delete_derived_rows(db, employee_ids)
+    for source, _ in ARCHIVE_TABLES:
+        result = db.execute(delete(source).where(_owner_filter(source, employee_ids)))
+        archived[source.name] = result.rowcount
+    return archived
@@ -0,0 +1,172 @@
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from ..db.bulk import copy_rows
+from ..models.employee import Employee, Project, Availability, employee_skills, project_tech_tags
+from ..schemas.employee import EmployeeImport, AvailabilityCreate
+from .availability_history import record_availability_changes
+from .profiles import refresh_employee_profiles
+from .skill_catalog import SkillCatalog, get_skill_catalog
+from .tech_tags import parse_tech_tags
+
+IMPORT_BATCH_SIZE = 1000
+
+EMPLOYEE_COLUMNS = (
+    "name", "years_experience", "main_role", "unit_price_min", "unit_price_max", "desired_career"
+)
+PROJECT_COLUMNS = (
+    "title", "role", "start_date", "end_date", "description", "tech_tags",
+    "phase_requirements", "phase_design", "phase_implementation", "phase_testing"
+)
+
+
+def _skill_rows(record: EmployeeImport, catalog: SkillCatalog) -> List[tuple]:
+    rows = {}
+    for skill in record.skills:
+        skill_id = catalog.resolve(skill.name, skill.skill_id)
+        if skill_id is None:
+            raise ValueError(f"unknown skill: {skill.name or skill.skill_id}")
+        rows[skill_id] = (skill_id, skill.level, skill.years_experience)
+    return list(rows.values())
+
+
+def _insert_returning_ids(db: Session, model, rows: List[dict]) -> List[int]:
+    # 複数行 INSERT ... RETURNING を入力順で受け取る
+    result = db.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True),
+        rows
+    )
+    return [row[0] for row in result]
+
+
+def _import_batch(
+    db: Session, batch: Sequence[Tuple[int, EmployeeImport, List[tuple]]], catalog: SkillCatalog
+) -> List[int]:
+    employee_ids = _insert_returning_ids(
+        db, Employee, [record.model_dump(include=set(EMPLOYEE_COLUMNS)) for _, record, _ in batch]
+    )
+
+    skill_rows = []
+    availabilities = []
+    project_rows = []
+    for employee_id, (_, record, skills) in zip(employee_ids, batch):
+        skill_rows.extend((employee_id, *skill) for skill in skills)
+        if record.availability is not None:
+            availabilities.append(
+                AvailabilityCreate(employee_id=employee_id, **record.availability.model_dump())
+            )
+        for project in record.projects:
+            project_rows.append({"employee_id": employee_id, **project.model_dump(include=set(PROJECT_COLUMNS))})
+
+    copy_rows(
+        db, employee_skills, ("employee_id", "skill_id", "level", "years_experience"), skill_rows
+    )
+
+    if availabilities:
+        copy_rows(
+            db,
+            Availability.__table__,
+            ("employee_id", "status", "available_from", "memo"),
+            [(a.employee_id, a.status, a.available_from, a.memo) for a in availabilities]
+        )
+        record_availability_changes(db, availabilities, datetime.now())
+
+    if project_rows:
+        project_ids = _insert_returning_ids(db, Project, project_rows)
+        copy_rows(
+            db,
+            project_tech_tags,
+            ("project_id", "tag"),
+            [
+                (project_id, tag)
+                for project_id, row in zip(project_ids, project_rows)
+                for tag in parse_tech_tags(row["tech_tags"], catalog)
+            ]
+        )
+
+    return employee_ids
+
+
+def import_employees(db: Session, records) -> List[dict]:
+    """
+    社員をスキル・稼働状況・案件ごと一括登録する（コミットは呼び出し側）
+
+    records は (入力位置, EmployeeImport または None, エラー) の列。
+    入力順に {index, id, error} を返し、不正なレコードは登録しない。
+    """
+    catalog = get_skill_catalog(db)
+    results: List[dict] = []
+    imported_ids: List[int] = []
+    batch = []
+
+    def flush():
+        ids = _import_batch(db, batch, catalog)
+        for employee_id, (index, _, _) in zip(ids, batch):
+            results.append({"index": index, "id": employee_id, "error": None})
+        imported_ids.extend(ids)
+        batch.clear()
+
+    for index, record, error in records:
+        if error is None:
+            try:
+                try:
+                    skill_rows = _skill_rows(record, catalog)
+                except ValueError:
+                    # 他ワーカーで追加されたばかりのスキルかもしれないので、カタログを確かめて1度だけやり直す
+                    catalog = get_skill_catalog(
+                        db,
+                        skill_ids=[skill.skill_id for skill in record.skills if skill.skill_id is not None],
+                        names=[skill.name for skill in record.skills if skill.skill_id is None and skill.name]
+                    )
+                    skill_rows = _skill_rows(record, catalog)
+                batch.append((index, record, skill_rows))
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            results.append({"index": index, "id": None, "error": error})
+            continue
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            flush()
+
+    if batch:
+        flush()
+
+    if imported_ids:
+        refresh_employee_profiles(db, imported_ids)
+
+    results.sort(key=lambda result: result["index"])
+    return results
+
+
+def csv_record_to_import(record: Dict[str, str]) -> dict:
+    """
+    CSV の1行を EmployeeImport 用の辞書に変換する
+
+    skills 列は「名前:レベル:経験年数」をセミコロン区切りで並べる（例: Python:4:5;React:3）。
+    """
+    data = {key: (value if value != "" else None) for key, value in record.items() if key}
+
+    skills = []
+    for entry in (data.pop("skills", None) or "").split(";"):
+        if not entry.strip():
+            continue
+        name, *rest = [part.strip() for part in entry.split(":")]
+        skill = {"name": name}
+        if len(rest) > 0 and rest[0]:
+            skill["level"] = rest[0]
+        if len(rest) > 1 and rest[1]:
+            skill["years_experience"] = rest[1]
+        skills.append(skill)
+    data["skills"] = skills
+
+    status = data.pop("availability_status", None)
+    available_from = data.pop("available_from", None)
+    availability_memo = data.pop("availability_memo", None)
+    if status:
+        data["availability"] = {
+            "status": status.lower(),
+            "available_from": available_from,
+            "memo": availability_memo
+        }
+    return data
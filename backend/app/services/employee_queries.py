@@ -0,0 +1,178 @@
+"""
+社員の参照系クエリ
+
+社員APIのルーターと起動時のウォームアップが共通で使う。Session を受け取る同期関数で、
+非同期モードでは ReadSession.run / run_in_thread 経由で呼ばれる。
+"""
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from ..models.employee import Employee, employee_skills, Availability, Project
+from ..schemas.employee import EmployeeList
+from .skill_catalog import SkillCatalog, get_skill_catalog
+
+
+def skill_ids_by_employee(db: Session, employee_ids: List[int]) -> Dict[int, List[int]]:
+    # スキル表は結合せず、名前はスキルカタログから引く
+    skill_ids = {employee_id: [] for employee_id in employee_ids}
+    if employee_ids:
+        rows = db.query(employee_skills.c.employee_id, employee_skills.c.skill_id).filter(
+            employee_skills.c.employee_id.in_(employee_ids)
+        ).all()
+        for employee_id, skill_id in rows:
+            skill_ids[employee_id].append(skill_id)
+    return skill_ids
+
+
+def _all_skill_ids(skill_ids: Dict[int, List[int]]) -> set:
+    return {skill_id for ids in skill_ids.values() for skill_id in ids}
+
+
+def skill_names_for(skill_ids: List[int], catalog: SkillCatalog) -> List[str]:
+    return [name for name in (catalog.name_for(skill_id) for skill_id in skill_ids) if name]
+
+
+def to_employee_list(emp: Employee, skill_names: List[str]) -> EmployeeList:
+    return EmployeeList(
+        id=emp.id,
+        name=emp.name,
+        years_experience=emp.years_experience,
+        main_role=emp.main_role,
+        unit_price_min=emp.unit_price_min,
+        unit_price_max=emp.unit_price_max,
+        availability_status=emp.availability.status.value.lower() if emp.availability else None,
+        main_skills=skill_names[:3]
+    )
+
+
+def to_employee_lists(db: Session, employees: List[Employee]) -> List[EmployeeList]:
+    skill_ids = skill_ids_by_employee(db, [emp.id for emp in employees])
+    catalog = get_skill_catalog(db, skill_ids=_all_skill_ids(skill_ids))
+    return [to_employee_list(emp, skill_names_for(skill_ids[emp.id], catalog)) for emp in employees]
+
+
+def list_employees(db: Session, skip: int, limit: int):
+    employees = db.query(Employee).options(
+        joinedload(Employee.availability)
+    ).offset(skip).limit(limit).all()
+
+    return to_employee_lists(db, employees)
+
+
+def search_employees(
+    db: Session,
+    skill_tags: Optional[str],
+    years_experience_min: Optional[int],
+    years_experience_max: Optional[int],
+    availability_status: Optional[str],
+    unit_price_min: Optional[int],
+    unit_price_max: Optional[int]
+):
+    query = db.query(Employee).options(
+        joinedload(Employee.availability)
+    )
+
+    if skill_tags:
+        skill_list = [s.strip() for s in skill_tags.split(',')]
+        skill_ids = get_skill_catalog(db, names=skill_list).ids_for(skill_list)
+        if not skill_ids:
+            return []
+        query = query.filter(Employee.id.in_(
+            select(employee_skills.c.employee_id).where(employee_skills.c.skill_id.in_(skill_ids))
+        ))
+
+    if years_experience_min:
+        query = query.filter(Employee.years_experience >= years_experience_min)
+
+    if years_experience_max:
+        query = query.filter(Employee.years_experience <= years_experience_max)
+
+    if unit_price_min:
+        query = query.filter(Employee.unit_price_min >= unit_price_min)
+
+    if unit_price_max:
+        query = query.filter(Employee.unit_price_max <= unit_price_max)
+
+    if availability_status:
+        status_list = [s.strip() for s in availability_status.split(',')]
+        query = query.join(Employee.availability).filter(Availability.status.in_(status_list))
+
+    employees = query.all()
+
+    return to_employee_lists(db, employees)
+
+
+def get_employee_detail(db: Session, employee_id: int) -> Optional[dict]:
+    employee = db.query(Employee).options(
+        joinedload(Employee.projects),
+        joinedload(Employee.availability),
+        joinedload(Employee.one_on_ones)
+    ).filter(Employee.id == employee_id).first()
+
+    if employee is None:
+        return None
+
+    # スキル情報を取得（level と years_experience を含む）。名前とカテゴリはカタログから引く
+    skills_data = db.query(
+        employee_skills.c.skill_id,
+        employee_skills.c.level,
+        employee_skills.c.years_experience
+    ).filter(
+        employee_skills.c.employee_id == employee_id
+    ).all()
+
+    # EmployeeSkillの形式でスキルデータを作成
+    catalog = get_skill_catalog(db, skill_ids=[skill_data.skill_id for skill_data in skills_data])
+    skills = []
+    for skill_data in skills_data:
+        if skill_data.skill_id not in catalog:
+            continue
+        skills.append({
+            'skill_id': skill_data.skill_id,
+            'skill_name': catalog.name_for(skill_data.skill_id),
+            'skill_category': catalog.category_for(skill_data.skill_id),
+            'level': skill_data.level,
+            'years_experience': skill_data.years_experience
+        })
+
+    # レスポンス用の辞書を作成
+    response_data = {
+        'id': employee.id,
+        'name': employee.name,
+        'years_experience': employee.years_experience,
+        'main_role': employee.main_role,
+        'unit_price_min': employee.unit_price_min,
+        'unit_price_max': employee.unit_price_max,
+        'desired_career': employee.desired_career,
+        'created_at': employee.created_at,
+        'updated_at': employee.updated_at,
+        'skills': skills,
+        'projects': employee.projects,
+        'availability': employee.availability,
+        'one_on_ones': employee.one_on_ones
+    }
+
+    return response_data
+
+
+def load_matching_candidates(db: Session, skill_names: List[str] = ()):
+    # 案件履歴は読み込まず、事前集計したプロファイルで評価する
+    employees = db.query(Employee).options(
+        joinedload(Employee.availability),
+        joinedload(Employee.profile)
+    ).all()
+    skill_ids = skill_ids_by_employee(db, [emp.id for emp in employees])
+    catalog = get_skill_catalog(db, skill_ids=_all_skill_ids(skill_ids), names=skill_names)
+    return employees, skill_ids, catalog
+
+
+def recent_project_titles(db: Session, employee_ids: List[int]) -> Dict[int, List[str]]:
+    recent_projects = {}
+    project_rows = db.query(Project.employee_id, Project.title).filter(
+        Project.employee_id.in_(employee_ids)
+    ).order_by(Project.employee_id, Project.start_date.desc(), Project.id.desc()).all()
+    for employee_id, title in project_rows:
+        titles = recent_projects.setdefault(employee_id, [])
+        if len(titles) < 2:
+            titles.append(title)
+    return recent_projects
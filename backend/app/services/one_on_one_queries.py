@@ -0,0 +1,59 @@
+"""
+1on1の参照系クエリ（ルーターと起動時のウォームアップで共用）
+"""
+from datetime import date
+from typing import Optional
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session
+from ..models.employee import OneOnOne, Employee
+from ..utils.dates import resolve_date_range, month_range
+
+
+def missing_one_on_ones(
+    db: Session,
+    skip: int,
+    limit: int,
+    year: int,
+    month: int,
+    date_from: Optional[date],
+    date_to: Optional[date],
+    order: str
+):
+    start, end = resolve_date_range(year, month, date_from, date_to)
+    if start is None and end is None:
+        current_date = date.today()
+        start, end = month_range(current_date.year, current_date.month)
+
+    # (employee_id, date) インデックスで解決できる相関サブクエリ
+    period_conditions = [OneOnOne.employee_id == Employee.id]
+    if start is not None:
+        period_conditions.append(OneOnOne.date >= start)
+    if end is not None:
+        period_conditions.append(OneOnOne.date < end)
+    has_one_on_one = exists().where(*period_conditions)
+
+    last_date = db.query(func.max(OneOnOne.date)).filter(
+        OneOnOne.employee_id == Employee.id
+    ).correlate(Employee).scalar_subquery()
+
+    if order == "desc":
+        sort_key = last_date.desc().nulls_last()
+    else:
+        sort_key = last_date.asc().nulls_first()
+
+    rows = db.query(
+        Employee.id,
+        Employee.name,
+        Employee.main_role,
+        last_date.label("last_one_on_one_date")
+    ).filter(~has_one_on_one).order_by(sort_key, Employee.id).offset(skip).limit(limit).all()
+
+    return [
+        {
+            "employee_id": row.id,
+            "employee_name": row.name,
+            "main_role": row.main_role,
+            "last_one_on_one_date": row.last_one_on_one_date
+        }
+        for row in rows
+    ]
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from ..utils.metrics import CacheStats, cache_stats
+
+# 認証済みユーザー情報を保持する秒数。無効化が他ワーカーに届くまでの上限にもなる
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+# トークン・ユーザーそれぞれの最大保持件数
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    リクエストの認証主体。User の読み取り専用スナップショット
+    """
+    id: int
+    email: str
+    name: str
+    avatar_url: Optional[str]
+    is_admin: bool
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            avatar_url=user.avatar_url,
+            is_admin=bool(user.is_admin),
+            is_active=bool(user.is_active)
+        )
+
+
+class _LRUCache:
+    """
+    件数上限と有効期限つきの LRU キャッシュ
+    """
+
+    def __init__(self, max_size: int, stats: CacheStats):
+        self.max_size = max_size
+        self.stats = stats
+        self.entries: "OrderedDict[str, Tuple[float, object]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.stats.miss()
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self.entries[key]
+                self.stats.miss()
+                return None
+            self.entries.move_to_end(key)
+            self.stats.hit()
+            return value
+
+    def set(self, key: str, value, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+# トークン（ハッシュ値）→ 検証済みのメールアドレス
+_claims = _LRUCache(PRINCIPAL_CACHE_SIZE, cache_stats("token_claims"))
+# メールアドレス → Principal
+_principals = _LRUCache(PRINCIPAL_CACHE_SIZE, cache_stats("principals"))
+
+
+def _token_key(token: str) -> str:
+    # トークン本体はメモリに残さない
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_cached_claims(token: str) -> Optional[str]:
+    return _claims.get(_token_key(token))
+
+
+def cache_claims(token: str, email: str, exp: Optional[float]) -> None:
+    """
+    検証済みトークンの subject を、トークンの有効期限を超えない範囲で保持する
+    """
+    ttl = PRINCIPAL_CACHE_TTL
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    _claims.set(_token_key(token), email, ttl)
+
+
+def get_cached_principal(email: str) -> Optional[Principal]:
+    return _principals.get(email)
+
+
+def cache_principal(principal: Principal) -> None:
+    _principals.set(principal.email, principal, PRINCIPAL_CACHE_TTL)
+
+
+def invalidate_principal(email: str) -> None:
+    """
+    ユーザー情報の更新・無効化後に呼び出す
+    """
+    _principals.delete(email)
+
+
+def clear_principal_cache() -> None:
+    _claims.clear()
+    _principals.clear()
@@ -0,0 +1,244 @@
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import func, case, and_
+from sqlalchemy.orm import Session
+from ..models.employee import (
+    Employee,
+    EmployeeProfile,
+    Project,
+    Availability,
+    AvailabilityStatus,
+    project_tech_tags
+)
+from ..utils.dates import days_between, month_range
+from .skill_catalog import get_skill_catalog
+
+DAYS_PER_MONTH = 30.44
+
+PHASE_COLUMNS = {
+    "requirements": "phase_requirements",
+    "design": "phase_design",
+    "implementation": "phase_implementation",
+    "testing": "phase_testing",
+}
+
+# マッチング条件で使われる工程名の表記ゆれ
+PHASE_ALIASES = {
+    "requirements": "requirements",
+    "phase_requirements": "requirements",
+    "要件定義": "requirements",
+    "design": "design",
+    "phase_design": "design",
+    "設計": "design",
+    "基本設計": "design",
+    "詳細設計": "design",
+    "implementation": "implementation",
+    "phase_implementation": "implementation",
+    "実装": "implementation",
+    "開発": "implementation",
+    "testing": "testing",
+    "phase_testing": "testing",
+    "テスト": "testing",
+}
+
+
+def normalize_phase(phase: str) -> Optional[str]:
+    return PHASE_ALIASES.get(phase.strip().lower())
+
+
+def phase_count(profile: EmployeeProfile, phase: str) -> int:
+    return getattr(profile, f"{PHASE_COLUMNS[phase]}_count") or 0
+
+
+def _filter_employees(query, column, employee_ids: Optional[Iterable[int]]):
+    if employee_ids is not None:
+        query = query.filter(column.in_(list(employee_ids)))
+    return query
+
+
+def _phase_covered(column):
+    return func.sum(case((and_(column.isnot(None), column != ""), 1), else_=0))
+
+
+def _free_date(
+    availability: Optional[tuple],
+    has_open_project: bool,
+    last_end_date: Optional[datetime]
+) -> Tuple[Optional[datetime], Optional[AvailabilityStatus]]:
+    """
+    (確定している空き開始日, 参照時点で日付が決まる稼働状況) を返す
+    """
+    if availability is not None:
+        status, available_from = availability
+        if available_from is not None:
+            return available_from, None
+        if status in DYNAMIC_FREE_STATUSES:
+            return None, status
+    if has_open_project:
+        return None, None
+    return last_end_date, None
+
+
+# 空き開始日が参照時点で決まる稼働状況
+DYNAMIC_FREE_STATUSES = (AvailabilityStatus.IMMEDIATELY_AVAILABLE, AvailabilityStatus.AVAILABLE_NEXT_MONTH)
+
+
+def status_free_date(status: AvailabilityStatus, now: datetime) -> datetime:
+    """
+    即稼働可能なら現在時刻、来月から可なら翌月1日
+    """
+    if status == AvailabilityStatus.IMMEDIATELY_AVAILABLE:
+        return now
+    _, next_month = month_range(now.year, now.month)
+    return next_month
+
+
+def free_date_at(profile: EmployeeProfile, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    空き開始日。即稼働可能・来月から可の社員は参照時点から決める
+    """
+    if profile.free_status is not None:
+        return status_free_date(profile.free_status, now or datetime.now())
+    return profile.earliest_free_date
+
+
+def tag_months_at(profile: EmployeeProfile, now: Optional[datetime] = None) -> Dict[str, float]:
+    """
+    技術タグ別の経験月数。継続中の案件は参照時点までの期間を加える
+    """
+    tag_months = dict(profile.tag_months or {})
+    if profile.open_tag_starts:
+        now = now or datetime.now()
+        for tag, starts in profile.open_tag_starts.items():
+            days = sum((now - datetime.fromisoformat(start)).total_seconds() / 86400 for start in starts)
+            tag_months[tag] = round(tag_months.get(tag, 0) + days / DAYS_PER_MONTH, 1)
+    return tag_months
+
+
+def compute_profiles(db: Session, employee_ids: Optional[Iterable[int]] = None) -> Dict[int, dict]:
+    """
+    社員ごとのプロファイル値を集計クエリで算出する（employee_ids 省略時は全社員）
+
+    社員ごとに案件を読み込まず、タグ別期間・工程数・稼働情報をそれぞれ1クエリで取得する。
+    現在時刻に依存する値（継続中の案件の期間、即稼働可能・来月から可の空き開始日）は保存せず、
+    元になる開始日・稼働状況を残して tag_months_at / free_date_at で参照時に求める。
+    """
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+
+    profiles = {
+        employee_id: {
+            "tag_months": {},
+            "open_tag_starts": {},
+            "phase_requirements_count": 0,
+            "phase_design_count": 0,
+            "phase_implementation_count": 0,
+            "phase_testing_count": 0,
+            "earliest_free_date": None,
+            "free_status": None,
+        }
+        for (employee_id,) in _filter_employees(db.query(Employee.id), Employee.id, employee_ids)
+    }
+    if not profiles:
+        return profiles
+
+    dialect_name = db.get_bind().dialect.name
+
+    # 終了済みの案件はタグ別の月数、継続中の案件はタグ別の開始日を保存する
+    tag_rows = _filter_employees(
+        db.query(
+            Project.employee_id,
+            project_tech_tags.c.tag,
+            func.sum(days_between(Project.start_date, Project.end_date, dialect_name)).label("days")
+        ).join(project_tech_tags, project_tech_tags.c.project_id == Project.id).filter(
+            Project.end_date.isnot(None)
+        ),
+        Project.employee_id,
+        employee_ids
+    ).group_by(Project.employee_id, project_tech_tags.c.tag).all()
+
+    open_rows = _filter_employees(
+        db.query(Project.employee_id, project_tech_tags.c.tag, Project.start_date).join(
+            project_tech_tags, project_tech_tags.c.project_id == Project.id
+        ).filter(Project.end_date.is_(None)),
+        Project.employee_id,
+        employee_ids
+    ).all()
+
+    # 技術タグはスキルの正式名に寄せて集計する（例: JS と JavaScript を合算）
+    catalog = get_skill_catalog(db)
+    for row in tag_rows:
+        tag = catalog.canonical_name(row.tag) or row.tag
+        tag_months = profiles[row.employee_id]["tag_months"]
+        months = float(row.days or 0) / DAYS_PER_MONTH
+        tag_months[tag] = round(tag_months.get(tag, 0) + months, 1)
+    for row in open_rows:
+        tag = catalog.canonical_name(row.tag) or row.tag
+        profiles[row.employee_id]["open_tag_starts"].setdefault(tag, []).append(row.start_date.isoformat())
+
+    project_rows = _filter_employees(
+        db.query(
+            Project.employee_id,
+            _phase_covered(Project.phase_requirements).label("phase_requirements_count"),
+            _phase_covered(Project.phase_design).label("phase_design_count"),
+            _phase_covered(Project.phase_implementation).label("phase_implementation_count"),
+            _phase_covered(Project.phase_testing).label("phase_testing_count"),
+            func.sum(case((Project.end_date.is_(None), 1), else_=0)).label("open_projects"),
+            func.max(Project.end_date).label("last_end_date")
+        ),
+        Project.employee_id,
+        employee_ids
+    ).group_by(Project.employee_id).all()
+    project_stats = {row.employee_id: row for row in project_rows}
+
+    availability_rows = _filter_employees(
+        db.query(Availability.employee_id, Availability.status, Availability.available_from),
+        Availability.employee_id,
+        employee_ids
+    ).all()
+    availabilities = {row.employee_id: (row.status, row.available_from) for row in availability_rows}
+
+    for employee_id, profile in profiles.items():
+        stats = project_stats.get(employee_id)
+        if stats is not None:
+            for column in PHASE_COLUMNS.values():
+                profile[f"{column}_count"] = int(getattr(stats, f"{column}_count") or 0)
+
+        profile["earliest_free_date"], profile["free_status"] = _free_date(
+            availabilities.get(employee_id),
+            bool(stats and stats.open_projects),
+            stats.last_end_date if stats else None
+        )
+
+    return profiles
+
+
+def refresh_employee_profiles(db: Session, employee_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    指定社員（省略時は全社員）のプロファイルを再計算して保存する（コミットは呼び出し側）
+    """
+    if employee_ids is not None:
+        employee_ids = list(employee_ids)
+
+    profiles = compute_profiles(db, employee_ids)
+    if not profiles:
+        return 0
+
+    existing = {
+        profile.employee_id: profile
+        for profile in _filter_employees(db.query(EmployeeProfile), EmployeeProfile.employee_id, employee_ids)
+    }
+
+    for employee_id, values in profiles.items():
+        profile = existing.get(employee_id)
+        if profile is None:
+            profile = EmployeeProfile(employee_id=employee_id)
+            db.add(profile)
+        for field, value in values.items():
+            setattr(profile, field, value)
+
+    return len(profiles)
+
+
+def refresh_employee_profile(db: Session, employee_id: int) -> None:
+    refresh_employee_profiles(db, [employee_id])
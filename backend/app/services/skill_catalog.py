@@ -0,0 +1,204 @@
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from ..models.employee import Skill, SkillAlias, SkillRelation
+from .skill_graph import SkillClosure, compute_skill_closure
+from ..utils.metrics import cache_stats
+
+logger = logging.getLogger(__name__)
+
+# 他ワーカーでの更新を取りこぼさないための再読み込み間隔（秒）
+SKILL_CATALOG_TTL = 60
+# 未知のスキルID・名前で読み直すとき、直前の読み込みからこれだけ経っていなければ読み直さない（秒）
+SKILL_CATALOG_MISS_RELOAD_INTERVAL = 1
+
+_cache_stats = cache_stats("skill_catalog")
+
+# 表記ゆれとして無視する区切り文字（空白・ドット・ハイフン・アンダースコア・中黒）
+_SEPARATORS = re.compile(r"[\s.\-_・]+")
+
+# 初期データとして登録する別名（正規化前の表記, スキル名）
+DEFAULT_SKILL_ALIASES = [
+    ("JS", "JavaScript"),
+    ("ECMAScript", "JavaScript"),
+    ("TS", "TypeScript"),
+    ("React.js", "React"),
+    ("Vue", "Vue.js"),
+    ("Node", "Node.js"),
+    ("Postgres", "PostgreSQL"),
+    ("psql", "PostgreSQL"),
+    ("Mongo", "MongoDB"),
+    ("Amazon Web Services", "AWS"),
+    ("k8s", "Kubernetes"),
+    ("Golang", "Go"),
+    ("py", "Python"),
+    ("CSharp", "C#"),
+]
+
+
+def normalize_skill_term(term: str) -> str:
+    """
+    全角・半角、大文字・小文字、区切り文字の違いを吸収した照合用キーを返す
+    """
+    return _SEPARATORS.sub("", unicodedata.normalize("NFKC", term).casefold())
+
+
+class SkillCatalog:
+    """
+    スキル表のスナップショット。読み込み後は変更しない
+    """
+
+    def __init__(
+        self,
+        skills: Iterable[Tuple[int, str, str]],
+        version: int,
+        aliases: Iterable[Tuple[str, int]] = (),
+        closure: Optional[SkillClosure] = None
+    ):
+        self.version = version
+        self.closure = closure or compute_skill_closure(())
+        self.loaded_at = time.monotonic()
+        self.ids_by_name: Dict[str, int] = {}
+        self.ids_by_key: Dict[str, int] = {}
+        self.skills_by_id: Dict[int, Tuple[str, str]] = {}
+        self.ids_by_category: Dict[str, List[int]] = {}
+        for skill_id, name, category in skills:
+            self.ids_by_name[name] = skill_id
+            self.skills_by_id[skill_id] = (name, category)
+            self.ids_by_category.setdefault(category, []).append(skill_id)
+
+        # 正式名が別名より優先されるよう、別名を先に登録する
+        for alias, skill_id in aliases:
+            if skill_id in self.skills_by_id:
+                self.ids_by_key[normalize_skill_term(alias)] = skill_id
+        for name, skill_id in self.ids_by_name.items():
+            self.ids_by_key[normalize_skill_term(name)] = skill_id
+
+    def id_for(self, name: str) -> Optional[int]:
+        """
+        スキル名・別名・表記ゆれを含む入力からスキルIDを返す
+        """
+        skill_id = self.ids_by_name.get(name)
+        if skill_id is None:
+            skill_id = self.ids_by_key.get(normalize_skill_term(name))
+        return skill_id
+
+    def canonical_name(self, term: str) -> Optional[str]:
+        skill_id = self.id_for(term)
+        return self.skills_by_id[skill_id][0] if skill_id is not None else None
+
+    def ids_for(self, names: Iterable[str]) -> List[int]:
+        return [skill_id for skill_id in (self.id_for(name) for name in names) if skill_id is not None]
+
+    def resolve(self, name: Optional[str] = None, skill_id: Optional[int] = None) -> Optional[int]:
+        """
+        スキルIDまたはスキル名から、存在するスキルIDを返す
+        """
+        if skill_id is not None:
+            return skill_id if skill_id in self.skills_by_id else None
+        if name is not None:
+            return self.id_for(name)
+        return None
+
+    def name_for(self, skill_id: int) -> Optional[str]:
+        skill = self.skills_by_id.get(skill_id)
+        return skill[0] if skill else None
+
+    def category_for(self, skill_id: int) -> Optional[str]:
+        skill = self.skills_by_id.get(skill_id)
+        return skill[1] if skill else None
+
+    def __contains__(self, skill_id: int) -> bool:
+        return skill_id in self.skills_by_id
+
+
+_catalog: Optional[SkillCatalog] = None
+_version = 0
+_lock = threading.Lock()
+
+
+def invalidate_skill_catalog() -> None:
+    """
+    スキル・別名・関係の追加・削除後に呼び出す。次回参照時に読み込み直す
+    """
+    global _version
+    with _lock:
+        _version += 1
+
+
+def load_skill_catalog(db: Session) -> SkillCatalog:
+    global _catalog
+    with _lock:
+        version = _version
+
+    # 関係グラフに変更がなければ前回の閉包を使い回す
+    edges = tuple(sorted(
+        tuple(row) for row in db.query(
+            SkillRelation.skill_id,
+            SkillRelation.related_skill_id,
+            SkillRelation.relation_type,
+            SkillRelation.weight
+        ).all()
+    ))
+    previous = _catalog
+    if previous is not None and previous.closure.edges == edges:
+        closure = previous.closure
+    else:
+        closure = compute_skill_closure(edges)
+
+    catalog = SkillCatalog(
+        db.query(Skill.id, Skill.name, Skill.category).all(),
+        version,
+        db.query(SkillAlias.alias, SkillAlias.skill_id).all(),
+        closure
+    )
+    with _lock:
+        # 読み込み中に無効化された場合は古い版として扱い、次回また読み込む
+        if catalog.version == _version:
+            _catalog = catalog
+    return catalog
+
+
+def get_skill_catalog(db: Session, skill_ids: Iterable[int] = (), names: Iterable[str] = ()) -> SkillCatalog:
+    """
+    キャッシュ済みのスキルカタログを返す
+
+    skill_ids・names にカタログにないものがあれば、他ワーカーで追加・変更されたばかりの
+    可能性があるため、未知として扱う前に1度だけ読み直す。存在しない名前での検索が続いても
+    毎回読み直さないよう、直前の読み込みから SKILL_CATALOG_MISS_RELOAD_INTERVAL 秒は読み直さない。
+    """
+    catalog = _catalog
+    if (
+        catalog is None
+        or catalog.version != _version
+        or time.monotonic() - catalog.loaded_at > SKILL_CATALOG_TTL
+        or (
+            time.monotonic() - catalog.loaded_at > SKILL_CATALOG_MISS_RELOAD_INTERVAL
+            and (
+                any(skill_id not in catalog for skill_id in skill_ids)
+                or any(catalog.id_for(name) is None for name in names)
+            )
+        )
+    ):
+        _cache_stats.miss()
+        catalog = load_skill_catalog(db)
+    else:
+        _cache_stats.hit()
+    return catalog
+
+
+def warm_skill_catalog(session_factory) -> None:
+    """
+    起動時にスキル表を読み込む。DBに接続できない場合は初回参照時に読み込む
+    """
+    db = session_factory()
+    try:
+        load_skill_catalog(db)
+    except Exception as e:
+        logger.warning("Skill catalog warm-up failed: %s", e)
+    finally:
+        db.close()
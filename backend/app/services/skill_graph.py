@@ -0,0 +1,100 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.employee import SkillRelationType
+
+# これより小さい重みの経路は関連なしとして扱う
+MIN_RELATION_WEIGHT = 0.2
+
+# デモデータ・初期データとして登録する関係（スキル, 関連スキル, 種別, 重み）
+DEFAULT_SKILL_RELATIONS = [
+    ("TypeScript", "JavaScript", SkillRelationType.IMPLIES, 1.0),
+    ("React", "JavaScript", SkillRelationType.IMPLIES, 0.8),
+    ("Vue.js", "JavaScript", SkillRelationType.IMPLIES, 0.8),
+    ("Vue.js", "React", SkillRelationType.RELATED, 0.5),
+    ("Angular", "React", SkillRelationType.RELATED, 0.4),
+    ("Angular", "TypeScript", SkillRelationType.IMPLIES, 0.8),
+    ("Node.js", "JavaScript", SkillRelationType.IMPLIES, 0.9),
+    ("MySQL", "PostgreSQL", SkillRelationType.RELATED, 0.6),
+    ("Terraform", "AWS", SkillRelationType.IMPLIES, 0.3),
+    ("Kubernetes", "Docker", SkillRelationType.IMPLIES, 0.8),
+]
+
+Edge = Tuple[int, int, SkillRelationType, float]
+
+
+class SkillClosure:
+    """
+    スキル関係の推移閉包。経路上の重みの積が最大のものを採用する
+
+    関連スキルごとに「どのスキルの保有者がどれだけ評価されるか」を保持し、
+    マッチング時はグラフをたどらずに参照だけで部分点を求める。
+    """
+
+    def __init__(self, columns: Dict[int, Dict[int, float]], edges: Tuple[Edge, ...]):
+        self.columns = columns
+        self.edges = edges
+
+    def column(self, target_id: int) -> Dict[int, float]:
+        """
+        target_id に対して部分点を与えるスキルID → 重み
+        """
+        return self.columns.get(target_id, {})
+
+    def best(self, target_id: int, skill_ids) -> Tuple[float, Optional[int]]:
+        """
+        保有スキルのうち target_id に最も近いものの重みとスキルIDを返す
+        """
+        column = self.columns.get(target_id)
+        if not column:
+            return 0.0, None
+
+        weight, source_id = 0.0, None
+        # 件数の少ない側を走査する
+        if len(column) < len(skill_ids):
+            for candidate_id, candidate_weight in column.items():
+                if candidate_weight > weight and candidate_id in skill_ids:
+                    weight, source_id = candidate_weight, candidate_id
+        else:
+            for candidate_id in skill_ids:
+                candidate_weight = column.get(candidate_id, 0.0)
+                if candidate_weight > weight:
+                    weight, source_id = candidate_weight, candidate_id
+        return weight, source_id
+
+
+def _adjacency(edges: Iterable[Edge]) -> Dict[int, List[Tuple[int, float]]]:
+    adjacency: Dict[int, List[Tuple[int, float]]] = {}
+    for skill_id, related_skill_id, relation_type, weight in edges:
+        adjacency.setdefault(skill_id, []).append((related_skill_id, weight))
+        if relation_type == SkillRelationType.RELATED:
+            adjacency.setdefault(related_skill_id, []).append((skill_id, weight))
+    return adjacency
+
+
+def compute_skill_closure(edges: Iterable[Edge]) -> SkillClosure:
+    """
+    各スキルから重みの積が最大となる経路を求め、関連スキル側から引ける形で保持する
+    """
+    edges = tuple(sorted(edges, key=lambda edge: (edge[0], edge[1])))
+    adjacency = _adjacency(edges)
+
+    columns: Dict[int, Dict[int, float]] = {}
+    for source_id in adjacency:
+        best: Dict[int, float] = {source_id: 1.0}
+        heap = [(-1.0, source_id)]
+        while heap:
+            negative_weight, skill_id = heapq.heappop(heap)
+            weight = -negative_weight
+            if weight < best.get(skill_id, 0.0):
+                continue
+            for related_skill_id, edge_weight in adjacency.get(skill_id, ()):
+                path_weight = weight * edge_weight
+                if path_weight >= MIN_RELATION_WEIGHT and path_weight > best.get(related_skill_id, 0.0):
+                    best[related_skill_id] = path_weight
+                    heapq.heappush(heap, (-path_weight, related_skill_id))
+
+        for target_id, weight in best.items():
+            if target_id != source_id:
+                columns.setdefault(target_id, {})[source_id] = round(weight, 4)
+
+    return SkillClosure(columns, edges)
@@ -0,0 +1,98 @@
+from typing import Iterable, List, Optional
+from sqlalchemy.orm import Session
+from ..models.employee import Project, project_tech_tags
+from .skill_catalog import SkillCatalog, get_skill_catalog, normalize_skill_term
+
+MAX_TAG_LENGTH = 50
+
+
+def canonical_tech_tag(catalog: SkillCatalog, tag: str) -> str:
+    """
+    技術タグをスキルの正式名に寄せる（例: k8s → Kubernetes）。該当スキルがなければ入力のまま
+    """
+    tag = tag.strip()[:MAX_TAG_LENGTH]
+    return catalog.canonical_name(tag) or tag
+
+
+def parse_tech_tags(tech_tags: Optional[str], catalog: SkillCatalog) -> List[str]:
+    """
+    カンマ区切りの技術タグ文字列を、正式名に寄せて表記ゆれの重複を除いたタグのリストに変換する
+    """
+    if not tech_tags:
+        return []
+
+    tags = []
+    seen = set()
+    for raw_tag in tech_tags.split(','):
+        tag = canonical_tech_tag(catalog, raw_tag)
+        key = normalize_skill_term(tag)
+        if key and key not in seen:
+            seen.add(key)
+            tags.append(tag)
+    return tags
+
+
+def sync_project_tech_tags(db: Session, project: Project) -> None:
+    """
+    Project.tech_tags の内容で project_tech_tags を置き換える（コミットは呼び出し側）
+    """
+    db.execute(
+        project_tech_tags.delete().where(project_tech_tags.c.project_id == project.id)
+    )
+    tags = parse_tech_tags(project.tech_tags, get_skill_catalog(db))
+    if tags:
+        db.execute(
+            project_tech_tags.insert(),
+            [{"project_id": project.id, "tag": tag} for tag in tags]
+        )
+
+
+def delete_project_tech_tags(db: Session, project_ids: List[int]) -> None:
+    if project_ids:
+        db.execute(
+            project_tech_tags.delete().where(project_tech_tags.c.project_id.in_(project_ids))
+        )
+
+
+def resync_project_tech_tags(db: Session) -> int:
+    """
+    スキル・別名の追加で正式名が変わったタグを持つ案件のタグを作り直す（コミットは呼び出し側）
+
+    タグの種類はスキル数程度なので、(tag, project_id) インデックスから一覧を取り、Python 側で判定する。
+    """
+    catalog = get_skill_catalog(db)
+    tags = [tag for (tag,) in db.query(project_tech_tags.c.tag).distinct()]
+    stale = [tag for tag in tags if canonical_tech_tag(catalog, tag) != tag]
+    if not stale:
+        return 0
+
+    project_ids = [
+        project_id for (project_id,) in
+        db.query(project_tech_tags.c.project_id).filter(project_tech_tags.c.tag.in_(stale)).distinct()
+    ]
+    rebuild_project_tech_tags(db, project_ids)
+    return len(project_ids)
+
+
+def rebuild_project_tech_tags(db: Session, project_ids: Optional[Iterable[int]] = None) -> None:
+    """
+    projects.tech_tags から project_tech_tags を作り直す。project_ids 省略時は全案件（コミットは呼び出し側）
+    """
+    catalog = get_skill_catalog(db)
+    query = db.query(Project.id, Project.tech_tags)
+    delete = project_tech_tags.delete()
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        query = query.filter(Project.id.in_(project_ids))
+        delete = delete.where(project_tech_tags.c.project_id.in_(project_ids))
+
+    db.execute(delete)
+    rows = [
+        {"project_id": project_id, "tag": tag}
+        for project_id, tech_tags in query
+        for tag in parse_tech_tags(tech_tags, catalog)
+    ]
+    if rows:
+        db.execute(project_tech_tags.insert(), rows)
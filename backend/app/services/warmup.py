@@ -0,0 +1,208 @@
+"""
+起動時のウォームアップと readiness
+
+デプロイ直後の最初のリクエストが接続確立・SQLのコンパイル・スキルカタログの読み込みを
+負担しないよう、起動時にバックグラウンドで済ませておく。完了するまで /ready は 503 を返し、
+ロードバランサーはウォームアップ済みのワーカーにだけ振り分ける。
+
+アプリ内のキャッシュはスキルカタログのみで、参照系APIのクエリは結果を保持しない。
+各クエリは代表的な条件で一度ずつ実行し、コンパイル済みSQLキャッシュとDB側のバッファを温めるだけである。
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from ..db import database
+from ..db.database import ReadSession, open_read_session
+from ..models.employee import Employee
+from ..db.pool import DB_POOL_SIZE
+from . import dashboard_queries, employee_queries, one_on_one_queries
+from .skill_catalog import get_skill_catalog, warm_skill_catalog
+
+logger = logging.getLogger(__name__)
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+# これを超えたら途中でも ready にする（DB の不調でワーカーが永久に外れないように）
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "60"))
+# エンジンごとに事前に開いておく接続数。既定はプールの常駐数
+WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", str(DB_POOL_SIZE)))
+
+# (名前, ReadSession を受け取るコルーチン関数)。ルーターと同じく run / run_in_thread で実行する
+WarmupQuery = Tuple[str, Callable[[ReadSession], Awaitable]]
+
+
+def _first_employee_id(db) -> Optional[int]:
+    first = db.query(Employee.id).order_by(Employee.id).first()
+    return first[0] if first is not None else None
+
+
+def _search_skill_tags(db) -> Optional[str]:
+    names = [name for name, _ in list(get_skill_catalog(db).skills_by_id.values())[:2]]
+    return ",".join(names) or None
+
+
+async def _warm_employees(db: ReadSession) -> None:
+    await db.run_in_thread(employee_queries.list_employees, 0, 100)
+
+
+async def _warm_search(db: ReadSession) -> None:
+    skill_tags = await db.run(_search_skill_tags)
+    await db.run_in_thread(employee_queries.search_employees, skill_tags, None, None, None, None, None)
+
+
+async def _warm_employee_detail(db: ReadSession) -> None:
+    employee_id = await db.run(_first_employee_id)
+    if employee_id is not None:
+        await db.run(employee_queries.get_employee_detail, employee_id)
+
+
+async def _warm_matching(db: ReadSession) -> None:
+    # スコア計算は Python 側なので、候補とプロジェクト履歴の読み込みだけを行う
+    candidates, _, _ = await db.run_in_thread(employee_queries.load_matching_candidates)
+    await db.run(employee_queries.recent_project_titles, [emp.id for emp in candidates[:10]])
+
+
+async def _warm_dashboard_stats(db: ReadSession) -> None:
+    await db.run(dashboard_queries.dashboard_stats)
+
+
+async def _warm_availability_status(db: ReadSession) -> None:
+    await db.run(dashboard_queries.availability_status_counts)
+
+
+async def _warm_missing_one_on_ones(db: ReadSession) -> None:
+    await db.run(one_on_one_queries.missing_one_on_ones, 0, 100, None, None, None, None, "asc")
+
+
+# 起動時に一度ずつ実行しておく参照系APIのクエリ（利用頻度の高いもの）
+WARMUP_QUERIES: List[WarmupQuery] = [
+    ("employees", _warm_employees),
+    ("search", _warm_search),
+    ("employee_detail", _warm_employee_detail),
+    ("matching", _warm_matching),
+    ("dashboard_stats", _warm_dashboard_stats),
+    ("availability_status", _warm_availability_status),
+    ("missing_one_on_ones", _warm_missing_one_on_ones),
+]
+
+
+class Readiness:
+    """
+    このワーカーがリクエストを受けられる状態か
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # ステップ名 → 所要ミリ秒、または失敗時のエラー
+        self.steps: Dict[str, object] = {}
+
+    def snapshot(self) -> Dict:
+        if self.draining:
+            status = "draining"
+        elif self.ready:
+            status = "ready"
+        else:
+            status = "warming_up" if self.started_at else "starting"
+        result = {"status": status, "steps": dict(self.steps)}
+        if self.started_at is not None:
+            end = self.finished_at or time.monotonic()
+            result["warmup_ms"] = round((end - self.started_at) * 1000, 1)
+        return result
+
+    def drain(self) -> None:
+        # 停止処理に入ったら新しいリクエストを振り分けさせない
+        self.draining = True
+        self.ready = False
+
+
+readiness = Readiness()
+
+
+def _distinct(*items) -> List:
+    # レプリカ未設定時はプライマリと同じオブジェクトなので一度だけ扱う
+    result = []
+    for item in items:
+        if item is not None and all(item is not other for other in result):
+            result.append(item)
+    return result
+
+
+def open_connections(engine, count: int) -> int:
+    # 同時に開いてから返すことで、プールに count 本の接続が残る
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+async def open_async_connections(engine, count: int) -> int:
+    connections = []
+    try:
+        for _ in range(count):
+            connection = await engine.connect()
+            connections.append(connection)
+            await connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in connections:
+            await connection.close()
+    return len(connections)
+
+
+async def _run_query(sync_session_factory, query: Callable[[ReadSession], Awaitable]) -> None:
+    async with open_read_session(sync_session_factory) as db:
+        await query(db)
+
+
+async def _step(name: str, coro) -> None:
+    started = time.monotonic()
+    try:
+        await coro
+        readiness.steps[name] = round((time.monotonic() - started) * 1000, 1)
+    except Exception as e:
+        readiness.steps[name] = f"failed: {e}"
+        logger.warning("Warm-up step %s failed: %s", name, e)
+
+
+async def _warm_up(queries: List[WarmupQuery]) -> None:
+    if WARMUP_CONNECTIONS > 0:
+        for i, engine in enumerate(_distinct(database.engine, database.replica_engine)):
+            step = "connections" if i == 0 else "connections_replica"
+            await _step(step, run_in_threadpool(open_connections, engine, WARMUP_CONNECTIONS))
+        for i, engine in enumerate(_distinct(database.async_engine, database.async_replica_engine)):
+            step = "connections_async" if i == 0 else "connections_async_replica"
+            await _step(step, open_async_connections(engine, WARMUP_CONNECTIONS))
+
+    await _step("skill_catalog", run_in_threadpool(warm_skill_catalog, database.SessionLocal))
+
+    # 参照系APIと同じ ReadSession の経路（同期/非同期・プライマリ/レプリカ）でクエリを一度ずつ実行し、
+    # エンジンごとのコンパイル済みSQLキャッシュとDB側のバッファを温める
+    for i, factory in enumerate(_distinct(database.SessionLocal, database.ReplicaSessionLocal)):
+        for name, query in queries:
+            step = f"query_{name}" if i == 0 else f"query_{name}_replica"
+            await _step(step, _run_query(factory, query))
+
+
+async def warm_up(queries: Optional[List[WarmupQuery]] = None) -> None:
+    """
+    ウォームアップを実行し、成否にかかわらず最後に ready にする
+    """
+    readiness.started_at = time.monotonic()
+    try:
+        if WARMUP_ENABLED:
+            await asyncio.wait_for(_warm_up(WARMUP_QUERIES if queries is None else queries), WARMUP_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        logger.warning("Warm-up did not finish within %.0f s; marking ready", WARMUP_TIMEOUT_SECONDS)
+    readiness.finished_at = time.monotonic()
+    readiness.ready = True
+    logger.info("Warm-up finished in %.1f ms", (readiness.finished_at - readiness.started_at) * 1000)
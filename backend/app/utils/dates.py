@@ -0,0 +1,74 @@
+from datetime import datetime, date
+from typing import Optional, Tuple
+from sqlalchemy import func
+
+
+def month_range(year: int, month: int) -> Tuple[datetime, datetime]:
+    """
+    指定年月の半開区間 [月初, 翌月初) を返す
+    """
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return start, end
+
+
+def year_range(year: int) -> Tuple[datetime, datetime]:
+    """
+    指定年の半開区間 [年初, 翌年初) を返す
+    """
+    return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+
+
+def to_datetime(value: Optional[date]) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime(value.year, value.month, value.day)
+
+
+def current_month_range() -> Tuple[datetime, datetime]:
+    today = date.today()
+    return month_range(today.year, today.month)
+
+
+def resolve_date_range(
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    year/month または from/to 指定を半開区間 [start, end) に変換する
+
+    from/to が指定された場合はそちらを優先する（to は含まない）。
+    month のみ指定された場合は当年として扱う。
+    """
+    if date_from or date_to:
+        return to_datetime(date_from), to_datetime(date_to)
+    if month:
+        return month_range(year or date.today().year, month)
+    if year:
+        return year_range(year)
+    return None, None
+
+
+def apply_date_range(query, column, start: Optional[datetime], end: Optional[datetime]):
+    """
+    インデックスが効くよう、列を加工せず範囲条件で絞り込む
+    """
+    if start is not None:
+        query = query.filter(column >= start)
+    if end is not None:
+        query = query.filter(column < end)
+    return query
+
+
+def days_between(start, end, dialect_name: str):
+    """
+    2つの日時列の差を日数で返すSQL式（PostgreSQL 以外は SQLite の julianday を使う）
+    """
+    if dialect_name == "postgresql":
+        return func.extract('epoch', end - start) / 86400
+    return func.julianday(end) - func.julianday(start)
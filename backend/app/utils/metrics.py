@@ -0,0 +1,341 @@
+"""
+Prometheus 形式のメトリクス
+
+リクエスト単位の集計はミドルウェア（イベントループのスレッド）からのみ更新するため、
+ロックを取らずに dict へ加算する。スレッドプールから更新されるキャッシュのヒット数も
+ロックなしの int 加算で、競合時にまれに取りこぼすことがある（比率を見る用途には十分）。
+
+複数ワーカーで動かす場合は METRICS_MULTIPROC_DIR を指定すると、各ワーカーが定期的に
+自プロセスの値をファイルへ書き出し、/metrics はそれらを合算して返す。ファイル名は
+プロセスごとに一意で、一定時間更新されていないファイルは終了したワーカーのものとみなし、
+起動時に削除する。
+"""
+import asyncio
+import bisect
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR") or None
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+
+
+class CacheStats:
+    # 複数スレッドから同時に加算すると取りこぼすことがあるが、ロックは取らない
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        self.hits += 1
+
+    def miss(self) -> None:
+        self.misses += 1
+
+
+_caches: Dict[str, CacheStats] = {}
+
+
+def cache_stats(name: str) -> CacheStats:
+    """
+    キャッシュごとのヒット・ミス数。モジュール読み込み時に取得しておく
+    """
+    if name not in _caches:
+        _caches[name] = CacheStats()
+    return _caches[name]
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def dump(self) -> List:
+        return [self.counts, self.sum, self.count]
+
+
+class RequestMetrics:
+    """
+    ルート別のリクエスト数・レイテンシ・レスポンスサイズ・処理中件数
+    """
+
+    def __init__(self):
+        self.requests: Dict[str, int] = {}
+        self.latency: Dict[str, _Histogram] = {}
+        self.sizes: Dict[str, _Histogram] = {}
+        self.in_flight = 0
+
+    def start(self) -> float:
+        self.in_flight += 1
+        return time.perf_counter()
+
+    def finish(self, method: str, route: str, status: int, started: float, size: Optional[int]) -> None:
+        self.in_flight -= 1
+        key = f"{method}|{route}"
+        status_key = f"{key}|{status}"
+        self.requests[status_key] = self.requests.get(status_key, 0) + 1
+
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = _Histogram(LATENCY_BUCKETS)
+        histogram.observe(time.perf_counter() - started)
+
+        if size is not None:
+            histogram = self.sizes.get(key)
+            if histogram is None:
+                histogram = self.sizes[key] = _Histogram(SIZE_BUCKETS)
+            histogram.observe(size)
+
+
+request_metrics = RequestMetrics()
+
+# /metrics に載せるDB接続プールの取得関数（名前 → 統計 dict を返す関数）
+_pool_sources: Dict[str, callable] = {}
+
+
+def register_pool(name: str, stats_fn) -> None:
+    _pool_sources[name] = stats_fn
+
+
+def snapshot() -> Dict:
+    """
+    このプロセスの現在値
+    """
+    pools = {}
+    for name, stats_fn in _pool_sources.items():
+        try:
+            pools[name] = stats_fn()
+        except Exception as e:
+            logger.debug("pool stats for %s failed: %s", name, e)
+
+    return {
+        "pid": os.getpid(),
+        "instance": _instance_id(),
+        "requests": dict(request_metrics.requests),
+        "latency": {key: h.dump() for key, h in list(request_metrics.latency.items())},
+        "sizes": {key: h.dump() for key, h in list(request_metrics.sizes.items())},
+        "in_flight": request_metrics.in_flight,
+        "pools": pools,
+        "caches": {name: [c.hits, c.misses] for name, c in _caches.items()},
+    }
+
+
+# 更新がこの秒数を超えて止まっているファイルは、終了したワーカーのものとみなす
+SNAPSHOT_STALE_SECONDS = max(METRICS_FLUSH_SECONDS * 3, 30.0)
+
+_instance = None
+
+
+def _instance_id() -> str:
+    """
+    プロセスごとに一意な ID。pid は再利用されるうえコンテナ間で重なるため、
+    fork 後の子プロセスでも作り直されるよう pid と組で持つ
+    """
+    global _instance
+    pid = os.getpid()
+    if _instance is None or _instance[0] != pid:
+        _instance = (pid, f"{pid}_{uuid.uuid4().hex[:12]}")
+    return _instance[1]
+
+
+def _snapshot_path() -> str:
+    return os.path.join(METRICS_MULTIPROC_DIR, f"metrics_{_instance_id()}.json")
+
+
+def _snapshot_files():
+    for name in os.listdir(METRICS_MULTIPROC_DIR):
+        if name.startswith("metrics_") and name.endswith(".json"):
+            yield os.path.join(METRICS_MULTIPROC_DIR, name)
+
+
+def _is_stale(path: str) -> bool:
+    try:
+        return time.time() - os.path.getmtime(path) > SNAPSHOT_STALE_SECONDS
+    except OSError:
+        return True
+
+
+def remove_stale_snapshots() -> None:
+    """
+    終了したワーカーのスナップショットを削除する（起動時に呼ぶ）
+    """
+    if not METRICS_MULTIPROC_DIR or not os.path.isdir(METRICS_MULTIPROC_DIR):
+        return
+    for path in _snapshot_files():
+        if _is_stale(path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.debug("removing stale metrics snapshot %s failed: %s", path, e)
+
+
+def write_snapshot() -> None:
+    if not METRICS_MULTIPROC_DIR:
+        return
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    path = _snapshot_path()
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(snapshot(), f)
+    os.replace(tmp_path, path)
+
+
+def _collect_snapshots() -> List[Dict]:
+    own = snapshot()
+    if not METRICS_MULTIPROC_DIR or not os.path.isdir(METRICS_MULTIPROC_DIR):
+        return [own]
+
+    snapshots = [own]
+    for path in _snapshot_files():
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if data.get("instance") == own["instance"]:
+            continue
+        # 終了したワーカーの累計値は次の起動まで残し、現在値（処理中件数・プール）は除く
+        if _is_stale(path):
+            data["in_flight"] = 0
+            data["pools"] = {}
+        snapshots.append(data)
+    return snapshots
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _merge_histograms(snapshots, field: str, bucket_count: int) -> Dict[str, List]:
+    merged: Dict[str, List] = {}
+    for data in snapshots:
+        for key, (counts, total, count) in data.get(field, {}).items():
+            target = merged.setdefault(key, [[0] * bucket_count, 0.0, 0])
+            for i, value in enumerate(counts):
+                target[0][i] += value
+            target[1] += total
+            target[2] += count
+    return merged
+
+
+def _render_histogram(lines: List[str], name: str, buckets, merged: Dict[str, List]) -> None:
+    for key, (counts, total, count) in sorted(merged.items()):
+        method, route = key.split("|", 1)
+        cumulative = 0
+        for bound, value in zip(buckets, counts):
+            cumulative += value
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=bound)} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(method=method, route=route, le='+Inf')} {count}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {total}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {count}")
+
+
+# プール統計のうち、累計値（counter）として出すもの
+_POOL_COUNTERS = ("checkouts", "waits", "timeouts", "invalidations", "connects", "checkout_seconds_sum")
+_POOL_GAUGES = ("size", "checked_in", "checked_out", "overflow")
+
+
+def render_metrics() -> str:
+    """
+    全ワーカー分を合算した Prometheus テキスト形式
+    """
+    snapshots = _collect_snapshots()
+    lines: List[str] = []
+
+    requests: Dict[str, int] = {}
+    for data in snapshots:
+        for key, count in data.get("requests", {}).items():
+            requests[key] = requests.get(key, 0) + count
+    lines.append("# HELP http_requests_total Total HTTP requests by route and status.")
+    lines.append("# TYPE http_requests_total counter")
+    for key, count in sorted(requests.items()):
+        method, route, status = key.split("|")
+        lines.append(f"http_requests_total{_labels(method=method, route=route, status=status)} {count}")
+
+    lines.append("# HELP http_request_duration_seconds HTTP request latency by route.")
+    lines.append("# TYPE http_request_duration_seconds histogram")
+    _render_histogram(lines, "http_request_duration_seconds", LATENCY_BUCKETS,
+                      _merge_histograms(snapshots, "latency", len(LATENCY_BUCKETS)))
+
+    lines.append("# HELP http_response_size_bytes HTTP response size by route.")
+    lines.append("# TYPE http_response_size_bytes histogram")
+    _render_histogram(lines, "http_response_size_bytes", SIZE_BUCKETS,
+                      _merge_histograms(snapshots, "sizes", len(SIZE_BUCKETS)))
+
+    lines.append("# HELP http_requests_in_flight HTTP requests currently being processed.")
+    lines.append("# TYPE http_requests_in_flight gauge")
+    lines.append(f"http_requests_in_flight {sum(data.get('in_flight', 0) for data in snapshots)}")
+
+    pools: Dict[str, Dict[str, float]] = {}
+    for data in snapshots:
+        for name, stats in data.get("pools", {}).items():
+            target = pools.setdefault(name, {})
+            for field in _POOL_COUNTERS + _POOL_GAUGES:
+                if field in stats:
+                    target[field] = target.get(field, 0) + stats[field]
+    for field in _POOL_COUNTERS:
+        metric = f"db_pool_{field}_total" if field != "checkout_seconds_sum" else "db_pool_checkout_seconds_total"
+        lines.append(f"# TYPE {metric} counter")
+        for name, stats in sorted(pools.items()):
+            if field in stats:
+                lines.append(f"{metric}{_labels(engine=name)} {stats[field]}")
+    for field in _POOL_GAUGES:
+        metric = f"db_pool_{field}"
+        lines.append(f"# TYPE {metric} gauge")
+        for name, stats in sorted(pools.items()):
+            if field in stats:
+                lines.append(f"{metric}{_labels(engine=name)} {stats[field]}")
+
+    caches: Dict[str, List[int]] = {}
+    for data in snapshots:
+        for name, (hits, misses) in data.get("caches", {}).items():
+            target = caches.setdefault(name, [0, 0])
+            target[0] += hits
+            target[1] += misses
+    lines.append("# TYPE cache_hits_total counter")
+    for name, (hits, _) in sorted(caches.items()):
+        lines.append(f"cache_hits_total{_labels(cache=name)} {hits}")
+    lines.append("# TYPE cache_misses_total counter")
+    for name, (_, misses) in sorted(caches.items()):
+        lines.append(f"cache_misses_total{_labels(cache=name)} {misses}")
+    lines.append("# TYPE cache_hit_ratio gauge")
+    for name, (hits, misses) in sorted(caches.items()):
+        ratio = hits / (hits + misses) if hits + misses else 0.0
+        lines.append(f"cache_hit_ratio{_labels(cache=name)} {ratio:.4f}")
+
+    return "\n".join(lines) + "\n"
+
+
+async def flush_periodically() -> None:
+    """
+    複数ワーカー構成で、自プロセスの値を定期的にファイルへ書き出す
+    """
+    while True:
+        await asyncio.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            write_snapshot()
+        except OSError as e:
+            logger.warning("Metrics snapshot write failed: %s", e)
@@ -0,0 +1,283 @@
+"""
+管理者向けのリクエスト単位プロファイリング
+
+X-Profile: 1 ヘッダー（または ?_profile=1）を付けた管理者のリクエストだけを、
+サンプリングプロファイラーとSQL計測の下で実行する。結果は flamegraph.pl / speedscope で
+読める folded 形式のスタックと、SQL のタイムラインとして保存する。
+フラグのないリクエストはヘッダーを1回見るだけでそのまま通す。
+"""
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import Context, ContextVar
+from typing import Callable, Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from ..db.instrumentation import begin_request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = b"_profile=1"
+PROFILE_DIR = os.getenv("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "ses-profiles")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.001"))
+# 保存しておくプロファイル数
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+# 待機中のスレッド（イベントループの select やスレッドプールの待ち）はサンプルに含めない
+_IDLE_MODULES = ("selectors", "threading", "queue", "asyncio.base_events", "concurrent.futures.thread")
+
+
+# プロファイリング中のリクエストの目印。リクエストから作られたタスクやスレッドプールの処理に引き継がれる
+_profiled_request: ContextVar[Optional[object]] = ContextVar("profiled_request", default=None)
+
+
+def _context_run_codes() -> Dict:
+    """
+    コンテキストを指定して処理を呼び出すフレームと、そのコンテキストを取り出す関数
+    """
+    codes = {
+        # イベントループのコールバック（タスクの1ステップを含む）は Handle._run から呼ばれる
+        asyncio.events.Handle._run.__code__: lambda f_locals: getattr(f_locals.get("self"), "_context", None),
+    }
+    try:
+        from anyio._backends._asyncio import WorkerThread
+    except ImportError:
+        pass
+    else:
+        # run_in_threadpool の処理は anyio のワーカースレッドで context.run(func) として実行される
+        codes[WorkerThread.run.__code__] = lambda f_locals: f_locals.get("context")
+    return codes
+
+
+_CONTEXT_RUN_CODES = _context_run_codes()
+
+
+def _running_context(frame) -> Optional[Context]:
+    while frame is not None:
+        context_of = _CONTEXT_RUN_CODES.get(frame.f_code)
+        if context_of is not None:
+            return context_of(frame.f_locals)
+        frame = frame.f_back
+    return None
+
+
+class SamplingProfiler:
+    """
+    別スレッドから一定間隔で、対象リクエストの処理を実行中のスレッドのスタックを採取する
+
+    スレッドが実行中のコンテキストに marker が設定されていれば対象とする（イベントループの
+    タスク、スレッドプールの処理）。Handle._run が Python で書かれていない uvloop では、
+    イベントループのスレッドは task の実行中だけを対象とする。それ以外のスレッド（他の
+    リクエスト、メトリクスの書き出し、ウォームアップ）のサンプルは捨てる。
+    """
+
+    def __init__(self, marker: object, loop: asyncio.AbstractEventLoop, task: Optional[asyncio.Task],
+                 interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.marker = marker
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.task = task
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample_count += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or not self._is_target(thread_id, frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                    frame = frame.f_back
+                if not stack or stack[0].split(":", 1)[0] in _IDLE_MODULES:
+                    continue
+                self.samples[";".join(reversed(stack))] += 1
+
+    def _is_target(self, thread_id: int, frame) -> bool:
+        context = _running_context(frame)
+        if context is not None:
+            return context.get(_profiled_request) is self.marker
+        return (
+            thread_id == self.loop_thread_id
+            and self.task is not None
+            and asyncio.current_task(self.loop) is self.task
+        )
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+def _profile_path(profile_id: str, suffix: str) -> str:
+    return os.path.join(PROFILE_DIR, f"{profile_id}{suffix}")
+
+
+def _prune_profiles() -> None:
+    summaries = sorted(
+        (name for name in os.listdir(PROFILE_DIR) if name.endswith(".json")),
+        reverse=True
+    )
+    for name in summaries[PROFILE_KEEP:]:
+        profile_id = name[:-len(".json")]
+        for suffix in (".json", ".folded"):
+            try:
+                os.remove(_profile_path(profile_id, suffix))
+            except FileNotFoundError:
+                pass
+
+
+def save_profile(profile_id: str, summary: Dict, folded: str) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(_profile_path(profile_id, ".folded"), "w") as f:
+        f.write(folded)
+    with open(_profile_path(profile_id, ".json"), "w") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    _prune_profiles()
+
+
+def list_profiles() -> List[Dict]:
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(PROFILE_DIR), reverse=True):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(PROFILE_DIR, name)) as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        summary.pop("sql", None)
+        profiles.append(summary)
+    return profiles
+
+
+def _valid_profile_id(profile_id: str) -> bool:
+    return profile_id.replace("-", "").isalnum()
+
+
+def load_profile(profile_id: str) -> Optional[Dict]:
+    if not _valid_profile_id(profile_id):
+        return None
+    try:
+        with open(_profile_path(profile_id, ".json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_folded(profile_id: str) -> Optional[str]:
+    if not _valid_profile_id(profile_id):
+        return None
+    try:
+        with open(_profile_path(profile_id, ".folded")) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _profiling_requested(scope) -> bool:
+    if PROFILE_QUERY in scope.get("query_string", b""):
+        return True
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return value in (b"1", b"true")
+    return False
+
+
+def _bearer_token(scope) -> Optional[str]:
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return token
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    プロファイリングを指定した管理者のリクエストだけを計測する ASGI ミドルウェア
+
+    authorize はトークンを受け取り、管理者なら True を返す関数（同期処理、DBを使ってよい）。
+    """
+
+    def __init__(self, app, authorize: Callable[[str], bool]):
+        self.app = app
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = _bearer_token(scope)
+        if token is None or not await run_in_threadpool(self.authorize, token):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = time.strftime("%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:8]
+        stats = begin_request()
+        status_code = None
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        marker = object()
+        marker_token = _profiled_request.set(marker)
+        profiler = SamplingProfiler(marker, asyncio.get_running_loop(), asyncio.current_task())
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _profiled_request.reset(marker_token)
+            # サンプラースレッドの終了待ちでイベントループを止めない
+            await run_in_threadpool(profiler.stop)
+            elapsed = stats.elapsed_seconds()
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query_string": scope.get("query_string", b"").decode("latin-1"),
+                "status": status_code,
+                "duration_ms": round(elapsed * 1000, 2),
+                "samples": profiler.sample_count,
+                "sample_interval_ms": PROFILE_SAMPLE_INTERVAL * 1000,
+                "query_count": stats.count,
+                "db_ms": round(stats.db_seconds * 1000, 2),
+                "sql": [
+                    {
+                        "start_ms": round(offset * 1000, 3),
+                        "duration_ms": round(seconds * 1000, 3),
+                        "statement": statement
+                    }
+                    for statement, seconds, offset in stats.queries
+                ],
+            }
+            try:
+                await run_in_threadpool(save_profile, profile_id, summary, profiler.folded())
+            except OSError as e:
+                logger.warning("Saving profile %s failed: %s", profile_id, e)
@@ -0,0 +1,77 @@
+"""
+リクエストごとの計測（メトリクス・SQL件数・read-your-writes）
+
+3つの処理を1つの ASGI ミドルウェアにまとめ、リクエストあたりのタスク生成と
+応答の中継を1回で済ませる。応答本文には手を加えずに流すので、ストリーミング応答も
+送信完了時点のサイズ・SQL件数で集計できる。
+"""
+from typing import Callable, Optional
+from starlette.requests import Request
+from ..db.instrumentation import begin_request, report_request, server_timing_headers
+from ..db.routing import record_write, STICKY_HEADER
+from .metrics import request_metrics
+
+_STICKY_HEADER = STICKY_HEADER.lower().encode("latin-1")
+
+
+class RequestInstrumentationMiddleware:
+    """
+    ルート別メトリクス、SQLの集計、書き込み後のプライマリ固定を行う ASGI ミドルウェア
+
+    route_label はエンドポイント関数（未マッチなら None）を受け取り、メトリクスのラベルにする
+    ルートのパスを返す関数。
+    """
+
+    def __init__(self, app, route_label: Callable[[Optional[Callable]], str]):
+        self.app = app
+        self.route_label = route_label
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        started = request_metrics.start()
+        stats = begin_request()
+        status_code = 500
+        size = 0
+        finished = False
+
+        def finish():
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            request_metrics.finish(
+                scope["method"], self.route_label(scope.get("endpoint")), status_code, started, size
+            )
+            report_request(scope["method"], scope["path"], stats)
+
+        async def send_instrumented(message):
+            nonlocal status_code, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                # 本文の長さが決まっている応答だけ、SQLの件数・時間をヘッダーで返す。
+                # エクスポートなどのストリーミング応答は本文の送信中もSQLを発行するので、ログだけを完了後に出す
+                if any(name == b"content-length" for name, _ in headers):
+                    headers.extend(server_timing_headers(stats))
+                # 書き込み直後の読み取りをプライマリに固定する（read-your-writes）
+                until = record_write(request, status_code)
+                if until is not None:
+                    headers.append((_STICKY_HEADER, until.encode("latin-1")))
+                message = {**message, "headers": headers}
+                await send(message)
+                return
+
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_instrumented)
+        finally:
+            finish()
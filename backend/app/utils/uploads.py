@@ -0,0 +1,42 @@
+import csv
+import io
+import json
+from typing import Optional
+from fastapi import UploadFile
+
+UPLOAD_FORMAT_PATTERN = "^(csv|ndjson)$"
+
+
+def detect_upload_format(upload: UploadFile, fmt: Optional[str] = None) -> str:
+    """
+    明示指定がなければファイル拡張子から csv / ndjson を判定する
+    """
+    if fmt:
+        return fmt
+    filename = (upload.filename or "").lower()
+    return "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+
+
+def iter_upload_records(upload: UploadFile, fmt: str):
+    """
+    アップロードを一括で読み込まず、1行ずつ (行番号, レコード, エラー) を返す
+    """
+    stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    if fmt == "ndjson":
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "record must be a JSON object"
+                continue
+            yield line_number, record, None
+    else:
+        reader = csv.DictReader(stream)
+        for record in reader:
+            # ヘッダー行を1行目として数える
+            yield reader.line_num, record, None
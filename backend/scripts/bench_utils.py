@@ -0,0 +1,28 @@
+"""
+負荷試験・ベンチマークスクリプトの共通処理
+"""
+import time
+
+import httpx
+
+
+def percentile(values, ratio):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def wait_until_ready(base_url, timeout=30):
+    """
+    /ready が 200 を返す（ウォームアップが終わる）まで待つ
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(base_url + "/ready", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("server did not start")
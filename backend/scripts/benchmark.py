@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+APIのベンチマークと性能劣化の検出
+
+社員数ごと（既定: 1,000 / 10,000 / 100,000）に合成データを投入し、一覧・検索・詳細・マッチング・
+ダッシュボード・書き込みの各シナリオについて p50/p95/p99 レイテンシ、スループット、
+1リクエストあたりのSQL件数（X-DB-Query-Count ヘッダー）を計測する。
+
+    # アプリをプロセス内（ASGI）で計測し、結果をベースラインとして保存
+    python scripts/benchmark.py --save benchmarks/baseline.json
+
+    # uvicorn を起動して計測し、ベースラインと比較（劣化していれば終了コード 1）
+    python scripts/benchmark.py --target uvicorn --baseline benchmarks/baseline.json
+
+    # 既に起動しているサーバーを既存データのまま計測
+    python scripts/benchmark.py --base-url http://localhost:8000 --no-generate
+
+データ投入時は DATABASE_URL の社員データを削除して作り直すため、ベンチマーク専用のDBで実行すること。
+httpx が必要（pip install -r requirements-dev.txt）。
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List
+
+import httpx
+
+from generate_data import generate
+from bench_utils import percentile, wait_until_ready
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCALES = "1000,10000,100000"
+# ベースラインの再現性のため、合成データの基準日は固定する
+DEFAULT_AS_OF = date(2026, 1, 1)
+
+
+def _list(rng, data):
+    return "GET", f"/api/employees/?skip={rng.randint(0, max(data['total'] - 50, 0))}&limit=50", None
+
+
+def _search(rng, data):
+    tags = rng.choice(["React", "Python,PostgreSQL", "AWS,Docker", "TypeScript"])
+    return "GET", f"/api/employees/search?skill_tags={tags}&years_experience_min={rng.randint(0, 10)}", None
+
+
+def _detail(rng, data):
+    return "GET", f"/api/employees/{rng.choice(data['employee_ids'])}", None
+
+
+def _matching(rng, data):
+    body = rng.choice([
+        {"required_skills": ["React", "TypeScript"], "preferred_skills": ["AWS"]},
+        {"required_skills": ["Python"], "preferred_skills": ["PostgreSQL", "Docker"]},
+        {"required_skills": ["Java", "MySQL"], "preferred_skills": []},
+    ])
+    return "POST", "/api/employees/matching", body
+
+
+def _dashboard(rng, data):
+    path = rng.choice(["/api/dashboard/stats", "/api/dashboard/availability-status", "/api/one-on-ones/missing"])
+    return "GET", path, None
+
+
+def _write(rng, data):
+    body = {
+        "employee_id": rng.choice(data["employee_ids"]),
+        "date": datetime(2026, 1, 1, rng.randint(9, 18)).isoformat(),
+        "status": rng.choice(["good", "normal", "attention"]),
+        "memo": "benchmark",
+    }
+    return "POST", "/api/one-on-ones/", body
+
+
+# 書き込みは read-your-writes でその後の読み取り先を変えるため最後に実行する
+SCENARIOS: Dict[str, Callable] = {
+    "list": _list,
+    "search": _search,
+    "detail": _detail,
+    "matching": _matching,
+    "dashboard": _dashboard,
+    "write": _write,
+}
+
+
+async def run_scenario(client, build, data, requests, concurrency, warmup, seed) -> Dict:
+    rng = random.Random(seed)
+    calls = [build(rng, data) for _ in range(warmup + requests)]
+    for method, url, body in calls[:warmup]:
+        await client.request(method, url, json=body)
+
+    latencies: List[float] = []
+    query_counts: List[int] = []
+    errors: List = []
+    pending = iter(calls[warmup:])
+
+    async def worker():
+        for method, url, body in pending:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+            except httpx.HTTPError as e:
+                errors.append(type(e).__name__)
+                continue
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+                continue
+            latencies.append(time.perf_counter() - started)
+            count = response.headers.get("x-db-query-count")
+            if count is not None:
+                query_counts.append(int(count))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "queries_avg": round(sum(query_counts) / len(query_counts), 2) if query_counts else None,
+        "queries_max": max(query_counts) if query_counts else None,
+    }
+
+
+async def run_scenarios(client, args) -> Dict[str, Dict]:
+    # 詳細・書き込みの対象にする社員と、一覧のページ送りに使う総数
+    response = await client.get("/api/employees/", params={"limit": 1000})
+    response.raise_for_status()
+    employee_ids = [employee["id"] for employee in response.json()]
+    if not employee_ids:
+        raise RuntimeError("社員データがありません（--no-generate を外して投入してください）")
+    stats = await client.get("/api/dashboard/stats")
+    stats.raise_for_status()
+    data = {"employee_ids": employee_ids, "total": stats.json()["total_employees"]}
+
+    results = {}
+    for i, name in enumerate(args.scenarios):
+        results[name] = await run_scenario(
+            client, SCENARIOS[name], data, args.requests, args.concurrency, args.warmup, args.seed + i
+        )
+        print(f"  {name:<10} p95 {results[name]['p95_ms']:>8.1f} ms  {results[name]['rps']:>8.1f} rps", flush=True)
+    return results
+
+
+async def run_asgi(args) -> Dict[str, Dict]:
+    # DATABASE_URL などの設定を読ませるため、アプリは計測直前に読み込む
+    sys.path.insert(0, BACKEND_DIR)
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+            return await run_scenarios(client, args)
+
+
+async def run_http(base_url: str, args) -> Dict[str, Dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        return await run_scenarios(client, args)
+
+
+def run_uvicorn(args) -> Dict[str, Dict]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR
+    )
+    try:
+        wait_until_ready(base_url)
+        return asyncio.run(run_http(base_url, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def find_regressions(baseline: Dict, current: Dict, args) -> List[str]:
+    """
+    ベースラインと比べて閾値を超えて悪化した項目を返す
+    """
+    regressions = []
+    for scale, scenarios in current["results"].items():
+        for name, result in scenarios.items():
+            label = f"{scale} employees / {name}"
+            if result["errors"]:
+                regressions.append(f"{label}: {result['errors']} errors")
+            base = baseline.get("results", {}).get(scale, {}).get(name)
+            if base is None:
+                continue
+
+            for metric in ("p95_ms", "p99_ms"):
+                limit = base[metric] * (1 + args.max_latency_regression)
+                if result[metric] > limit and result[metric] - base[metric] > args.min_latency_delta_ms:
+                    regressions.append(f"{label}: {metric} {base[metric]:.1f} -> {result[metric]:.1f}")
+
+            if result["rps"] < base["rps"] * (1 - args.max_throughput_regression):
+                regressions.append(f"{label}: rps {base['rps']:.1f} -> {result['rps']:.1f}")
+
+            if base["queries_avg"] is not None and result["queries_avg"] is not None:
+                if result["queries_avg"] > base["queries_avg"] + args.max_query_increase:
+                    regressions.append(
+                        f"{label}: queries/request {base['queries_avg']:.1f} -> {result['queries_avg']:.1f}"
+                    )
+    return regressions
+
+
+def print_report(report: Dict) -> None:
+    print(
+        f"\n{'employees':>10}  {'scenario':<10}{'requests':>9}{'errors':>7}{'rps':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}"
+    )
+    for scale, scenarios in report["results"].items():
+        for name, r in scenarios.items():
+            queries = "-" if r["queries_avg"] is None else f"{r['queries_avg']:.1f}"
+            print(
+                f"{int(scale):>10,}  {name:<10}{r['requests']:>9}{r['errors']:>7}{r['rps']:>9.1f}"
+                f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{queries:>9}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help=f"社員数（カンマ区切り、既定: {DEFAULT_SCALES}）")
+    parser.add_argument("--scenario", dest="scenarios", action="append", choices=list(SCENARIOS),
+                        help="計測するシナリオ（複数指定可、既定: すべて）")
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi",
+                        help="asgi: プロセス内で直接呼ぶ / uvicorn: サーバーを起動してHTTPで呼ぶ")
+    parser.add_argument("--base-url", help="起動済みサーバーを計測する（--target より優先）")
+    parser.add_argument("--no-generate", action="store_true", help="データを投入せず既存データで計測する")
+    parser.add_argument("--requests", type=int, default=200, help="シナリオごとの計測リクエスト数")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10, help="計測前に捨てるリクエスト数")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=DEFAULT_AS_OF, help="合成データの基準日")
+    parser.add_argument("--port", type=int, default=8766, help="--target uvicorn のポート")
+    parser.add_argument("--workers", type=int, default=1, help="--target uvicorn のワーカー数")
+    parser.add_argument("--save", help="結果をJSONで保存するパス（ベースライン）")
+    parser.add_argument("--baseline", help="比較するベースラインJSON")
+    parser.add_argument("--max-latency-regression", type=float, default=0.2,
+                        help="p95/p99 の悪化の許容率（既定: 0.2 = 20%%）")
+    parser.add_argument("--min-latency-delta-ms", type=float, default=2.0,
+                        help="これ未満のレイテンシ差は誤差として扱う（既定: 2ms）")
+    parser.add_argument("--max-throughput-regression", type=float, default=0.2,
+                        help="rps の低下の許容率（既定: 0.2）")
+    parser.add_argument("--max-query-increase", type=float, default=0.0,
+                        help="1リクエストあたりSQL件数の増加の許容数（既定: 0）")
+    args = parser.parse_args()
+    args.scenarios = args.scenarios or list(SCENARIOS)
+    scales = [int(scale) for scale in args.scales.split(",")]
+    if args.no_generate:
+        scales = scales[:1]
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "target": "http" if args.base_url else args.target,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "as_of": args.as_of.isoformat(),
+            "python": platform.python_version(),
+            "database": os.getenv("DATABASE_URL", "").split("://", 1)[0],
+        },
+        "results": {},
+    }
+
+    for scale in scales:
+        if not args.no_generate:
+            print(f"== {scale:,} employees: generating data", flush=True)
+            generate(employees=scale, seed=args.seed, batch_size=5000, as_of=args.as_of, months=12,
+                     reset=True, refresh_profiles=True)
+        print(f"== {scale:,} employees: running scenarios", flush=True)
+        if args.base_url:
+            results = asyncio.run(run_http(args.base_url, args))
+        elif args.target == "uvicorn":
+            results = run_uvicorn(args)
+        else:
+            results = asyncio.run(run_asgi(args))
+        report["results"][str(scale)] = results
+
+    print_report(report)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nsaved: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(baseline, report, args)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
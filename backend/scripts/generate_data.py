@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+負荷試験・実行計画確認用の合成データを生成する
+
+社員数を指定すると、スキル・案件履歴・稼働状況・1on1 を現実に近い分布で生成し、
+PostgreSQL では COPY、それ以外では複数行 INSERT でまとめて投入する。
+同じ --seed と --as-of なら、バッチサイズや実行環境によらず同じデータになる。
+
+    python scripts/generate_data.py --employees 100000 --truncate
+    python scripts/generate_data.py --employees 1000000 --batch-size 20000 --as-of 2026-01-01
+
+スキルマスタが空の場合はデモデータと同じスキル・別名・関連を先に登録する。
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Sequence
+
+from sqlalchemy import func, text
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.bulk import copy_rows
+from app.db.database import Base, SessionLocal, engine
+from app.models.employee import (
+    Availability,
+    AvailabilityHistory,
+    AvailabilityStatus,
+    Employee,
+    EmployeeProfile,
+    OneOnOne,
+    OneOnOneStatus,
+    Project,
+    Skill,
+    SkillAlias,
+    SkillRelation,
+    employee_skills,
+    project_tech_tags,
+)
+from app.services.profiles import refresh_employee_profiles
+from app.services.skill_catalog import DEFAULT_SKILL_ALIASES, invalidate_skill_catalog, normalize_skill_term
+from app.services.skill_graph import DEFAULT_SKILL_RELATIONS
+
+DEFAULT_SKILLS = [
+    ("React", "フロントエンド"),
+    ("Vue.js", "フロントエンド"),
+    ("Angular", "フロントエンド"),
+    ("TypeScript", "フロントエンド"),
+    ("JavaScript", "フロントエンド"),
+    ("Python", "バックエンド"),
+    ("Java", "バックエンド"),
+    ("C#", "バックエンド"),
+    ("Node.js", "バックエンド"),
+    ("PHP", "バックエンド"),
+    ("Ruby", "バックエンド"),
+    ("PostgreSQL", "データベース"),
+    ("MySQL", "データベース"),
+    ("MongoDB", "データベース"),
+    ("Redis", "データベース"),
+    ("AWS", "インフラ"),
+    ("Docker", "インフラ"),
+    ("Kubernetes", "インフラ"),
+    ("Terraform", "インフラ"),
+    ("Git", "その他"),
+    ("Figma", "その他"),
+    ("Slack", "その他"),
+]
+
+# (職種, 出現比率, スキルカテゴリごとの重み)
+ROLES = [
+    ("バックエンドエンジニア", 35, {"バックエンド": 6, "データベース": 3, "インフラ": 1, "その他": 1}),
+    ("フロントエンドエンジニア", 25, {"フロントエンド": 6, "その他": 2, "バックエンド": 1}),
+    ("フルスタックエンジニア", 15, {"フロントエンド": 3, "バックエンド": 3, "データベース": 2, "インフラ": 1}),
+    ("インフラエンジニア", 15, {"インフラ": 6, "データベース": 2, "バックエンド": 1, "その他": 1}),
+    ("プロジェクトマネージャー", 5, {"その他": 3, "バックエンド": 1, "フロントエンド": 1}),
+    ("QAエンジニア", 5, {"フロントエンド": 2, "バックエンド": 2, "その他": 2}),
+]
+
+# 工程ごとの担当確率（職種別）。値は (要件定義, 設計, 実装, テスト)
+PHASE_PROBABILITIES = {
+    "プロジェクトマネージャー": (0.9, 0.7, 0.1, 0.4),
+    "QAエンジニア": (0.1, 0.3, 0.3, 0.95),
+}
+DEFAULT_PHASE_PROBABILITIES = (0.2, 0.6, 0.95, 0.7)
+
+AVAILABILITY_WEIGHTS = [
+    (AvailabilityStatus.WORKING, 65),
+    (AvailabilityStatus.AVAILABLE_NEXT_MONTH, 20),
+    (AvailabilityStatus.IMMEDIATELY_AVAILABLE, 15),
+]
+
+FAMILY_NAMES = [
+    "佐藤", "鈴木", "高橋", "田中", "伊藤", "渡辺", "山本", "中村", "小林", "加藤",
+    "吉田", "山田", "佐々木", "山口", "松本", "井上", "木村", "林", "斎藤", "清水",
+]
+GIVEN_NAMES = [
+    "太郎", "花子", "一郎", "美咲", "健太", "由美", "慎也", "麻衣", "拓也", "理恵",
+    "翔太", "陽菜", "大輔", "葵", "直樹", "彩", "亮", "結衣", "誠", "真由美",
+]
+PROJECT_DOMAINS = ["ECサイト", "基幹システム", "予約管理", "会計システム", "社内ポータル", "データ分析基盤", "モバイルアプリ", "在庫管理"]
+PROJECT_KINDS = ["新規開発", "リプレイス", "保守運用", "機能追加"]
+CAREER_GOALS = [
+    "テックリードを目指したい",
+    "クラウドの設計に関わりたい",
+    "上流工程の経験を積みたい",
+    "マネジメントに挑戦したい",
+    "フロントエンドを深めたい",
+]
+ONE_ON_ONE_MEMOS = {
+    OneOnOneStatus.GOOD: ["順調にプロジェクトを進めている", "新しい技術の習得に意欲的", "チームでの評価が高い"],
+    OneOnOneStatus.NORMAL: ["特に問題なし", "前回の課題は解決済み", "業務量は適正"],
+    OneOnOneStatus.ATTENTION: ["技術的な課題で悩んでいる様子", "残業が続いている", "案件の変更を希望"],
+}
+ONE_ON_ONE_WEIGHTS = {OneOnOneStatus.GOOD: 55, OneOnOneStatus.NORMAL: 35, OneOnOneStatus.ATTENTION: 10}
+
+EMPLOYEE_COLUMNS = ("id", "name", "years_experience", "main_role", "unit_price_min", "unit_price_max", "desired_career")
+SKILL_COLUMNS = ("employee_id", "skill_id", "level", "years_experience")
+PROJECT_COLUMNS = (
+    "id", "employee_id", "title", "role", "start_date", "end_date", "description", "tech_tags",
+    "phase_requirements", "phase_design", "phase_implementation", "phase_testing"
+)
+TAG_COLUMNS = ("project_id", "tag")
+AVAILABILITY_COLUMNS = ("id", "employee_id", "status", "available_from", "memo")
+HISTORY_COLUMNS = ("id", "employee_id", "status", "available_from", "memo", "valid_from", "valid_to")
+ONE_ON_ONE_COLUMNS = ("id", "employee_id", "date", "memo", "status")
+
+# 明示的に ID を振るテーブル（投入後に PostgreSQL のシーケンスを進める）
+ID_TABLES = ("employees", "projects", "availability", "availability_history", "one_on_ones")
+
+
+def _weighted(rng: random.Random, choices: Sequence, weights: Sequence[float]):
+    return rng.choices(choices, weights=weights, k=1)[0]
+
+
+def _month_start(day: date, months: int = 0) -> datetime:
+    month_index = day.year * 12 + day.month - 1 + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+
+class Rows:
+    """
+    1バッチ分の生成済みの行（テーブルごと）
+    """
+
+    def __init__(self):
+        self.employees: List[tuple] = []
+        self.skills: List[tuple] = []
+        self.projects: List[tuple] = []
+        self.tags: List[tuple] = []
+        self.availability: List[tuple] = []
+        self.history: List[tuple] = []
+        self.one_on_ones: List[tuple] = []
+
+    def count(self) -> int:
+        return sum(len(rows) for rows in vars(self).values())
+
+
+class Generator:
+    """
+    社員1人分のデータを、社員番号とシードだけから決まる乱数で生成する
+    """
+
+    def __init__(self, skills: Dict[str, tuple], seed: int, as_of: date, months: int):
+        self.seed = seed
+        self.as_of = as_of
+        self.months = months
+        self.skill_ids = {name: skill_id for name, (skill_id, _) in skills.items()}
+        # 職種ごとのスキル候補と重み。カテゴリ内では先頭ほど人気が高い（1/順位）
+        by_category: Dict[str, List[str]] = {}
+        for name, (_, category) in skills.items():
+            by_category.setdefault(category, []).append(name)
+        self.role_names = [role for role, _, _ in ROLES]
+        self.role_weights = [weight for _, weight, _ in ROLES]
+        self.role_skills: Dict[str, tuple] = {}
+        for role, _, category_weights in ROLES:
+            names, weights = [], []
+            for category, category_weight in category_weights.items():
+                for rank, name in enumerate(by_category.get(category, [])):
+                    names.append(name)
+                    weights.append(category_weight / (rank + 1))
+            if not names:
+                names, weights = list(skills), [1.0] * len(skills)
+            self.role_skills[role] = (names, weights)
+
+    def employee(self, rows: Rows, index: int, ids: Dict[str, int]) -> None:
+        rng = random.Random(self.seed * 1_000_003 + index)
+        employee_id = ids["employees"] + index
+        role = _weighted(rng, self.role_names, self.role_weights)
+        years = min(35, 1 + int(rng.gammavariate(2.0, 3.5)))
+        price_min = int(max(300000, 380000 + 35000 * min(years, 15) + rng.gauss(0, 50000)) // 10000 * 10000)
+        rows.employees.append((
+            employee_id,
+            rng.choice(FAMILY_NAMES) + rng.choice(GIVEN_NAMES),
+            years,
+            role,
+            price_min,
+            price_min + rng.choice((100000, 150000, 200000, 250000)),
+            rng.choice(CAREER_GOALS) if rng.random() < 0.3 else None,
+        ))
+
+        names, weights = self.role_skills[role]
+        skill_count = min(len(names), rng.randint(2, 4) + years // 4, 10)
+        chosen: List[str] = []
+        while len(chosen) < skill_count:
+            name = _weighted(rng, names, weights)
+            if name not in chosen:
+                chosen.append(name)
+        for name in chosen:
+            skill_years = rng.randint(1, years)
+            level = max(1, min(5, round(rng.gauss(1 + skill_years / 3, 0.8))))
+            rows.skills.append((employee_id, self.skill_ids[name], level, skill_years))
+
+        status = _weighted(rng, *zip(*AVAILABILITY_WEIGHTS))
+        self._projects(rows, rng, employee_id, role, years, chosen, status, ids)
+        self._availability(rows, rng, employee_id, status, ids)
+        self._one_on_ones(rows, rng, employee_id, ids)
+
+    def _projects(self, rows, rng, employee_id, role, years, skill_names, status, ids) -> None:
+        # 直近の案件から過去へ遡って作る
+        project_count = min(8, rng.randint(1, 3) + years // 3)
+        as_of = datetime.combine(self.as_of, datetime.min.time())
+        if status == AvailabilityStatus.WORKING:
+            end = None
+        elif status == AvailabilityStatus.AVAILABLE_NEXT_MONTH:
+            end = _month_start(self.as_of, 1) - timedelta(days=1)
+        else:
+            end = as_of - timedelta(days=rng.randint(1, 60))
+
+        phases = PHASE_PROBABILITIES.get(role, DEFAULT_PHASE_PROBABILITIES)
+        for _ in range(project_count):
+            start = (end or as_of) - timedelta(days=rng.randint(90, 730))
+            project_id = ids["projects"] + ids["project_seq"]
+            ids["project_seq"] += 1
+            tags = rng.sample(skill_names, min(len(skill_names), rng.randint(2, 4)))
+            domain, kind = rng.choice(PROJECT_DOMAINS), rng.choice(PROJECT_KINDS)
+            rows.projects.append((
+                project_id,
+                employee_id,
+                f"{domain}{kind}",
+                "リーダー" if years >= 8 and rng.random() < 0.4 else "メンバー",
+                start,
+                end,
+                f"{domain}の{kind}案件",
+                ",".join(tags),
+                *("担当" if rng.random() < p else None for p in phases),
+            ))
+            rows.tags.extend((project_id, tag) for tag in tags)
+            end = start - timedelta(days=rng.randint(0, 90))
+
+    def _availability(self, rows, rng, employee_id, status, ids) -> None:
+        available_from = None
+        if status == AvailabilityStatus.AVAILABLE_NEXT_MONTH:
+            available_from = _month_start(self.as_of, 1)
+        memo = "次案件の調整中" if status != AvailabilityStatus.WORKING and rng.random() < 0.3 else None
+        rows.availability.append((ids["availability"] + ids["availability_seq"], employee_id, status, available_from, memo))
+        ids["availability_seq"] += 1
+
+        # 過去の稼働状況の変更を 0〜2 件、古い順に
+        as_of = datetime.combine(self.as_of, datetime.min.time())
+        changes = sorted(as_of - timedelta(days=rng.randint(1, 720)) for _ in range(rng.randint(1, 3)))
+        for i, valid_from in enumerate(changes):
+            is_current = i == len(changes) - 1
+            rows.history.append((
+                ids["availability_history"] + ids["history_seq"],
+                employee_id,
+                status if is_current else _weighted(rng, *zip(*AVAILABILITY_WEIGHTS)),
+                available_from if is_current else None,
+                memo if is_current else None,
+                valid_from,
+                None if is_current else changes[i + 1],
+            ))
+            ids["history_seq"] += 1
+
+    def _one_on_ones(self, rows, rng, employee_id, ids) -> None:
+        # 月1回が基本。実施率と雰囲気は社員ごとにばらつかせる
+        attendance = rng.betavariate(8, 2)
+        weights = dict(ONE_ON_ONE_WEIGHTS)
+        if rng.random() < 0.1:
+            weights[OneOnOneStatus.ATTENTION] *= 4
+        statuses, status_weights = list(weights), list(weights.values())
+        for months_ago in range(self.months, 0, -1):
+            if rng.random() >= attendance:
+                continue
+            day = _month_start(self.as_of, -months_ago + 1) + timedelta(days=rng.randint(0, 27), hours=rng.randint(9, 18))
+            if day.date() > self.as_of:
+                continue
+            status = _weighted(rng, statuses, status_weights)
+            rows.one_on_ones.append((
+                ids["one_on_ones"] + ids["one_on_one_seq"],
+                employee_id,
+                day,
+                rng.choice(ONE_ON_ONE_MEMOS[status]),
+                status,
+            ))
+            ids["one_on_one_seq"] += 1
+
+
+def ensure_skills(db) -> Dict[str, tuple]:
+    """
+    スキルマスタを {名前: (id, カテゴリ)} で返す。空なら既定のスキル・別名・関連を登録する
+    """
+    skills = {name: (skill_id, category) for skill_id, name, category in db.query(Skill.id, Skill.name, Skill.category).order_by(Skill.id)}
+    if skills:
+        return skills
+
+    for name, category in DEFAULT_SKILLS:
+        db.add(Skill(name=name, category=category))
+    db.flush()
+    ids = dict(db.query(Skill.name, Skill.id))
+    for alias, skill_name in DEFAULT_SKILL_ALIASES:
+        if skill_name in ids:
+            db.add(SkillAlias(alias=normalize_skill_term(alias), skill_id=ids[skill_name]))
+    for skill_name, related_skill_name, relation_type, weight in DEFAULT_SKILL_RELATIONS:
+        if skill_name in ids and related_skill_name in ids:
+            db.add(SkillRelation(
+                skill_id=ids[skill_name],
+                related_skill_id=ids[related_skill_name],
+                relation_type=relation_type,
+                weight=weight
+            ))
+    db.commit()
+    invalidate_skill_catalog()
+    return {name: (ids[name], category) for name, category in DEFAULT_SKILLS}
+
+
+def truncate(db) -> None:
+    """
+    社員とその関連データを消す（スキルマスタは残す）
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(
+            "TRUNCATE one_on_ones, availability_history, availability, project_tech_tags, projects, "
+            "employee_skills, employee_profiles, employees RESTART IDENTITY"
+        ))
+    else:
+        db.query(OneOnOne).delete()
+        db.query(AvailabilityHistory).delete()
+        db.query(Availability).delete()
+        db.execute(project_tech_tags.delete())
+        db.query(Project).delete()
+        db.execute(employee_skills.delete())
+        db.query(EmployeeProfile).delete()
+        db.query(Employee).delete()
+    db.commit()
+
+
+def next_ids(db) -> Dict[str, int]:
+    ids = {}
+    for model, key in (
+        (Employee, "employees"),
+        (Project, "projects"),
+        (Availability, "availability"),
+        (AvailabilityHistory, "availability_history"),
+        (OneOnOne, "one_on_ones"),
+    ):
+        ids[key] = (db.query(func.max(model.id)).scalar() or 0) + 1
+    ids.update(project_seq=0, availability_seq=0, history_seq=0, one_on_one_seq=0)
+    return ids
+
+
+def sync_sequences(db) -> None:
+    # ID を明示して投入したので、以降の通常の INSERT と衝突しないようシーケンスを進める
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in ID_TABLES:
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        ))
+    db.commit()
+
+
+def load_batch(db, rows: Rows) -> None:
+    copy_rows(db, Employee.__table__, EMPLOYEE_COLUMNS, rows.employees)
+    copy_rows(db, employee_skills, SKILL_COLUMNS, rows.skills)
+    copy_rows(db, Project.__table__, PROJECT_COLUMNS, rows.projects)
+    copy_rows(db, project_tech_tags, TAG_COLUMNS, rows.tags)
+    copy_rows(db, Availability.__table__, AVAILABILITY_COLUMNS, rows.availability)
+    copy_rows(db, AvailabilityHistory.__table__, HISTORY_COLUMNS, rows.history)
+    copy_rows(db, OneOnOne.__table__, ONE_ON_ONE_COLUMNS, rows.one_on_ones)
+    db.commit()
+
+
+def _progress(label: str, done: int, total: int, rows: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed else 0.0
+    print(
+        f"\r{label}: {done:,}/{total:,} ({done / total:6.1%})  {rows:,} rows  {rate:,.0f} rows/s  {elapsed:,.1f}s",
+        end="",
+        flush=True
+    )
+
+
+def generate(employees: int, seed: int, batch_size: int, as_of: date, months: int,
+             reset: bool, refresh_profiles: bool) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if reset:
+            truncate(db)
+        skills = ensure_skills(db)
+        ids = next_ids(db)
+        generator = Generator(skills, seed, as_of, months)
+        first_id = ids["employees"]
+
+        started = time.perf_counter()
+        total_rows = 0
+        for batch_start in range(0, employees, batch_size):
+            rows = Rows()
+            for index in range(batch_start, min(batch_start + batch_size, employees)):
+                generator.employee(rows, index, ids)
+            load_batch(db, rows)
+            total_rows += rows.count()
+            _progress("employees", min(batch_start + batch_size, employees), employees, total_rows, started)
+        print()
+        sync_sequences(db)
+
+        if refresh_profiles:
+            # マッチングが参照する集計値。社員単位の計算なのでバッチごとにコミットする
+            invalidate_skill_catalog()
+            started = time.perf_counter()
+            for batch_start in range(0, employees, batch_size):
+                batch_end = min(batch_start + batch_size, employees)
+                refresh_employee_profiles(db, range(first_id + batch_start, first_id + batch_end))
+                db.commit()
+                _progress("profiles", batch_end, employees, batch_end, started)
+            print()
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="負荷試験用の合成データを生成する")
+    parser.add_argument("--employees", type=int, default=1000, help="生成する社員数（既定: 1000）")
+    parser.add_argument("--seed", type=int, default=42, help="乱数シード（既定: 42）")
+    parser.add_argument("--batch-size", type=int, default=5000, help="1回の投入・コミットで扱う社員数（既定: 5000）")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(),
+                        help="基準日 YYYY-MM-DD。案件期間・稼働状況・1on1 の日付はこの日から遡る（既定: 今日）")
+    parser.add_argument("--months", type=int, default=12, help="1on1 を生成する月数（既定: 12）")
+    parser.add_argument("--truncate", action="store_true", help="既存の社員データを消してから投入する")
+    parser.add_argument("--skip-profiles", action="store_true", help="employee_profiles の再計算を省略する")
+    args = parser.parse_args()
+
+    if args.employees < 1 or args.batch_size < 1:
+        parser.error("--employees と --batch-size は 1 以上を指定してください")
+
+    generate(
+        employees=args.employees,
+        seed=args.seed,
+        batch_size=args.batch_size,
+        as_of=args.as_of,
+        months=args.months,
+        reset=args.truncate,
+        refresh_profiles=not args.skip_profiles,
+    )
+
+
+if __name__ == "__main__":
+    main()
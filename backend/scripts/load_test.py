@@ -0,0 +1,128 @@
+"""
+参照系APIの負荷試験
+
+同時接続数を固定してリクエストを送り続け、1秒あたりの処理件数とレイテンシを表示する。
+--compare を付けると DATABASE_ASYNC=true / false でサーバーを順に起動し、結果を並べて比較する。
+
+    python scripts/load_test.py --base-url http://localhost:8000
+    python scripts/load_test.py --compare --concurrency 200 --duration 30
+
+httpx が必要（pip install -r requirements-dev.txt）。
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+from bench_utils import percentile, wait_until_ready
+
+DEFAULT_PATHS = [
+    "/api/employees/",
+    "/api/employees/search?skill_tags=React",
+    "/api/dashboard/stats",
+    "/api/dashboard/availability-status",
+    "/api/one-on-ones/missing",
+]
+MATCHING_BODY = {"required_skills": ["React", "TypeScript"], "preferred_skills": ["AWS"]}
+
+
+async def _worker(client, paths, matching, deadline, latencies, errors, offset):
+    i = offset
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if matching and i % (len(paths) + 1) == len(paths):
+                response = await client.post("/api/employees/matching", json=MATCHING_BODY)
+            else:
+                response = await client.get(paths[i % len(paths)])
+            if response.status_code >= 400:
+                errors.append(response.status_code)
+            else:
+                latencies.append(time.perf_counter() - started)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+        i += 1
+
+
+async def run_load(base_url, concurrency, duration, paths, matching):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        latencies, errors = [], []
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _worker(client, paths, matching, deadline, latencies, errors, n)
+            for n in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def compare(args):
+    """
+    同期・非同期それぞれのモードでサーバーを起動して計測する
+    """
+    base_url = f"http://127.0.0.1:{args.port}"
+    results = {}
+    for mode in ("false", "true"):
+        env = dict(os.environ, DATABASE_ASYNC=mode)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--workers", str(args.workers), "--log-level", "warning"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            env=env
+        )
+        try:
+            wait_until_ready(base_url)
+            asyncio.run(run_load(base_url, args.concurrency, min(args.duration, 5), args.paths, args.matching))
+            results["async" if mode == "true" else "sync"] = asyncio.run(
+                run_load(base_url, args.concurrency, args.duration, args.paths, args.matching)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30, help="計測秒数")
+    parser.add_argument("--path", dest="paths", action="append", help="対象パス（複数指定可）")
+    parser.add_argument("--matching", action="store_true", help="マッチングAPIも混ぜる")
+    parser.add_argument("--compare", action="store_true", help="同期・非同期モードを比較する")
+    parser.add_argument("--port", type=int, default=8765, help="--compare で起動するサーバーのポート")
+    parser.add_argument("--workers", type=int, default=1, help="--compare で起動するワーカー数")
+    args = parser.parse_args()
+    args.paths = args.paths or DEFAULT_PATHS
+
+    if args.compare:
+        results = compare(args)
+    else:
+        results = {"server": asyncio.run(
+            run_load(args.base_url, args.concurrency, args.duration, args.paths, args.matching)
+        )}
+
+    print(f"{'mode':<8}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for mode, r in results.items():
+        print(
+            f"{mode:<8}{r['requests']:>10}{r['errors']:>8}{r['rps']:>10.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+# アプリを読み込む前に接続先を決める。PostgreSQL で確認する場合は QUERY_PLAN_DATABASE_URL を指定する
+os.environ["DATABASE_URL"] = os.getenv("QUERY_PLAN_DATABASE_URL") or (
+    "sqlite:///" + os.path.join(tempfile.gettempdir(), "ses_query_plans.db")
+)
+os.environ.setdefault("DATABASE_ASYNC", "false")
+
+# 既定では 1on1 が約100万行になる社員数
+QUERY_PLAN_EMPLOYEES = int(os.getenv("QUERY_PLAN_EMPLOYEES", "120000"))
+QUERY_PLAN_SEED = 42
+QUERY_PLAN_AS_OF = date(2026, 1, 1)
+
+
+@pytest.fixture(scope="session")
+def plan_db():
+    """
+    scripts/generate_data.py で投入した大規模データに接続したセッション
+
+    同じ社員数のデータが既にあれば作り直さない。
+    """
+    from generate_data import generate
+    from app.db.database import Base, SessionLocal, engine
+    from app.models.employee import Employee
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(Employee).count() != QUERY_PLAN_EMPLOYEES:
+            db.close()
+            generate(
+                employees=QUERY_PLAN_EMPLOYEES,
+                seed=QUERY_PLAN_SEED,
+                batch_size=10000,
+                as_of=QUERY_PLAN_AS_OF,
+                months=12,
+                reset=True,
+                refresh_profiles=False,
+            )
+        # 統計情報がないとプランナーが行数を見積もれない
+        db.execute(text("ANALYZE"))
+        db.commit()
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,118 @@
+"""
+1on1 の期間指定クエリが約100万行の one_on_ones を全件走査しないことを EXPLAIN で確認する
+
+    cd backend && python -m pytest tests/test_query_plans.py
+    QUERY_PLAN_DATABASE_URL=postgresql://... python -m pytest tests/test_query_plans.py
+
+初回はデータ投入に数分かかる。QUERY_PLAN_EMPLOYEES で社員数を変えられる。
+"""
+import json
+import re
+from contextlib import contextmanager
+from datetime import date
+from typing import List
+
+from sqlalchemy import event
+
+from app.api.one_on_ones import _get_completion_rate, _get_one_on_ones
+from app.services.one_on_one_queries import missing_one_on_ones
+from conftest import QUERY_PLAN_EMPLOYEES
+
+
+@contextmanager
+def captured_selects(db):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", capture)
+
+
+def _pg_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _pg_nodes(child)
+
+
+def one_on_one_access_paths(db, statement, parameters) -> List[str]:
+    """
+    one_on_ones の読み取り方法を、SQLite の EXPLAIN QUERY PLAN 表記に揃えて返す
+    """
+    connection = db.connection()
+    if db.get_bind().dialect.name == "postgresql":
+        (plan,), = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).fetchall()
+        plan = plan if isinstance(plan, list) else json.loads(plan)
+        paths = []
+        for node in _pg_nodes(plan[0]["Plan"]):
+            index_name = node.get("Index Name", "")
+            if node.get("Relation Name") == "one_on_ones" and node["Node Type"] == "Seq Scan":
+                paths.append("SCAN one_on_ones")
+            elif index_name.startswith("ix_one_on_ones"):
+                # Index Scan / Index Only Scan / Bitmap Index Scan（Bitmap Heap Scan はその結果を読むだけ）
+                paths.append(f"SEARCH one_on_ones USING INDEX {index_name}")
+        return paths
+
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+    return [row[-1] for row in rows if re.search(r"\bone_on_ones\b", row[-1])]
+
+
+def assert_no_full_scan(db, statements):
+    paths = [path for statement, parameters in statements for path in one_on_one_access_paths(db, statement, parameters)]
+    assert paths, "one_on_ones を参照するクエリがありません"
+    full_scans = [path for path in paths if not path.startswith("SEARCH")]
+    assert not full_scans, f"one_on_ones の全件走査: {full_scans}"
+    assert any("ix_one_on_ones" in path for path in paths), paths
+
+
+def test_dataset_is_large(plan_db):
+    from app.models.employee import OneOnOne
+
+    # 既定の社員数では約100万行になる
+    if QUERY_PLAN_EMPLOYEES >= 120000:
+        assert plan_db.query(OneOnOne).count() >= 1_000_000
+
+
+def test_list_by_month_uses_date_index(plan_db):
+    with captured_selects(plan_db) as statements:
+        _get_one_on_ones(
+            plan_db, skip=0, limit=100, employee_id=None, year=2025, month=6, date_from=None, date_to=None
+        )
+    assert_no_full_scan(plan_db, statements)
+
+
+def test_list_by_date_range_uses_date_index(plan_db):
+    with captured_selects(plan_db) as statements:
+        _get_one_on_ones(
+            plan_db, skip=0, limit=100, employee_id=None, year=None, month=None,
+            date_from=date(2025, 6, 1), date_to=date(2025, 6, 15)
+        )
+    assert_no_full_scan(plan_db, statements)
+
+
+def test_employee_history_uses_employee_date_index(plan_db):
+    with captured_selects(plan_db) as statements:
+        _get_one_on_ones(
+            plan_db, skip=0, limit=100, employee_id=1234, year=2025, month=None, date_from=None, date_to=None
+        )
+    assert_no_full_scan(plan_db, statements)
+
+
+def test_completion_rate_uses_date_index(plan_db):
+    with captured_selects(plan_db) as statements:
+        _get_completion_rate(plan_db, year=2025, month=6, date_from=None, date_to=None)
+    assert_no_full_scan(plan_db, statements)
+
+
+def test_missing_one_on_ones_uses_employee_date_index(plan_db):
+    with captured_selects(plan_db) as statements:
+        missing_one_on_ones(
+            plan_db, skip=0, limit=100, year=2025, month=6, date_from=None, date_to=None, order="asc"
+        )
+    assert_no_full_scan(plan_db, statements)
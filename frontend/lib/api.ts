@@ -13,18 +13,48 @@ class ApiError extends Error {
   }
 }
 
+// 書き込み直後の読み取りをプライマリDBに固定するため、API が返す期限を次のリクエストで送り返す
+const PRIMARY_UNTIL_HEADER = 'X-DB-Primary-Until';
+const PRIMARY_UNTIL_KEY = 'dbPrimaryUntil';
+
+// サーバー側の描画ではユーザー間で共有されるため、ブラウザでだけ保持する（再読み込み後も期限内は有効）
+function loadPrimaryUntil(): number | null {
+  if (typeof window === 'undefined') {
+    return null;
+  }
+  const until = Number(window.sessionStorage.getItem(PRIMARY_UNTIL_KEY));
+  if (!until || until * 1000 <= Date.now()) {
+    window.sessionStorage.removeItem(PRIMARY_UNTIL_KEY);
+    return null;
+  }
+  return until;
+}
+
+function storePrimaryUntil(response: Response) {
+  if (typeof window === 'undefined') {
+    return;
+  }
+  const until = Number(response.headers.get(PRIMARY_UNTIL_HEADER));
+  if (until && until > (loadPrimaryUntil() ?? 0)) {
+    window.sessionStorage.setItem(PRIMARY_UNTIL_KEY, String(until));
+  }
+}
+
 async function apiRequest<T>(
   endpoint: string,
   options: RequestInit = {}
 ): Promise<T> {
   const url = `${API_BASE_URL}${endpoint}`;
+  const until = loadPrimaryUntil();
 
+  // options.headers を指定しても既定のヘッダーが消えないよう、headers は最後にまとめる
   const config: RequestInit = {
+    ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...(until !== null ? { [PRIMARY_UNTIL_HEADER]: until.toFixed(3) } : {}),
       ...options.headers,
     },
-    ...options,
   };
 
   console.log('Making API request to:', url);
@@ -32,6 +62,7 @@ async function apiRequest<T>(
 
   try {
     const response = await fetch(url, config);
+    storePrimaryUntil(response);
 
     console.log('Response status:', response.status);
     console.log('Response headers:', response.headers);